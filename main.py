@@ -1,34 +1,187 @@
+import argparse
+import json
+import logging
+import os
 from mcp.server.fastmcp import FastMCP
-from src.mcp_openfoodtox.tools.search_substance import search_substance
-from src.mcp_openfoodtox.tools.get_risk_assessments import get_risk_assessments
-from src.mcp_openfoodtox.tools.get_toxicity_endpoints import get_toxicity_endpoints
-from src.mcp_openfoodtox.tools.get_genotox_details import get_genotox_details
-from src.mcp_openfoodtox.tools.get_opinions import get_opinions
-from src.mcp_openfoodtox.tools.substance_safety_assessment import get_substance_safety_assessment
-from src.mcp_openfoodtox.tools.list_substances_by_class_and_safety import (
-    list_substances_by_class_and_safety,
+from mcp.server.transport_security import TransportSecuritySettings
+from src.mcp_openfoodtox.database.cache import (
+    DEFAULT_CACHE_MB,
+    DEFAULT_CACHE_TTL_SECONDS,
+    cache_stats,
+    close_cache,
+    configure_cache,
 )
-from src.mcp_openfoodtox.tools.list_hazard_ids_by_assessment import list_hazard_ids_by_assessment
-from src.mcp_openfoodtox.tools.list_substances_by_assessment import list_substances_by_assessment
+from src.mcp_openfoodtox.database.connection import (
+    DB_MODES,
+    close_all_connections,
+    configure_connections,
+)
+from src.mcp_openfoodtox.database.executor import (
+    DEFAULT_TIMEOUT_SECONDS,
+    configure_executor,
+    shutdown_executor,
+)
+
+# Tool modules are lightweight: database code (and pandas) loads on the first tool call,
+# see src/mcp_openfoodtox/tools/__init__.py
+from src.mcp_openfoodtox.tools.async_tools import ASYNC_TOOLS
+
+logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
 mcp = FastMCP("mcp-openfoodtox")
 
-# Add tools to the server
-mcp.add_tool(search_substance)
-mcp.add_tool(get_risk_assessments)
-mcp.add_tool(get_toxicity_endpoints)
-mcp.add_tool(get_genotox_details)
-mcp.add_tool(get_opinions)
-mcp.add_tool(get_substance_safety_assessment)
-mcp.add_tool(list_substances_by_class_and_safety)
-mcp.add_tool(list_hazard_ids_by_assessment)
-mcp.add_tool(list_substances_by_assessment)
+# Add tools to the server. Tools run on the database executor's worker threads, never on
+# the event loop (see src/mcp_openfoodtox/tools/async_tools.py)
+for tool in ASYNC_TOOLS:
+    mcp.add_tool(tool)
+
+
+@mcp.resource("openfoodtox://stats", mime_type="application/json")
+def server_stats() -> str:
+    """Result cache counters and the number of coalesced (deduplicated) tool calls."""
+    return json.dumps(cache_stats())
+
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+# Loopback interfaces; their Host headers are always accepted (any port)
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="OpenFoodTox MCP server")
+    parser.add_argument(
+        "--db-mode",
+        choices=DB_MODES,
+        default=os.environ.get("OPENFOODTOX_DB_MODE", "default"),
+        help="How to open the database. 'immutable' opens a finalized snapshot read-only "
+        "with no file locking and memory-mapped I/O; 'memory' copies the whole database into "
+        "RAM at startup and logs load time and size (env: OPENFOODTOX_DB_MODE)",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.environ.get("OPENFOODTOX_TRANSPORT", "stdio"),
+        help="'stdio' serves one client (Claude Desktop); 'streamable-http' (or legacy 'sse') "
+        "serves many clients over HTTP at http://HOST:PORT/mcp (env: OPENFOODTOX_TRANSPORT)",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.environ.get("OPENFOODTOX_HOST", "127.0.0.1"),
+        help="Interface for the HTTP transports (env: OPENFOODTOX_HOST)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.environ.get("OPENFOODTOX_PORT", "8000")),
+        help="Port for the HTTP transports (env: OPENFOODTOX_PORT)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("OPENFOODTOX_WORKERS", "4")),
+        help="Database worker threads per lane; ID lookups and list/search queries have "
+        "separate lanes (env: OPENFOODTOX_WORKERS)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=float(os.environ.get("OPENFOODTOX_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)),
+        help="Time limit in seconds per tool call, 0 for none; a call over the limit is "
+        "cancelled and its SQLite statement interrupted (env: OPENFOODTOX_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=float(os.environ.get("OPENFOODTOX_CACHE_MB", DEFAULT_CACHE_MB)),
+        help="Memory budget of the in-process tool result cache in MB, 0 to disable "
+        "(env: OPENFOODTOX_CACHE_MB)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=float(os.environ.get("OPENFOODTOX_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS)),
+        help="Seconds a cached tool result stays valid, 0 for no expiry; results are always "
+        "invalidated when the database file changes (env: OPENFOODTOX_CACHE_TTL)",
+    )
+    parser.add_argument(
+        "--disk-cache-mb",
+        type=float,
+        default=float(os.environ.get("OPENFOODTOX_DISK_CACHE_MB", 0)),
+        help="Size budget in MB of the persistent result cache next to the database file, "
+        "shared across restarts and server processes; 0 to disable (env: OPENFOODTOX_DISK_CACHE_MB)",
+    )
+    parser.add_argument(
+        "--allowed-hosts",
+        default=os.environ.get("OPENFOODTOX_ALLOWED_HOSTS", ""),
+        help="Comma-separated Host header values the HTTP transports accept besides localhost, "
+        "e.g. 'mcp.example.org,10.0.0.5:8000' (a name without a port matches any port). "
+        "Requests with other Host or Origin headers are rejected to block DNS rebinding "
+        "(env: OPENFOODTOX_ALLOWED_HOSTS)",
+    )
+    parser.add_argument(
+        "--disable-host-check",
+        action="store_true",
+        default=os.environ.get("OPENFOODTOX_DISABLE_HOST_CHECK", "").lower() in ("1", "true", "yes"),
+        help="Accept any Host and Origin header, turning off DNS rebinding protection; only for "
+        "servers behind a proxy that validates them (env: OPENFOODTOX_DISABLE_HOST_CHECK)",
+    )
+    return parser.parse_args()
+
+
+def transport_security_settings(allowed_hosts: list[str]) -> TransportSecuritySettings:
+    """
+    DNS rebinding protection accepting localhost and `allowed_hosts` as Host headers.
+
+    A host without a port matches any port; Origin headers must be http(s):// one of the
+    same hosts.
+    """
+    patterns = []
+    local_hosts = [f"[{local_host}]" if ":" in local_host else local_host for local_host in LOCAL_HOSTS]
+    for allowed_host in [*local_hosts, *allowed_hosts]:
+        # "name" or "[v6]" has no port; "name:8000" and "[v6]:8000" do
+        has_port = allowed_host.rsplit("]", 1)[-1].count(":") == 1
+        patterns += [allowed_host] if has_port else [allowed_host, f"{allowed_host}:*"]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=patterns,
+        allowed_origins=[f"{scheme}://{pattern}" for pattern in patterns for scheme in ("http", "https")],
+    )
+
+
+def configure_http(host: str, port: int, allowed_hosts: list[str], disable_host_check: bool = False):
+    """Bind the HTTP transports to host:port and set which Host headers they accept."""
+    mcp.settings.host = host
+    mcp.settings.port = port
+    if disable_host_check:
+        logger.warning("Host header check disabled: DNS rebinding protection is off")
+        mcp.settings.transport_security = None
+        return
+    mcp.settings.transport_security = transport_security_settings(allowed_hosts)
+    if host not in LOCAL_HOSTS and not allowed_hosts:
+        logger.warning(
+            f"Listening on {host} but only localhost Host headers are accepted; "
+            "set --allowed-hosts to the names clients use to reach this server"
+        )
 
 
 def main():
+    args = parse_args()
+    configure_connections(args.db_mode)
+    configure_executor(args.workers, args.timeout)
+    configure_cache(args.cache_mb, args.cache_ttl, args.disk_cache_mb)
+    allowed_hosts = [allowed_host.strip() for allowed_host in args.allowed_hosts.split(",") if allowed_host.strip()]
+    configure_http(args.host, args.port, allowed_hosts, args.disable_host_check)
+
     # Initialize and run the server
-    mcp.run(transport="stdio")
+    try:
+        mcp.run(transport=args.transport)
+    finally:
+        logger.info(f"Result cache: {cache_stats()}")
+        close_cache()
+        shutdown_executor()
+        close_all_connections()
 
 
 if __name__ == "__main__":
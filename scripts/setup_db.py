@@ -1,6 +1,19 @@
+import itertools
+import sys
+from pathlib import Path
+
 import pandas as pd
 import sqlite3 as sql
 
+# Add project root to path for direct script execution
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.mcp_openfoodtox.database.dossier import build_dossiers, encode_dossier
+from src.mcp_openfoodtox.database.facets import CUBE_DIMENSIONS, cuboid_query
+from src.mcp_openfoodtox.utils.formatting import classify_identifier, normalize_text, registry_kind
+
 xls = pd.ExcelFile("data/source/OpenFoodToxTX22809_2023.xlsx")
 dictionary = pd.read_excel(xls, "Dictionary")
 synonym = pd.read_excel(xls, "COM_SYNONYM")
@@ -13,27 +26,302 @@ genotox = pd.read_excel(xls, "GENOTOX")
 endpoint_study = pd.read_excel(xls, "ENDPOINTSTUDY")
 
 
+# ID column of each table that has one row per ID, declared INTEGER PRIMARY KEY
+PRIMARY_KEYS = {
+    "component": "SUB_COM_ID",
+    "opinion": "OP_ID",
+    "chem_assess": "HAZARD_ID",
+    "genotox": "GENOTOX_ID",
+    "endpoint_study": "TOX_ID",
+}
+
+# Dates stored as INTEGER yyyymmdd
+DATE_COLUMNS = {"ADOPTIONDATE", "PUBLICATIONDATE"}
+
+# Free-text filter columns that get a normalized shadow column <COLUMN>_NORM
+# (lowercased, whitespace-collapsed, COLLATE NOCASE) so queries need no LOWER() per row
+NORMALIZED_COLUMNS = {
+    "study": ["SUB_OP_CLASS", "REMARKS_STUDY"],
+    "chem_assess": ["ASSESSMENTTYPE", "POPULATIONTEXT"],
+}
+
+# Join and filter columns that get a secondary index (one single-column index each)
+SECONDARY_INDEXES = {
+    "study": [
+        "SUB_COM_ID",
+        "GENOTOX_ID",
+        "TOX_ID",
+        "HAZARD_ID",
+        "OP_ID",
+        "SUB_OP_CLASS_NORM",
+        "IS_MUTAGENIC",
+        "IS_GENOTOXIC",
+        "IS_CARCINOGENIC",
+    ],
+    "synonym": ["SUB_COM_ID"],
+    "question": ["OP_ID"],
+    "chem_assess": ["ASSESSMENTTYPE_NORM", "RISKVALUE_MILLI"],
+    "opinion": ["PUBLICATIONDATE"],
+}
+
+
+def to_yyyymmdd(value):
+    """Convert an Excel date cell (number, text or datetime) to an integer yyyymmdd, or None."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    return int(pd.to_datetime(text).strftime("%Y%m%d"))
+
+
+def column_type(series: pd.Series) -> str:
+    """
+    SQL type for a source column: INTEGER for IDs (*_ID with integral values), dates and
+    integer columns, REAL for other numbers, TEXT otherwise.
+    """
+    if series.name in DATE_COLUMNS:
+        return "INTEGER"
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        if series.name.endswith("_ID") and (values == values.round()).all():
+            return "INTEGER"
+        return "REAL"
+    return "TEXT"
+
+
+def create_table(conn, table_name: str, df: pd.DataFrame):
+    """
+    Create a table from explicit DDL and load the DataFrame into it.
+
+    Column types come from column_type() instead of pandas inference, dates are converted
+    to yyyymmdd integers, *_NORM shadow columns are added for NORMALIZED_COLUMNS, and the
+    PRIMARY_KEYS column is declared INTEGER PRIMARY KEY. If the source data has duplicate
+    or missing primary key values, a plain index is created instead.
+    """
+    df = df.copy()
+    for column in DATE_COLUMNS & set(df.columns):
+        df[column] = df[column].map(to_yyyymmdd).astype("Int64")
+    for column in NORMALIZED_COLUMNS.get(table_name, []):
+        df[f"{column}_NORM"] = df[column].map(normalize_text, na_action="ignore")
+
+    primary_key = PRIMARY_KEYS.get(table_name)
+    if primary_key is not None and not (df[primary_key].notna().all() and df[primary_key].is_unique):
+        print(f"Warning: {table_name}.{primary_key} is not unique, creating a non-unique index")
+        primary_key = None
+
+    column_definitions = []
+    for column in df.columns:
+        if column.endswith("_NORM"):
+            definition = f'"{column}" TEXT COLLATE NOCASE'
+        else:
+            definition = f'"{column}" {column_type(df[column])}'
+        if column == primary_key:
+            definition += " PRIMARY KEY"
+        column_definitions.append(definition)
+
+    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+    conn.execute(f"CREATE TABLE {table_name} (\n    " + ",\n    ".join(column_definitions) + "\n)")
+    # INTEGER affinity stores integral floats (IDs read as float because of NaN) as integers
+    df.to_sql(table_name, conn, if_exists="append", index=False)
+
+    if table_name in PRIMARY_KEYS and primary_key is None:
+        column = PRIMARY_KEYS[table_name]
+        conn.execute(f"CREATE INDEX pk_{table_name}_{column.lower()} ON {table_name} ({column})")
+
+
 # result = synonym[synonym['DESCRIPTION'].str.contains('vitamin', na=False)]['SUB_COM_ID']
+def create_indexes(conn):
+    """
+    Create secondary indexes on ID and filter columns, then ANALYZE.
+
+    Primary keys are declared by create_table(). ANALYZE records table statistics so the
+    query planner picks index lookups over scans.
+    """
+    for table, columns in SECONDARY_INDEXES.items():
+        for column in columns:
+            conn.execute(f"CREATE INDEX idx_{table}_{column.lower()} ON {table} ({column})")
+
+    conn.execute("ANALYZE")
+
+
+def create_search_index(conn):
+    """
+    Build FTS5 trigram indexes over synonym descriptions and component names.
+
+    The trigram tokenizer lets SQLite answer `LIKE '%term%'` (terms of 3+ characters) from
+    the index instead of scanning the base tables. Rows keep the rowid of their source row
+    so full records can be fetched back from `synonym` / `component`.
+    """
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS synonym_fts;
+        CREATE VIRTUAL TABLE synonym_fts USING fts5(
+            DESCRIPTION,
+            SUB_COM_ID UNINDEXED,
+            tokenize = 'trigram'
+        );
+        INSERT INTO synonym_fts (rowid, DESCRIPTION, SUB_COM_ID)
+            SELECT rowid, DESCRIPTION, SUB_COM_ID FROM synonym WHERE DESCRIPTION IS NOT NULL;
+
+        DROP TABLE IF EXISTS component_fts;
+        CREATE VIRTUAL TABLE component_fts USING fts5(
+            SUB_NAME,
+            COM_NAME,
+            SUB_COM_ID UNINDEXED,
+            tokenize = 'trigram'
+        );
+        INSERT INTO component_fts (rowid, SUB_NAME, COM_NAME, SUB_COM_ID)
+            SELECT rowid, SUB_NAME, COM_NAME, SUB_COM_ID FROM component;
+
+        INSERT INTO synonym_fts (synonym_fts) VALUES ('optimize');
+        INSERT INTO component_fts (component_fts) VALUES ('optimize');
+        """
+    )
+
+
+def create_identifier_table(conn):
+    """
+    Build the identifier lookup table (KIND, VALUE, SUB_COM_ID).
+
+    Every synonym description and component name that is shaped like an identifier
+    (E-number, CAS number, EC number, FEMA/JECFA/CoE number - see classify_identifier)
+    is stored under its normalized key. The (KIND, VALUE) primary key B-tree lets
+    search_substance resolve identifier queries with a single index lookup.
+
+    FEMA, JECFA and CoE number ranges overlap, so bare numbers are stored under the kind of
+    the registry named by their SYNONYM_TYPE (see registry_kind), and skipped when it names none.
+    """
+    sources = [
+        "SELECT DESCRIPTION, SYNONYM_TYPE, SUB_COM_ID FROM synonym WHERE DESCRIPTION IS NOT NULL",
+        "SELECT SUB_NAME, NULL, SUB_COM_ID FROM component WHERE SUB_NAME IS NOT NULL",
+        "SELECT COM_NAME, NULL, SUB_COM_ID FROM component WHERE COM_NAME IS NOT NULL",
+    ]
+    rows = set()
+    for query in sources:
+        for text, synonym_type, sub_com_id in conn.execute(query):
+            identifier = classify_identifier(text)
+            if identifier is not None and identifier[0] == "number":
+                kind = registry_kind(synonym_type)
+                identifier = (kind, identifier[1]) if kind is not None else None
+            if identifier is not None and sub_com_id is not None:
+                rows.add((*identifier, int(sub_com_id)))
+
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS identifier;
+        CREATE TABLE identifier (
+            KIND TEXT NOT NULL,
+            VALUE TEXT NOT NULL,
+            SUB_COM_ID INTEGER NOT NULL,
+            PRIMARY KEY (KIND, VALUE, SUB_COM_ID)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.executemany("INSERT INTO identifier (KIND, VALUE, SUB_COM_ID) VALUES (?, ?, ?)", sorted(rows))
+
+
+def create_dossier_table(conn):
+    """
+    Build the dossier table (SUB_COM_ID, DOSSIER): the full profile of every substance
+    (component, synonyms, safety assessment, risk assessments, toxicity endpoints, genotox,
+    opinions, questions) as one zlib-compressed JSON blob.
+
+    get_substance_dossier reads a profile with a single primary-key lookup instead of
+    walking the base tables on every call.
+    """
+    dossiers = build_dossiers(conn)
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS dossier;
+        CREATE TABLE dossier (
+            SUB_COM_ID INTEGER PRIMARY KEY,
+            DOSSIER BLOB NOT NULL
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO dossier (SUB_COM_ID, DOSSIER) VALUES (?, ?)",
+        ((sub_com_id, encode_dossier(dossier)) for sub_com_id, dossier in sorted(dossiers.items())),
+    )
+
+
+def create_facet_cube(conn):
+    """
+    Build the facet_cube table: distinct substance counts for every combination of facets.
+
+    Holds one cuboid per subset of CUBE_DIMENSIONS (class, the three safety flags,
+    assessment type, population), identified by the DIMS bitmask; dimensions outside the
+    cuboid are NULL. Distinct counts cannot be added up across cells, so every cuboid is
+    computed from the fact rows. count_substances_by_facets then answers any group-by/filter
+    combination by reading the cells of one cuboid.
+    """
+    columns = ",\n    ".join(f"{column} TEXT COLLATE NOCASE" for column in CUBE_DIMENSIONS.values())
+    conn.executescript(
+        f"""
+        DROP TABLE IF EXISTS facet_cube;
+        CREATE TABLE facet_cube (
+            DIMS INTEGER NOT NULL,
+            {columns},
+            SUBSTANCE_COUNT INTEGER NOT NULL
+        );
+        """
+    )
+    for size in range(len(CUBE_DIMENSIONS) + 1):
+        for dimensions in itertools.combinations(CUBE_DIMENSIONS, size):
+            query, params = cuboid_query(dimensions)
+            conn.execute(f"INSERT INTO facet_cube {query}", params)
+    conn.execute("CREATE INDEX idx_facet_cube_dims ON facet_cube (DIMS)")
+
+
 def create_db():
     try:
         conn = sql.connect("database/openfoodtox.db")
 
-        # Write dataframes to SQLite tables
-        dictionary.to_sql("dictionary", conn, if_exists="replace", index=False)
-        synonym.to_sql("synonym", conn, if_exists="replace", index=False)
-        opinion.to_sql("opinion", conn, if_exists="replace", index=False)
-        component.to_sql("component", conn, if_exists="replace", index=False)
-        study.to_sql("study", conn, if_exists="replace", index=False)
-        chem_assess.to_sql("chem_assess", conn, if_exists="replace", index=False)
-        question.to_sql("question", conn, if_exists="replace", index=False)
-        genotox.to_sql("genotox", conn, if_exists="replace", index=False)
-        endpoint_study.to_sql("endpoint_study", conn, if_exists="replace", index=False)
+        # Write dataframes to SQLite tables with an explicit, typed schema
+        create_table(conn, "dictionary", dictionary)
+        create_table(conn, "synonym", synonym)
+        create_table(conn, "opinion", opinion)
+        create_table(conn, "component", component)
+        create_table(conn, "study", study)
+        create_table(conn, "chem_assess", chem_assess)
+        create_table(conn, "question", question)
+        create_table(conn, "genotox", genotox)
+        create_table(conn, "endpoint_study", endpoint_study)
+
+        # Full-text (trigram) indexes used by substance search
+        create_search_index(conn)
+
+        # Normalized E-number / CAS / EC / FEMA-style identifier lookup
+        create_identifier_table(conn)
+
+        # Primary key / secondary indexes and planner statistics
+        create_indexes(conn)
+
+        # Precomputed per-substance profiles (uses the indexes above)
+        create_dossier_table(conn)
+
+        # Precomputed distinct substance counts per facet combination
+        create_facet_cube(conn)
 
         conn.commit()
+
+        # Finalize the snapshot: rollback journal mode and no free pages, so the server
+        # can open it with immutable=1 (see database/connection.py verify_snapshot)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("VACUUM")
         print("Database created successfully at database/openfoodtox.db")
         print(
             f"Tables created: dictionary, synonym, opinion, component, study, chem_assess, question, genotox, endpoint_study"
         )
+        print("Search indexes created: synonym_fts, component_fts, identifier")
+        print("Substance dossiers created: dossier")
+        print("Facet counts created: facet_cube")
+        print(f"Indexes created on: {', '.join(sorted(set(PRIMARY_KEYS) | set(SECONDARY_INDEXES)))}")
     except sql.Error as e:
         print(f"Error creating database: {e}")
     finally:
@@ -0,0 +1,22 @@
+import json
+from typing import Iterable
+
+# Subquery yielding the IDs of a JSON array bound to its single "?" parameter.
+# Use as `WHERE <column> IN (ID_LIST_SUBQUERY)` with bind_ids(ids) as the parameter:
+# the SQL text is the same for any number of IDs, so sqlite3's statement cache is reused
+# and large lists never hit SQLite's bound-variable limit.
+ID_LIST_SUBQUERY = "SELECT value FROM json_each(?)"
+
+
+def bind_ids(ids: Iterable) -> str:
+    """
+    Encode IDs as the JSON array parameter for ID_LIST_SUBQUERY.
+
+    Values are converted to int (numpy integers and integral floats from pandas included);
+    missing values (None/NaN) are dropped, as they could never match an IN list anyway.
+
+    Example:
+        >>> bind_ids([3, 1.0, None])
+        '[3, 1]'
+    """
+    return json.dumps([int(value) for value in ids if value is not None and value == value])
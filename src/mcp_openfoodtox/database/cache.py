@@ -0,0 +1,474 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from src.mcp_openfoodtox.database.connection import get_db_path
+from src.mcp_openfoodtox.database.singleflight import SingleFlight
+from src.mcp_openfoodtox.database.version import DatasetVersion, get_dataset_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MB = 64
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Persistent cache file, created next to the database file
+DISK_CACHE_FILENAME = "openfoodtox.cache.db"
+
+# Seconds a cache process waits for another process's write lock before giving up
+DISK_CACHE_BUSY_TIMEOUT = 5.0
+
+# Read times of disk cache hits are written in batches: after this many hits or seconds,
+# or with the next write
+DISK_CACHE_ACCESS_BATCH = 100
+DISK_CACHE_ACCESS_FLUSH_SECONDS = 30.0
+
+def _estimate_size(value) -> int:
+    """Approximate memory footprint of a cached tool result (a str or its JSON text) in bytes."""
+    return sys.getsizeof(value)
+
+
+def get_disk_cache_path() -> Path:
+    """Path of the persistent cache file (next to the database file)."""
+    return get_db_path().with_name(DISK_CACHE_FILENAME)
+
+
+class DiskCache:
+    """
+    Persistent key-value store of serialized tool results in a sidecar SQLite file.
+
+    Entries survive server restarts and are shared by every server process using the same
+    file. The file is in WAL mode, so readers never block each other or the writer; writes
+    are short BEGIN IMMEDIATE transactions that wait up to DISK_CACHE_BUSY_TIMEOUT for a
+    concurrent writer. Reads use their own connection, so a get() never queues behind a
+    put() that is waiting for another process's lock. When the stored results exceed the size budget, the least recently
+    read entries are deleted. Entries of other dataset versions are purged when the cache
+    is opened and whenever the dataset version changes (purge_other_versions).
+
+    Hits do not write: their read times are collected in memory and written in one
+    transaction every DISK_CACHE_ACCESS_BATCH hits or DISK_CACHE_ACCESS_FLUSH_SECONDS, and
+    before every put (so eviction sees them). A hit only writes them when no put is in
+    progress; otherwise the put does.
+
+    The cache never fails a tool call: SQLite errors (e.g. a lock timeout) are logged and
+    treated as a miss or a skipped write.
+    """
+
+    def __init__(
+        self, path: Path, max_bytes: int, ttl_seconds: Optional[float] = None, version: Optional[str] = None
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._accessed: dict[str, float] = {}  # KEY -> read time not yet written
+        self._accessed_flushed_at = time.monotonic()
+        self._accessed_lock = threading.Lock()
+        self._lock = threading.Lock()  # guards the write connection
+        self._read_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=DISK_CACHE_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS response (
+                KEY TEXT PRIMARY KEY,
+                VERSION TEXT NOT NULL,
+                VALUE TEXT NOT NULL,
+                SIZE INTEGER NOT NULL,
+                ACCESSED REAL NOT NULL,
+                EXPIRES REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_response_accessed ON response (ACCESSED);
+            """
+        )
+        self._read_conn = sqlite3.connect(
+            self.path, timeout=DISK_CACHE_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        if version is not None:
+            self.purge_other_versions(version)
+
+    @staticmethod
+    def _key(key: tuple) -> str:
+        return json.dumps(list(key))
+
+    def get(self, key: tuple) -> tuple[bool, object]:
+        """Return (True, value) on a hit, (False, None) on a miss, expired entry or error."""
+        now = time.time()
+        try:
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT VALUE, EXPIRES FROM response WHERE KEY = ?", (self._key(key),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return False, None
+        if row is None or (row[1] is not None and row[1] <= now):
+            return False, None
+        with self._accessed_lock:
+            self._accessed[self._key(key)] = now
+            due = (
+                len(self._accessed) >= DISK_CACHE_ACCESS_BATCH
+                or time.monotonic() - self._accessed_flushed_at >= DISK_CACHE_ACCESS_FLUSH_SECONDS
+            )
+        if due and self._lock.acquire(blocking=False):
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._write_accessed_locked()
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read times not saved: {e}")
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+            finally:
+                self._lock.release()
+        return True, json.loads(row[0])
+
+    def _write_accessed_locked(self):
+        """Write the collected read times (inside the caller's transaction)."""
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+            self._accessed_flushed_at = time.monotonic()
+        if accessed:
+            self._conn.executemany(
+                "UPDATE response SET ACCESSED = MAX(ACCESSED, ?) WHERE KEY = ?",
+                [(accessed_at, key) for key, accessed_at in accessed.items()],
+            )
+
+    def purge_other_versions(self, version: str):
+        """Delete the entries of every dataset version other than `version`."""
+        try:
+            with self._lock:
+                deleted = self._conn.execute("DELETE FROM response WHERE VERSION != ?", (version,)).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache purge failed: {e}")
+            return
+        if deleted:
+            logger.info(f"Disk cache: purged {deleted} result(s) of other dataset versions")
+
+    def put(self, key: tuple, value):
+        """Store a result, evicting least recently read entries beyond the size budget."""
+        text = json.dumps(value, default=str)
+        size = len(text.encode())
+        if size > self.max_bytes:
+            return
+        version = key[0]
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._write_accessed_locked()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO response (KEY, VERSION, VALUE, SIZE, ACCESSED, EXPIRES) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (self._key(key), version, text, size, now, expires_at),
+                    )
+                    # Keep the most recently read entries whose sizes add up to the budget
+                    self._conn.execute(
+                        """
+                        DELETE FROM response WHERE KEY IN (
+                            SELECT KEY FROM (
+                                SELECT KEY, SUM(SIZE) OVER (ORDER BY ACCESSED DESC, KEY) AS RUNNING_SIZE
+                                FROM response
+                            )
+                            WHERE RUNNING_SIZE > ?
+                        )
+                        """,
+                        (self.max_bytes,),
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+
+    def stats(self) -> dict:
+        try:
+            with self._read_lock:
+                entries, size = self._read_conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(SIZE), 0) FROM response"
+                ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "path": str(self.path)}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._write_accessed_locked()
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read times not saved: {e}")
+            self._conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+
+class ResultCache:
+    """
+    In-process LRU cache of tool results with a memory budget and a TTL.
+
+    Keys combine the tool name, its normalized arguments and the dataset version, so a
+    rebuilt database never serves old results. When the dataset version changes, the whole
+    cache is dropped to free the memory held by unreachable entries.
+
+    With a DiskCache attached, memory misses fall through to the disk tier and disk hits
+    are copied into memory; every new result is written to both tiers. Disk reads and
+    writes may wait on another process's write lock, so async callers use get_async() and
+    put_in_background(), which run them on a worker thread.
+
+    Strings are stored as is. Other results (dicts, lists) are stored as JSON text and
+    decoded on every hit, so callers never share (and can never mutate) a cached object.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL_SECONDS,
+        dataset_version: Optional[DatasetVersion] = None,
+        disk: Optional[DiskCache] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.dataset_version = dataset_version or DatasetVersion()
+        self.disk = disk
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (value or JSON text, size, expires_at, is_json)
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.disk is not None
+
+    def key(self, tool_name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> tuple:
+        """
+        Build the cache key for a call: (dataset version, tool name, normalized arguments).
+
+        Arguments are bound to the tool signature with defaults applied, so positional,
+        keyword and omitted-default spellings of the same call share one entry.
+        """
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = json.dumps(bound.arguments, sort_keys=True, default=str)
+        version = self.dataset_version.current()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logger.info("Dataset changed, clearing the result cache")
+                self._clear_locked()
+                self._version = version
+        return version, tool_name, arguments
+
+    def refresh_dataset_version(self) -> str:
+        """
+        Re-check the database file (see DatasetVersion.refresh) and, when it changed, purge
+        the disk tier's results of other versions. Blocks: run it on a worker thread.
+        """
+        previous = self.dataset_version.current()
+        version = self.dataset_version.refresh()
+        disk = self.disk
+        if version != previous and disk is not None:
+            disk.purge_other_versions(version)
+        return version
+
+    def get(self, key: tuple) -> tuple[bool, object]:
+        """Return (True, value) on a hit, (False, None) on a miss or expired entry."""
+        hit, value = self._get_memory(key)
+        if not hit and self.disk is not None:
+            hit, value = self._get_disk(self.disk, key)
+        if not hit:
+            self._count_miss()
+        return hit, value
+
+    async def get_async(self, key: tuple) -> tuple[bool, object]:
+        """Like get(), but the disk tier is read on a worker thread instead of the event loop."""
+        hit, value = self._get_memory(key)
+        if not hit and self.disk is not None:
+            hit, value = await asyncio.get_running_loop().run_in_executor(None, self._get_disk, self.disk, key)
+        if not hit:
+            self._count_miss()
+        return hit, value
+
+    def _get_memory(self, key: tuple) -> tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                stored, _, _, is_json = entry
+                return True, json.loads(stored) if is_json else stored
+            if entry is not None:
+                self._remove_locked(key)
+        return False, None
+
+    def _get_disk(self, disk: DiskCache, key: tuple) -> tuple[bool, object]:
+        hit, value = disk.get(key)
+        if hit:
+            self._put_memory(key, value)
+            with self._lock:
+                self.disk_hits += 1
+        return hit, value
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key: tuple, value):
+        """Store a result in memory (and on disk), evicting least recently used entries."""
+        self._put_memory(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def put_in_background(self, key: tuple, value):
+        """
+        Store a result in memory now and on disk on a worker thread, without waiting for the
+        write. Must be called from the event loop; a failed disk write is only logged.
+        """
+        self._put_memory(key, value)
+        if self.disk is not None:
+            asyncio.get_running_loop().run_in_executor(None, self.disk.put, key, value)
+
+    def _put_memory(self, key: tuple, value):
+        is_json = not isinstance(value, str)
+        stored = json.dumps(value, default=str) if is_json else value
+        size = _estimate_size(stored)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = (stored, size, expires_at, is_json)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove_locked(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove_locked(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _clear_locked(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+_cache = ResultCache(dataset_version=get_dataset_version())
+_singleflight = SingleFlight()
+
+
+def cache_tool(async_fn):
+    """
+    Wrap an async tool so repeated calls with the same arguments are answered from the cache,
+    and identical concurrent calls share one execution (see SingleFlight).
+
+    Only successful results are cached; exceptions propagate (to every coalesced caller)
+    and are retried next call. The wrapper keeps the tool's name, docstring and signature
+    (functools.wraps).
+    """
+    signature = inspect.signature(async_fn)
+
+    @functools.wraps(async_fn)
+    async def wrapper(*args, **kwargs):
+        dataset_version = _cache.dataset_version
+        if dataset_version.claim_check():
+            # Hashing a changed database file takes a while: check it on a worker thread.
+            # Calls keep using the previous version until the check completes.
+            asyncio.get_running_loop().run_in_executor(None, _cache.refresh_dataset_version)
+        key = _cache.key(async_fn.__name__, signature, args, kwargs)
+        if _cache.enabled:
+            hit, value = await _cache.get_async(key)
+            if hit:
+                return value
+
+        async def execute():
+            value = await async_fn(*args, **kwargs)
+            if _cache.enabled:
+                _cache.put_in_background(key, value)
+            return value
+
+        return await _singleflight.do(key, execute)
+
+    return wrapper
+
+
+def configure_cache(
+    max_mb: float = DEFAULT_CACHE_MB,
+    ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL_SECONDS,
+    disk_mb: float = 0,
+):
+    """
+    Set the result cache memory budget (MB, 0 disables caching) and TTL (seconds, 0 for none).
+    With disk_mb > 0, results are also persisted to the sidecar cache file (see DiskCache).
+    Call once at server startup.
+    """
+    if max_mb < 0:
+        raise ValueError(f"cache size must not be negative, got {max_mb}")
+    if disk_mb < 0:
+        raise ValueError(f"disk cache size must not be negative, got {disk_mb}")
+    _cache.max_bytes = int(max_mb * 1024 * 1024)
+    _cache.ttl_seconds = ttl_seconds or None
+    _cache.clear()
+    _cache.dataset_version.refresh()
+    close_cache()
+    if disk_mb > 0:
+        _cache.disk = DiskCache(
+            get_disk_cache_path(),
+            int(disk_mb * 1024 * 1024),
+            ttl_seconds or None,
+            version=_cache.dataset_version.current(),
+        )
+    logger.info(
+        f"Result cache {'disabled' if not _cache.max_bytes else f'budget {max_mb:g} MB'}"
+        + (f", disk {disk_mb:g} MB at {_cache.disk.path}" if _cache.disk is not None else "")
+        + (f", TTL {ttl_seconds:g} s" if _cache.enabled and ttl_seconds else "")
+    )
+
+
+def close_cache():
+    """Close the persistent cache file, if one is open (e.g. on server shutdown)."""
+    if _cache.disk is not None:
+        _cache.disk.close()
+        _cache.disk = None
+
+
+def cache_stats() -> dict:
+    """Hit/miss/eviction counters and current size of the result cache, plus coalesced calls."""
+    return {**_cache.stats(), "coalesced": _singleflight.coalesced, "in_flight": _singleflight.in_flight()}
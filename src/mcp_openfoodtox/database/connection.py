@@ -1,26 +1,258 @@
+import atexit
+import logging
 import sqlite3
+import threading
+import time
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# PRAGMAs applied to every pooled connection. The server only reads from the database.
+READ_ONLY_PRAGMAS = {
+    "query_only": "ON",  # reject any write through a pooled connection
+    "temp_store": "MEMORY",  # sorts/DISTINCT/GROUP BY temp b-trees stay in memory
+    "cache_size": -32000,  # page cache per connection, in KiB when negative (~32 MB)
+    "mmap_size": 268435456,  # read pages through a 256 MB memory map instead of read() calls
+}
+
+# Connection modes:
+# - "default": open the database file normally (read/write file, file locking)
+# - "immutable": open via URI with mode=ro&immutable=1 - no locking, no change detection,
+#   pages served from a large memory map; requires a finalized snapshot (see verify_snapshot)
+# - "memory": copy the whole database into a shared-cache in-memory database at startup
+#   (sqlite3 backup API) and serve every query from RAM
+DB_MODES = ("default", "immutable", "memory")
+
+# Shared-cache in-memory database; every connection opening this URI sees the same data
+# for as long as at least one connection to it stays open
+MEMORY_DB_URI = "file:openfoodtox_memdb?mode=memory&cache=shared"
+
+# Memory map size for immutable mode; large enough to map the whole database file
+IMMUTABLE_MMAP_SIZE = 1 << 30
+
 
 def get_db_path():
     """Get the absolute path to the OpenFoodTox database."""
     # Get the project root (parent of src/)
-    project_root = Path(__file__).parent.parent.parent.parent
+    project_root = Path(__file__).resolve().parent.parent.parent.parent
     return project_root / "database" / "openfoodtox.db"
 
 
+def verify_snapshot(db_path: Path):
+    """
+    Check that a database file is a finalized, vacuumed snapshot that is safe to open immutable.
+
+    SQLite trusts immutable files completely, so the file must not be mid-write (no rollback
+    journal or WAL next to it), must not be in WAL mode, and should have no free pages left
+    over from the build (i.e. VACUUM has been run, as scripts/setup_db.py does).
+
+    Raises:
+        RuntimeError: If the file is missing or not a finalized snapshot.
+    """
+    db_path = Path(db_path)
+    if not db_path.is_file():
+        raise RuntimeError(f"Database not found at {db_path}. Run 'make db' first.")
+
+    for suffix in ("-journal", "-wal"):
+        sidecar = db_path.with_name(db_path.name + suffix)
+        if sidecar.exists():
+            raise RuntimeError(
+                f"{sidecar} exists - the database is being written or was not closed cleanly."
+            )
+
+    connection = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    try:
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        connection.close()
+
+    if journal_mode.lower() == "wal":
+        raise RuntimeError(f"{db_path} is in WAL mode; rebuild it with 'make db'.")
+    if freelist_count:
+        raise RuntimeError(
+            f"{db_path} has {freelist_count} free pages and is not vacuumed; rebuild it with 'make db'."
+        )
+
+
+class ConnectionPool:
+    """
+    Thread-local pool of read-only SQLite connections.
+
+    Each thread gets one connection on first use and keeps reusing it, so queries skip the
+    open/close and schema-parse cost. Every connection handed out is tracked with its
+    owner thread so that close_all() can close them on shutdown.
+
+    A connection is only ever closed by the thread that uses it, or once that thread has
+    exited: close_all() cannot tell whether another live thread (e.g. a database executor
+    worker) is in the middle of a query, so those connections are retired instead and
+    their thread closes them itself on its next get_connection().
+    """
+
+    def __init__(self, pragmas: dict = READ_ONLY_PRAGMAS, mode: str = "default"):
+        self.pragmas = pragmas
+        self.mode = mode
+        self._memory_keeper = None  # holds the in-memory copy open in "memory" mode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by close_all(); older connections are retired
+        self._connections: list[tuple[threading.Thread, sqlite3.Connection]] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close_all() can close the connections of exited
+        # threads from the shutdown thread; each connection is still used by a single thread.
+        db_path = get_db_path()
+        pragmas = self.pragmas
+        if self.mode == "immutable":
+            connection = sqlite3.connect(
+                f"{db_path.as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False
+            )
+            pragmas = {**pragmas, "mmap_size": IMMUTABLE_MMAP_SIZE}
+        elif self.mode == "memory":
+            connection = sqlite3.connect(MEMORY_DB_URI, uri=True, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        for pragma, value in pragmas.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        return connection
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use or after close_all()."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.generation != self._generation:
+            # Retired by close_all() while this thread was alive: close it from its own thread
+            self._close_owned(connection)
+            connection = None
+        if connection is None:
+            connection = self._connect()
+            thread = threading.current_thread()
+            with self._lock:
+                self._local.connection = connection
+                self._local.generation = self._generation
+                self._connections.append((thread, connection))
+            logger.debug(f"Opened pooled connection for thread {thread.name}")
+        return connection
+
+    def _close_owned(self, connection: sqlite3.Connection):
+        with self._lock:
+            self._connections = [entry for entry in self._connections if entry[1] is not connection]
+        try:
+            connection.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing pooled connection: {e}")
+
+    def load_memory_copy(self) -> dict:
+        """
+        Copy the on-disk database into the shared in-memory database.
+
+        Returns:
+            Dictionary with 'seconds' (load time) and 'bytes' (size of the in-memory copy)
+        """
+        start = time.perf_counter()
+        source = sqlite3.connect(f"{get_db_path().as_uri()}?mode=ro", uri=True)
+        keeper = sqlite3.connect(MEMORY_DB_URI, uri=True, check_same_thread=False)
+        try:
+            source.backup(keeper)
+        finally:
+            source.close()
+        page_count = keeper.execute("PRAGMA page_count").fetchone()[0]
+        page_size = keeper.execute("PRAGMA page_size").fetchone()[0]
+
+        self.release_memory_copy()
+        self._memory_keeper = keeper
+        return {"seconds": time.perf_counter() - start, "bytes": page_count * page_size}
+
+    def release_memory_copy(self):
+        """Close the keeper connection; the in-memory copy is freed once pooled connections close."""
+        if self._memory_keeper is not None:
+            self._memory_keeper.close()
+            self._memory_keeper = None
+
+    def close_all(self):
+        """
+        Close the pool's connections. Threads reconnect on their next query.
+
+        Connections of the calling thread and of exited threads are closed now. Those of
+        other live threads may be running a query, so they are retired and closed by their
+        own thread on its next get(); shut down the database executor first (as main.py
+        does) to have every worker's connection closed here.
+        """
+        current = threading.current_thread()
+        with self._lock:
+            self._generation += 1
+            closable = [entry for entry in self._connections if entry[0] is current or not entry[0].is_alive()]
+            self._connections = [entry for entry in self._connections if entry not in closable]
+            retired = len(self._connections)
+            if getattr(self._local, "connection", None) is not None:
+                self._local.connection = None
+        for _, connection in closable:
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing pooled connection: {e}")
+        if closable or retired:
+            logger.debug(
+                f"Closed {len(closable)} pooled connection(s), {retired} in use by other threads retired"
+            )
+
+
+_pool = ConnectionPool()
+atexit.register(_pool.release_memory_copy)
+atexit.register(_pool.close_all)
+
+
 def get_connection():
     """
     Get a connection to the OpenFoodTox database.
 
+    Connections are pooled per thread and reused across calls; they are read-only
+    (PRAGMA query_only) and closed automatically at interpreter shutdown.
+
     The connection supports the context manager protocol, so it can be used with 'with':
 
         with get_connection() as conn:
             # use conn
             pass
 
+    Note that 'with' only scopes a transaction; it does not close the pooled connection.
+
     Returns:
         sqlite3.Connection: Database connection object (supports context manager)
     """
-    db_path = get_db_path()
-    return sqlite3.connect(str(db_path))
+    return _pool.get()
+
+
+def configure_connections(mode: str = "default"):
+    """
+    Select how pooled connections open the database. Call once at server startup.
+
+    Args:
+        mode: One of DB_MODES. "immutable" verifies the file first (see verify_snapshot),
+              "memory" loads the whole database into RAM and logs load time and size.
+
+    Raises:
+        ValueError: If the mode is unknown.
+        RuntimeError: If "immutable" is requested and the file is not a finalized snapshot.
+    """
+    if mode not in DB_MODES:
+        raise ValueError(f"Unknown database mode: {mode}. Valid modes: {', '.join(DB_MODES)}")
+    if mode == "immutable":
+        verify_snapshot(get_db_path())
+
+    if mode == "memory":
+        stats = _pool.load_memory_copy()
+        logger.info(
+            f"Loaded database into memory in {stats['seconds'] * 1000:.0f} ms "
+            f"({stats['bytes'] / (1024 * 1024):.1f} MB)"
+        )
+
+    _pool.mode = mode
+    _pool.close_all()
+    if mode != "memory":
+        _pool.release_memory_copy()
+    logger.info(f"Database connections use '{mode}' mode")
+
+
+def close_all_connections():
+    """Close all pooled connections (e.g. on server shutdown or before replacing the database file)."""
+    _pool.close_all()
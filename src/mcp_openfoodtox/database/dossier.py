@@ -0,0 +1,192 @@
+import json
+import logging
+import zlib
+from typing import Optional
+
+from src.mcp_openfoodtox.database.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Dossier section -> query returning (DOSSIER_ID, record columns...) in output order.
+# {where} is empty when building every dossier, or restricts the query to one substance
+# on the column named by "id_column".
+DOSSIER_SECTIONS = {
+    "component": {
+        "query": "SELECT c.SUB_COM_ID AS DOSSIER_ID, c.* FROM component c {where} ORDER BY c.SUB_COM_ID",
+        "id_column": "c.SUB_COM_ID",
+    },
+    "synonyms": {
+        "query": "SELECT s.SUB_COM_ID AS DOSSIER_ID, s.* FROM synonym s {where} ORDER BY s.SUB_COM_ID, s.rowid",
+        "id_column": "s.SUB_COM_ID",
+    },
+    "safety_assessment": {
+        # Same fields and order as query_safety_assessment()
+        "query": """
+            SELECT
+                s.SUB_COM_ID AS DOSSIER_ID,
+                s.SUB_OP_CLASS,
+                s.IS_MUTAGENIC,
+                s.IS_GENOTOXIC,
+                s.IS_CARCINOGENIC,
+                s.REMARKS_STUDY,
+                s.TOXREF_ID,
+                s.OP_ID,
+                o.ADOPTIONDATE,
+                o.PUBLICATIONDATE,
+                o.AUTHOR,
+                o.TITLE
+            FROM study s
+            LEFT JOIN opinion o ON s.OP_ID = o.OP_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, o.PUBLICATIONDATE ASC
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+    "risk_assessments": {
+        "query": """
+            SELECT DISTINCT s.SUB_COM_ID AS DOSSIER_ID, a.*
+            FROM study s JOIN chem_assess a ON a.HAZARD_ID = s.HAZARD_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, a.HAZARD_ID
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+    "toxicity_endpoints": {
+        "query": """
+            SELECT DISTINCT s.SUB_COM_ID AS DOSSIER_ID, e.*
+            FROM study s JOIN endpoint_study e ON e.TOX_ID = s.TOX_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, e.TOX_ID
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+    "genotox": {
+        "query": """
+            SELECT DISTINCT s.SUB_COM_ID AS DOSSIER_ID, g.*
+            FROM study s JOIN genotox g ON g.GENOTOX_ID = s.GENOTOX_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, g.GENOTOX_ID
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+    "opinions": {
+        "query": """
+            SELECT DISTINCT s.SUB_COM_ID AS DOSSIER_ID, o.*
+            FROM study s JOIN opinion o ON o.OP_ID = s.OP_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, o.PUBLICATIONDATE, o.OP_ID
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+    "questions": {
+        "query": """
+            SELECT DISTINCT s.SUB_COM_ID AS DOSSIER_ID, q.*
+            FROM study s JOIN question q ON q.OP_ID = s.OP_ID
+            {where}
+            ORDER BY s.SUB_COM_ID, q.OP_ID, q.QUESTION_ID
+        """,
+        "id_column": "s.SUB_COM_ID",
+    },
+}
+
+# zlib level for stored dossiers (built once, decompressed on every read)
+DOSSIER_COMPRESSION_LEVEL = 9
+
+_DOSSIER_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def build_dossiers(db_connection, sub_com_id: Optional[int] = None) -> dict[int, dict]:
+    """
+    Assemble the full profile of every substance (or of one substance) from the base tables.
+
+    Runs one query per section (DOSSIER_SECTIONS) and groups the rows by SUB_COM_ID.
+    *_NORM shadow columns are left out; they only exist for filtering.
+
+    Returns:
+        {SUB_COM_ID: {"SUB_COM_ID": ..., "component": {...}, "<section>": [records], ...}}
+        for every substance in the component table
+    """
+    dossiers: dict[int, dict] = {}
+    for section, spec in DOSSIER_SECTIONS.items():
+        if sub_com_id is None:
+            where, params = "", []
+        else:
+            where, params = f"WHERE {spec['id_column']} = ?", [sub_com_id]
+        cursor = db_connection.execute(spec["query"].format(where=where), params)
+        columns = [column[0] for column in cursor.description]
+        keep = [i for i, column in enumerate(columns) if i > 0 and not column.endswith("_NORM")]
+        for row in cursor:
+            dossier_id = row[0]
+            record = {columns[i]: row[i] for i in keep}
+            if section == "component":
+                dossiers[dossier_id] = {
+                    "SUB_COM_ID": dossier_id,
+                    **{name: [] for name in DOSSIER_SECTIONS},
+                    "component": record,
+                }
+            elif dossier_id in dossiers:
+                dossiers[dossier_id][section].append(record)
+    return dossiers
+
+
+def encode_dossier(dossier: dict) -> bytes:
+    """Serialize a dossier to compact JSON and zlib-compress it."""
+    return zlib.compress(_DOSSIER_ENCODER.encode(dossier).encode(), DOSSIER_COMPRESSION_LEVEL)
+
+
+def has_dossier_table(db_connection) -> bool:
+    """Check whether the database has the precomputed dossier table (built by setup_db.py)."""
+    return (
+        db_connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dossier'"
+        ).fetchone()
+        is not None
+    )
+
+
+def query_dossier(sub_com_id: int, sections: Optional[list[str]] = None) -> Optional[str]:
+    """
+    Get the full profile of a substance as a JSON object string.
+
+    Reads the precomputed, compressed dossier with a single primary-key lookup. Databases
+    built before the dossier table existed fall back to assembling it from the base tables.
+
+    Args:
+        sub_com_id: SUB_COM_ID of the substance
+        sections: Optional subset of DOSSIER_SECTIONS to return; all sections if None
+
+    Returns:
+        JSON object string, or None if the substance does not exist
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    if sections is not None:
+        unknown = [section for section in sections if section not in DOSSIER_SECTIONS]
+        if unknown:
+            raise ValueError(
+                f"Unknown dossier section(s): {', '.join(unknown)}. "
+                f"Valid sections: {', '.join(DOSSIER_SECTIONS)}"
+            )
+
+    with get_connection() as db_connection:
+        if has_dossier_table(db_connection):
+            row = db_connection.execute(
+                "SELECT DOSSIER FROM dossier WHERE SUB_COM_ID = ?", [sub_com_id]
+            ).fetchone()
+            if row is None:
+                return None
+            text = zlib.decompress(row[0]).decode()
+            if sections is None:
+                # Stored JSON is returned as is, without parsing
+                return text
+            dossier = json.loads(text)
+        else:
+            logger.warning("dossier table not found, building the dossier from the base tables (run 'make db')")
+            dossier = build_dossiers(db_connection, sub_com_id).get(sub_com_id)
+            if dossier is None:
+                return None
+
+    if sections is not None:
+        dossier = {"SUB_COM_ID": dossier["SUB_COM_ID"], **{section: dossier[section] for section in sections}}
+    return _DOSSIER_ENCODER.encode(dossier)
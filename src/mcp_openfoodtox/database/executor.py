@@ -0,0 +1,206 @@
+import asyncio
+import functools
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from mcp.server.fastmcp.exceptions import ToolError
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.guard import (
+    QueryGuard,
+    QueryLimits,
+    QueryTooExpensiveError,
+    limits_for_tool,
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker lanes for database-bound tool calls -> max worker threads per lane.
+# ID lookups and list/search queries run on separate bounded pools, so a burst of slow
+# list queries can never occupy the workers that fast lookups need.
+WORKER_LANES = {
+    "lookup": 4,
+    "query": 4,
+}
+
+# Default per-call time limit in seconds (None = no limit)
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+# SQLite VM instructions between progress handler calls (cancellation check granularity)
+PROGRESS_INTERVAL = 1000
+
+
+class QueryTimeoutError(TimeoutError):
+    """A tool call exceeded its time limit; its SQLite statement was interrupted."""
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread pools that run synchronous (sqlite/pandas) tool code off the event loop.
+
+    Each lane has its own ThreadPoolExecutor. Worker threads live as long as the executor,
+    so every worker keeps reusing its pooled connection (see connection.ConnectionPool).
+
+    Calls can time out. When a call times out or its request is cancelled, a progress
+    handler on the worker's connection aborts the running SQLite statement (and any
+    statement the job starts afterwards), so the worker is freed instead of finishing a
+    query nobody is waiting for. The same handler (a QueryGuard) enforces the call's
+    QueryLimits and raises QueryTooExpensiveError when they are exceeded.
+    """
+
+    def __init__(self, lanes: dict = WORKER_LANES, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+        self.lanes = dict(lanes)
+        self.timeout = timeout
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self, lane: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(lane)
+            if executor is None:
+                if lane not in self.lanes:
+                    raise ValueError(f"Unknown worker lane: {lane}. Valid lanes: {', '.join(self.lanes)}")
+                executor = ThreadPoolExecutor(
+                    max_workers=self.lanes[lane], thread_name_prefix=f"openfoodtox-{lane}"
+                )
+                self._executors[lane] = executor
+            return executor
+
+    @staticmethod
+    def _call(cancelled: threading.Event, limits: QueryLimits, fn, args, kwargs):
+        """Worker side: run the job under a QueryGuard that aborts on cancellation or over-limit."""
+        if cancelled.is_set():
+            # Timed out or cancelled while still queued
+            raise QueryTimeoutError("Cancelled before it started")
+        connection = get_connection()
+        guard = QueryGuard(limits, PROGRESS_INTERVAL, cancelled)
+        # A non-zero return from the guard makes SQLite abort the statement ("interrupted")
+        connection.set_progress_handler(guard, PROGRESS_INTERVAL)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            # pandas wraps sqlite3 errors in its own DatabaseError, so check the guard itself
+            if guard.exceeded is not None:
+                raise guard.error(fn.__name__) from None
+            raise
+        finally:
+            connection.set_progress_handler(None, 0)
+        if guard.exceeded is not None:
+            # Some query helpers log errors and return empty results instead of raising
+            raise guard.error(fn.__name__)
+        return result
+
+    async def run(
+        self,
+        lane: str,
+        fn,
+        *args,
+        timeout: Optional[float] = None,
+        limits: Optional[QueryLimits] = None,
+        **kwargs,
+    ):
+        """
+        Run fn(*args, **kwargs) on a worker of `lane` and await its result.
+
+        Args:
+            timeout: Time limit in seconds for this call; defaults to the executor's timeout.
+            limits: SQLite cost limits for this call; defaults to limits_for_tool(fn.__name__).
+
+        Raises:
+            QueryTimeoutError: If the call exceeds its time limit.
+            QueryTooExpensiveError: If the call exceeds its QueryLimits.
+        """
+        limits = limits_for_tool(fn.__name__) if limits is None else limits
+        timeout = self.timeout if timeout is None else timeout
+        cancelled = threading.Event()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor(lane), functools.partial(self._call, cancelled, limits, fn, args, kwargs)
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            cancelled.set()
+            logger.warning(f"{fn.__name__} exceeded {timeout:g} s and was cancelled")
+            raise QueryTimeoutError(
+                f"{fn.__name__} exceeded the {timeout:g} s time limit and was cancelled. "
+                "Narrow the filters or lower the limit."
+            ) from None
+        except asyncio.CancelledError:
+            # The client cancelled the request: stop the statement on the worker too
+            cancelled.set()
+            raise
+
+    def configure(self, lanes: dict, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+        """Replace lane sizes and timeout. Running pools finish their work and are replaced on next use."""
+        self.shutdown(wait=False)
+        self.lanes = dict(lanes)
+        self.timeout = timeout
+
+    def shutdown(self, wait: bool = True):
+        """Shut down every lane's pool."""
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait)
+
+
+_executor = DatabaseExecutor()
+
+
+def run_in_executor(
+    fn, lane: str, timeout: Optional[float] = None, limits: Optional[QueryLimits] = None
+):
+    """
+    Wrap a synchronous tool function as an async function that runs on a `lane` worker.
+
+    functools.wraps keeps the name, docstring and signature, so FastMCP registers the
+    wrapper with the same tool schema as the original function.
+
+    A QueryTooExpensiveError is raised as a ToolError whose message is its JSON form
+    (QueryTooExpensiveError.to_dict()), so the client gets the limit, the work done and the hint.
+
+    Args:
+        timeout: Time limit in seconds for this tool; defaults to the executor's timeout.
+        limits: SQLite cost limits for this tool; defaults to guard.TOOL_QUERY_LIMITS.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await _executor.run(lane, fn, *args, timeout=timeout, limits=limits, **kwargs)
+        except QueryTooExpensiveError as e:
+            raise ToolError(json.dumps(e.to_dict())) from e
+
+    return wrapper
+
+
+def configure_executor(workers: int, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS):
+    """
+    Set the number of worker threads per lane and the default per-call time limit.
+    Call once at server startup.
+
+    Args:
+        workers: Worker threads per lane.
+        timeout: Default time limit in seconds per tool call, None or 0 for no limit.
+
+    Raises:
+        ValueError: If workers is less than 1 or timeout is negative.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if timeout is not None and timeout < 0:
+        raise ValueError(f"timeout must not be negative, got {timeout}")
+    _executor.configure({lane: workers for lane in WORKER_LANES}, timeout or None)
+    logger.info(
+        f"Database executor uses {workers} worker(s) per lane ({', '.join(WORKER_LANES)}), "
+        f"timeout {f'{timeout:g} s' if timeout else 'none'}"
+    )
+
+
+def shutdown_executor():
+    """Shut down the worker pools (e.g. on server shutdown, before closing connections)."""
+    _executor.shutdown()
@@ -0,0 +1,290 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+from src.mcp_openfoodtox.database.connection import get_connection, get_db_path
+from src.mcp_openfoodtox.utils.formatting import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Filter argument -> STUDY column indexed as a facet (all low-cardinality columns)
+FACET_COLUMNS = {
+    "sub_class": "SUB_OP_CLASS_NORM",
+    "is_mutagenic": "IS_MUTAGENIC",
+    "is_genotoxic": "IS_GENOTOXIC",
+    "is_carcinogenic": "IS_CARCINOGENIC",
+}
+
+
+# Facet-count argument -> column of the study x chem_assess fact rows (and of facet_cube).
+# The order defines the bits of facet_cube.DIMS.
+CUBE_DIMENSIONS = {
+    "sub_class": "SUB_OP_CLASS",
+    "is_mutagenic": "IS_MUTAGENIC",
+    "is_genotoxic": "IS_GENOTOXIC",
+    "is_carcinogenic": "IS_CARCINOGENIC",
+    "assessment_type": "ASSESSMENTTYPE",
+    "population": "POPULATIONTEXT",
+}
+
+# One row per study (and per risk assessment of the study) of a known substance
+CUBE_FACTS_QUERY = """
+    SELECT
+        s.SUB_COM_ID,
+        s.SUB_OP_CLASS,
+        s.IS_MUTAGENIC,
+        s.IS_GENOTOXIC,
+        s.IS_CARCINOGENIC,
+        a.ASSESSMENTTYPE,
+        a.POPULATIONTEXT
+    FROM study s
+    LEFT JOIN chem_assess a ON a.HAZARD_ID = s.HAZARD_ID
+    WHERE s.SUB_COM_ID IN (SELECT SUB_COM_ID FROM component)
+"""
+
+
+def cuboid_mask(dimensions) -> int:
+    """facet_cube.DIMS value of the cuboid grouped by `dimensions` (CUBE_DIMENSIONS keys)."""
+    return sum(1 << bit for bit, dimension in enumerate(CUBE_DIMENSIONS) if dimension in dimensions)
+
+
+def cuboid_query(dimensions, filters: Optional[dict] = None) -> tuple[str, list]:
+    """
+    Build the query computing one facet_cube cuboid from the fact rows.
+
+    Groups CUBE_FACTS_QUERY by `dimensions` plus the filtered dimensions and counts distinct
+    SUB_COM_IDs per group. Columns of other dimensions are NULL. Returns (query, params)
+    selecting the facet_cube columns: DIMS, one column per CUBE_DIMENSIONS entry, SUBSTANCE_COUNT.
+    """
+    filters = filters or {}
+    grouped = [dimension for dimension in CUBE_DIMENSIONS if dimension in dimensions or dimension in filters]
+    columns = [
+        CUBE_DIMENSIONS[dimension] if dimension in grouped else f"NULL AS {CUBE_DIMENSIONS[dimension]}"
+        for dimension in CUBE_DIMENSIONS
+    ]
+    where = " AND ".join(f"{CUBE_DIMENSIONS[dimension]} = ? COLLATE NOCASE" for dimension in filters) or "1=1"
+    group_by = f"GROUP BY {', '.join(CUBE_DIMENSIONS[dimension] for dimension in grouped)}" if grouped else ""
+    query = f"""
+        SELECT {cuboid_mask(grouped)} AS DIMS, {", ".join(columns)}, COUNT(DISTINCT SUB_COM_ID) AS SUBSTANCE_COUNT
+        FROM ({CUBE_FACTS_QUERY})
+        WHERE {where}
+        {group_by}
+    """
+    return query, list(filters.values())
+
+
+class FacetIndex:
+    """
+    In-memory inverted index from STUDY facet values to bitmaps of study rows.
+
+    Every study row that belongs to a substance in COMPONENT gets a bit position; rows are
+    ordered by SUB_COM_ID. Each distinct value of a FACET_COLUMNS column maps to a packed
+    bitmap (numpy.packbits, one bit per row) of the rows holding that value. A combined
+    filter is the bitwise AND of one bitmap per filter, so it needs no table scan; the
+    matching SUB_COM_IDs are then read off the set bits.
+
+    Bitmaps are over study rows, not substances, so filters keep the SQL semantics of
+    query_substances_by_class_and_safety(): all conditions must hold on the same study.
+    """
+
+    def __init__(self, sub_com_ids: np.ndarray, facets: dict[str, dict[str, np.ndarray]]):
+        self.sub_com_ids = sub_com_ids  # SUB_COM_ID of each bit position
+        self.facets = facets  # column -> value -> packed bitmap
+        self._all_rows = np.packbits(np.ones(len(sub_com_ids), dtype=bool))
+
+    @classmethod
+    def build(cls, db_connection) -> "FacetIndex":
+        """Build the index with a single scan of the study table."""
+        columns = list(FACET_COLUMNS.values())
+        rows = db_connection.execute(
+            f"""
+            SELECT s.SUB_COM_ID, {", ".join(f"s.{column}" for column in columns)}
+            FROM study s
+            WHERE s.SUB_COM_ID IN (SELECT SUB_COM_ID FROM component)
+            ORDER BY s.SUB_COM_ID, s.rowid
+            """
+        ).fetchall()
+        sub_com_ids = np.array([row[0] for row in rows], dtype=np.int64)
+
+        facets = {}
+        for position, column in enumerate(columns, start=1):
+            values = np.array([row[position] for row in rows], dtype=object)
+            facets[column] = {
+                value: np.packbits(values == value)
+                for value in set(values.tolist())
+                if value is not None
+            }
+        logger.info(
+            f"Facet index built: {len(rows)} study rows, "
+            + ", ".join(f"{column} {len(bitmaps)} values" for column, bitmaps in facets.items())
+        )
+        return cls(sub_com_ids, facets)
+
+    def bitmap(self, column: str, value: Optional[str]) -> np.ndarray:
+        """Packed bitmap of the rows whose `column` equals `value` (all rows if value is None)."""
+        if value is None:
+            return self._all_rows
+        empty = np.zeros_like(self._all_rows)
+        return self.facets[column].get(value, empty)
+
+    def class_bitmap(self, sub_class: Optional[str]) -> np.ndarray:
+        """
+        Packed bitmap of the rows whose SUB_OP_CLASS contains `sub_class` (case-insensitive).
+
+        Same matching as `SUB_OP_CLASS_NORM LIKE '%<normalized sub_class>%'`: the bitmaps of
+        every class value containing the term are OR-ed together.
+        """
+        if sub_class is None:
+            return self._all_rows
+        term = normalize_text(sub_class)
+        bitmap = np.zeros_like(self._all_rows)
+        for value, value_bitmap in self.facets[FACET_COLUMNS["sub_class"]].items():
+            if term in value:
+                bitmap = bitmap | value_bitmap
+        return bitmap
+
+    def match(
+        self,
+        sub_class: Optional[str] = None,
+        is_mutagenic: Optional[str] = None,
+        is_genotoxic: Optional[str] = None,
+        is_carcinogenic: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Return the sorted, distinct SUB_COM_IDs of substances with a study matching every filter.
+        """
+        bitmap = self.class_bitmap(sub_class)
+        for column, value in [
+            (FACET_COLUMNS["is_mutagenic"], is_mutagenic),
+            (FACET_COLUMNS["is_genotoxic"], is_genotoxic),
+            (FACET_COLUMNS["is_carcinogenic"], is_carcinogenic),
+        ]:
+            if value is not None:
+                bitmap = bitmap & self.bitmap(column, value)
+        rows = np.unpackbits(bitmap, count=len(self.sub_com_ids)).view(bool)
+        # Rows are ordered by SUB_COM_ID, so np.unique only has to drop repeats
+        return np.unique(self.sub_com_ids[rows])
+
+
+def supports_class_filter(sub_class: Optional[str]) -> bool:
+    """Whether the facet index can answer a sub_class filter (LIKE wildcards need SQL)."""
+    return sub_class is None or not any(wildcard in sub_class for wildcard in "%_")
+
+
+_index: Optional[FacetIndex] = None
+_index_signature = None
+_index_lock = threading.Lock()
+
+
+def get_facet_index() -> FacetIndex:
+    """
+    Return the process-wide FacetIndex, building it on first use.
+
+    The index is rebuilt when the database file changes (size, mtime or inode), e.g. after
+    `make db` while the server is running.
+    """
+    global _index, _index_signature
+    try:
+        stat = os.stat(get_db_path())
+        signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    except FileNotFoundError:
+        signature = None
+    with _index_lock:
+        if _index is None or signature != _index_signature:
+            with get_connection() as db_connection:
+                _index = FacetIndex.build(db_connection)
+            _index_signature = signature
+        return _index
+
+
+def has_facet_cube(db_connection) -> bool:
+    """Check whether the database has the precomputed facet_cube table (built by setup_db.py)."""
+    return (
+        db_connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'facet_cube'"
+        ).fetchone()
+        is not None
+    )
+
+
+def query_facet_counts(
+    group_by: Optional[list[str]] = None, filters: Optional[dict] = None, limit: Optional[int] = 50
+) -> dict:
+    """
+    Count distinct substances per combination of facet values.
+
+    Answered from the facet_cube table: every group-by/filter combination is one cuboid
+    (identified by DIMS), so a call reads a few cube rows and never scans study rows.
+    Databases built before facet_cube existed compute the cuboid from the base tables.
+
+    Args:
+        group_by: CUBE_DIMENSIONS keys to break the counts down by (none for a single total)
+        filters: {CUBE_DIMENSIONS key: value} exact (case-insensitive) value filters;
+                 None values are ignored
+        limit: Maximum number of groups to return, largest counts first (None for all)
+
+    Returns:
+        Dictionary with:
+        - 'results': list of {<dimension column>: value, ..., 'SUBSTANCE_COUNT': n} dicts,
+          ordered by SUBSTANCE_COUNT descending
+        - 'total_count': number of distinct substances matching the filters
+
+    Raises:
+        ValueError: If a dimension name is unknown, a dimension is both grouped and filtered,
+            or limit is less than 1.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    group_by = list(dict.fromkeys(group_by or []))
+    filters = {dimension: value for dimension, value in (filters or {}).items() if value is not None}
+    unknown = [dimension for dimension in [*group_by, *filters] if dimension not in CUBE_DIMENSIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown facet(s): {', '.join(unknown)}. Valid facets: {', '.join(CUBE_DIMENSIONS)}"
+        )
+    both = [dimension for dimension in group_by if dimension in filters]
+    if both:
+        raise ValueError(f"Facet(s) both grouped and filtered: {', '.join(both)}")
+
+    group_columns = [CUBE_DIMENSIONS[dimension] for dimension in group_by]
+    filter_sql = "".join(f" AND {CUBE_DIMENSIONS[dimension]} = ? COLLATE NOCASE" for dimension in filters)
+    filter_params = list(filters.values())
+    order_by = ", ".join(["SUBSTANCE_COUNT DESC", *group_columns])
+
+    with get_connection() as db_connection:
+        if has_facet_cube(db_connection):
+            source = "facet_cube"
+            groups_source, groups_params = source, []
+            total_source, total_params = source, []
+        else:
+            logger.warning("facet_cube table not found, counting from the base tables (run 'make db')")
+            groups_source, groups_params = cuboid_query(group_by, filters)
+            total_source, total_params = cuboid_query([], filters)
+            groups_source, total_source = f"({groups_source})", f"({total_source})"
+
+        cursor = db_connection.execute(
+            f"""
+            SELECT {", ".join([*group_columns, "SUBSTANCE_COUNT"])}
+            FROM {groups_source}
+            WHERE DIMS = ?{filter_sql}
+            ORDER BY {order_by}
+            LIMIT ?
+            """,
+            # LIMIT -1 means no limit in SQLite
+            groups_params
+            + [cuboid_mask([*group_by, *filters])]
+            + filter_params
+            + [-1 if limit is None else limit],
+        )
+        columns = [column[0] for column in cursor.description]
+        results = [dict(zip(columns, row)) for row in cursor]
+
+        total = db_connection.execute(
+            f"SELECT SUBSTANCE_COUNT FROM {total_source} WHERE DIMS = ?{filter_sql}",
+            total_params + [cuboid_mask(filters)] + filter_params,
+        ).fetchone()
+
+    return {"results": results, "total_count": total[0] if total is not None else 0}
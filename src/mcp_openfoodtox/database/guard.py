@@ -0,0 +1,122 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class QueryLimits:
+    """
+    Cost limits for the SQLite work of one tool call.
+
+    max_instructions: SQLite VM instructions summed over every statement of the call
+    max_seconds: wall-clock deadline from the start of the call
+    """
+
+    max_instructions: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+
+# Limits for ID lookups; lookups are primary key / index probes, far below these
+DEFAULT_QUERY_LIMITS = QueryLimits(max_instructions=20_000_000, max_seconds=5.0)
+
+# Per-tool limits. Search and list queries scan study/synonym rows, so they get a larger
+# budget, but a filter that would scan and GROUP_CONCAT the whole study x synonym join
+# fails fast instead of tying up a worker.
+TOOL_QUERY_LIMITS = {
+    "search_substance": QueryLimits(max_instructions=200_000_000, max_seconds=10.0),
+    "list_substances_by_class_and_safety": QueryLimits(max_instructions=200_000_000, max_seconds=10.0),
+    "list_substances_by_assessment": QueryLimits(max_instructions=200_000_000, max_seconds=10.0),
+    "list_hazard_ids_by_assessment": QueryLimits(max_instructions=50_000_000, max_seconds=5.0),
+    # Batch tools do the work of up to MAX_BATCH_SIZE single calls in one call
+    "search_substance_batch": QueryLimits(max_instructions=2_000_000_000, max_seconds=25.0),
+    "get_substance_safety_assessment_batch": QueryLimits(max_instructions=200_000_000, max_seconds=10.0),
+}
+
+
+def limits_for_tool(tool_name: str) -> QueryLimits:
+    """Return the configured QueryLimits of a tool (DEFAULT_QUERY_LIMITS if none)."""
+    return TOOL_QUERY_LIMITS.get(tool_name, DEFAULT_QUERY_LIMITS)
+
+
+QUERY_TOO_EXPENSIVE_HINT = "Query too expensive, narrow your filters (or lower the limit) and try again."
+
+
+class QueryTooExpensiveError(Exception):
+    """
+    A tool call exceeded its QueryLimits; its SQLite statement was aborted.
+
+    to_dict() gives the structured form; the tool wrapper (executor.run_in_executor) sends
+    it to the client as the JSON message of a ToolError.
+    """
+
+    def __init__(
+        self,
+        tool_name: str,
+        limit: str,
+        limit_value,
+        instructions: Optional[int] = None,
+        elapsed_seconds: Optional[float] = None,
+    ):
+        self.tool_name = tool_name
+        self.limit = limit  # "max_instructions" or "max_seconds"
+        self.limit_value = limit_value
+        self.instructions = instructions
+        self.elapsed_seconds = elapsed_seconds
+        super().__init__(
+            f"query_too_expensive: {tool_name} exceeded its {limit} limit of {limit_value:,}. "
+            + QUERY_TOO_EXPENSIVE_HINT
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "error": "query_too_expensive",
+            "tool": self.tool_name,
+            "limit": self.limit,
+            "limit_value": self.limit_value,
+            "instructions": self.instructions,
+            "elapsed_seconds": self.elapsed_seconds,
+            "hint": QUERY_TOO_EXPENSIVE_HINT,
+        }
+
+
+class QueryGuard:
+    """
+    SQLite progress handler enforcing QueryLimits and cancellation for one tool call.
+
+    Install with connection.set_progress_handler(guard, interval). SQLite calls it every
+    `interval` VM instructions; a non-zero return aborts the running statement with
+    sqlite3.OperationalError("interrupted"). `exceeded` then names the limit that was hit
+    (None when the call was cancelled instead).
+    """
+
+    def __init__(self, limits: QueryLimits, interval: int, cancelled: Optional[threading.Event] = None):
+        self.limits = limits
+        self.interval = interval
+        self.cancelled = cancelled
+        self.instructions = 0
+        self.exceeded: Optional[str] = None
+        self._started = time.monotonic()
+        self._deadline = self._started + limits.max_seconds if limits.max_seconds is not None else None
+
+    def __call__(self) -> int:
+        if self.exceeded is not None or (self.cancelled is not None and self.cancelled.is_set()):
+            return 1
+        self.instructions += self.interval
+        if self.limits.max_instructions is not None and self.instructions > self.limits.max_instructions:
+            self.exceeded = "max_instructions"
+            return 1
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self.exceeded = "max_seconds"
+            return 1
+        return 0
+
+    def error(self, tool_name: str) -> QueryTooExpensiveError:
+        """Build the error for the limit that was exceeded, with the work done until then."""
+        return QueryTooExpensiveError(
+            tool_name,
+            self.exceeded,
+            getattr(self.limits, self.exceeded),
+            instructions=self.instructions,
+            elapsed_seconds=round(time.monotonic() - self._started, 3),
+        )
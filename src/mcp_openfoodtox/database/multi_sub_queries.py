@@ -1,12 +1,126 @@
 import logging
 from typing import Literal, Optional, Union
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from src.mcp_openfoodtox.database.binding import ID_LIST_SUBQUERY, bind_ids
 from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.facets import get_facet_index, supports_class_filter
+from src.mcp_openfoodtox.database.pagination import decode_cursor, next_page_cursor
+from src.mcp_openfoodtox.utils.formatting import normalize_text
 
 logger = logging.getLogger(__name__)
 
 
+def _check_limit(limit: Optional[int]):
+    """Reject limits below 1: an empty page would report a total_count of 0 for real matches."""
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+
+
+def _query_substance_page(
+    db_connection,
+    where_clause: str,
+    params: list,
+    limit: int,
+    after: Optional[int] = None,
+    total_count: Optional[int] = None,
+) -> tuple[DataFrame, int]:
+    """
+    Return one page of substances whose studies match `where_clause`, and the total count.
+
+    The matching SUB_COM_IDs are collected in a single scan of the study table (alias `s`);
+    COUNT(*) OVER () attaches the total to every row of the page, so no separate COUNT
+    query re-runs the same filter. Only the page is joined to COMPONENT and SYNONYM.
+    Substances are ordered by SUB_COM_ID so pages are stable.
+
+    Later pages pass `after` (the last SUB_COM_ID already returned) and the `total_count`
+    of the first page instead: the total is not recomputed, and study rows are read in
+    SUB_COM_ID index order from the keyset position (forced with INDEXED BY, whatever index
+    the filter could use), so no sort is needed and the scan stops once the page is full.
+
+    Returns:
+        Tuple of (DataFrame with columns SUB_COM_ID, COM_NAME, COM_TYPE, SUB_TYPE, DESCRIPTION,
+        total number of matching substances before the limit)
+    """
+    if total_count is None:
+        keyset = "AND s.SUB_COM_ID > ?" if after is not None else ""
+        page_cte = f"""
+            matches AS (
+                SELECT DISTINCT s.SUB_COM_ID
+                FROM study s
+                WHERE {where_clause}
+                  {keyset}
+                  AND s.SUB_COM_ID IN (SELECT SUB_COM_ID FROM component)
+            ),
+            page AS (
+                SELECT SUB_COM_ID, COUNT(*) OVER () AS TOTAL_COUNT
+                FROM matches
+                ORDER BY SUB_COM_ID
+                LIMIT ?
+            )
+        """
+    else:
+        # INDEXED BY walks the study rows in SUB_COM_ID order from the keyset position even when
+        # the filter has an index of its own (e.g. HAZARD_ID), so GROUP BY and ORDER BY need no
+        # temp B-tree and the walk stops once the page is full; EXISTS (not IN) keeps it that way
+        page_cte = f"""
+            page AS (
+                SELECT s.SUB_COM_ID, NULL AS TOTAL_COUNT
+                FROM study s INDEXED BY idx_study_sub_com_id
+                WHERE {where_clause}
+                  AND s.SUB_COM_ID > ?
+                  AND EXISTS (SELECT 1 FROM component c WHERE c.SUB_COM_ID = s.SUB_COM_ID)
+                GROUP BY s.SUB_COM_ID
+                ORDER BY s.SUB_COM_ID
+                LIMIT ?
+            )
+        """
+        after = -1 if after is None else after
+    keyset_params = [after] if after is not None else []
+    # Note: GROUP_CONCAT(DISTINCT ...) doesn't support separator argument in SQLite
+    # So we use DISTINCT without separator (defaults to comma)
+    query = f"""
+        WITH {page_cte}
+        SELECT
+            p.SUB_COM_ID,
+            c.COM_NAME,
+            c.COM_TYPE,
+            c.SUB_TYPE,
+            GROUP_CONCAT(DISTINCT syn.DESCRIPTION) as DESCRIPTION,
+            p.TOTAL_COUNT
+        FROM page p
+        INNER JOIN component c ON p.SUB_COM_ID = c.SUB_COM_ID
+        LEFT JOIN synonym syn ON p.SUB_COM_ID = syn.SUB_COM_ID
+        GROUP BY p.SUB_COM_ID, c.COM_NAME, c.COM_TYPE, c.SUB_TYPE
+        ORDER BY p.SUB_COM_ID
+    """
+    result_df = pd.read_sql_query(query, db_connection, params=params + keyset_params + [limit])
+    if total_count is None:
+        total_count = int(result_df["TOTAL_COUNT"].iloc[0]) if not result_df.empty else 0
+    return result_df.drop(columns="TOTAL_COUNT"), total_count
+
+
+def _query_substance_details(db_connection, sub_com_ids: list[int]) -> DataFrame:
+    """
+    Return the page columns of _query_substance_page() for known SUB_COM_IDs, ordered by SUB_COM_ID.
+    """
+    query = f"""
+        SELECT
+            c.SUB_COM_ID,
+            c.COM_NAME,
+            c.COM_TYPE,
+            c.SUB_TYPE,
+            GROUP_CONCAT(DISTINCT syn.DESCRIPTION) as DESCRIPTION
+        FROM component c
+        LEFT JOIN synonym syn ON c.SUB_COM_ID = syn.SUB_COM_ID
+        WHERE c.SUB_COM_ID IN ({ID_LIST_SUBQUERY})
+        GROUP BY c.SUB_COM_ID, c.COM_NAME, c.COM_TYPE, c.SUB_TYPE
+        ORDER BY c.SUB_COM_ID
+    """
+    return pd.read_sql_query(query, db_connection, params=[bind_ids(sub_com_ids)])
+
+
 def query_substances_by_class_and_safety(
     sub_class: Optional[str] = None,
     is_mutagenic: Optional[
@@ -44,6 +158,7 @@ def query_substances_by_class_and_safety(
     ] = None,
     remarks_contains: Optional[str] = None,
     limit: int = 10,
+    cursor: Optional[str] = None,
 ) -> dict:
     """
     Filter substances by STUDY criteria and join to COMPONENT and SYNONYM tables.
@@ -85,15 +200,59 @@ def query_substances_by_class_and_safety(
         is_carcinogenic: Optional IS_CARCINOGENIC filter (exact match: "Positive", "Negative", "Ambiguous", etc.)
         remarks_contains: Optional text search in REMARKS_STUDY (case-insensitive LIKE, substring match)
         limit: Maximum number of results to return (default: 10)
+        cursor: Optional 'next_cursor' of the previous page, to fetch the next page.
+                Must be used with the same filters.
 
     Returns:
         Dictionary with:
         - 'results': DataFrame with columns: SUB_COM_ID, COM_NAME, COM_TYPE, SUB_TYPE, DESCRIPTION (synonym)
         - 'total_count': Total number of matching substances (before limit)
+        - 'next_cursor': Token for the next page, or None if this is the last page
+
+    Raises:
+        ValueError: If limit is less than 1, or the cursor is invalid, was issued for other
+            filters or the dataset changed.
 
     Joins: STUDY → COMPONENT (by SUB_COM_ID) → SYNONYM (by SUB_COM_ID)
-    Returns unique substances (DISTINCT by SUB_COM_ID).
+    Returns unique substances (DISTINCT by SUB_COM_ID), ordered by SUB_COM_ID.
+
+    Filters without remarks_contains are answered from the in-memory facet index
+    (see facets.FacetIndex) instead of scanning STUDY; only the page is read from SQL.
     """
+    _check_limit(limit)
+    filters = {
+        "sub_class": sub_class,
+        "is_mutagenic": is_mutagenic,
+        "is_genotoxic": is_genotoxic,
+        "is_carcinogenic": is_carcinogenic,
+        "remarks_contains": remarks_contains,
+    }
+    page = decode_cursor(cursor, "query_substances_by_class_and_safety", filters)
+
+    if remarks_contains is None and supports_class_filter(sub_class):
+        matching_ids = get_facet_index().match(
+            sub_class=sub_class,
+            is_mutagenic=is_mutagenic,
+            is_genotoxic=is_genotoxic,
+            is_carcinogenic=is_carcinogenic,
+        )
+        # matching_ids is sorted, so the keyset position is a binary search
+        start = 0 if page.after is None else int(np.searchsorted(matching_ids, page.after, side="right"))
+        page_ids = matching_ids[start : start + limit].tolist()
+        with get_connection() as db_connection:
+            result_df = _query_substance_details(db_connection, page_ids)
+        logger.debug(
+            f"list_substances_by_criteria returned {len(result_df)} rows "
+            f"(total matching: {len(matching_ids)}, facet index)"
+        )
+        return {
+            "results": result_df,
+            "total_count": len(matching_ids),
+            "next_cursor": next_page_cursor(
+                "query_substances_by_class_and_safety", filters, page, page_ids, len(matching_ids)
+            ),
+        }
+
     with get_connection() as db_connection:
         # Build WHERE clause dynamically based on provided filters
         where_conditions = []
@@ -102,8 +261,9 @@ def query_substances_by_class_and_safety(
         if sub_class is not None:
             # Use flexible LIKE matching (case-insensitive) for partial matches
             # Allows "additives" to match "Food additives", "Nutritional additives", etc.
-            where_conditions.append("LOWER(s.SUB_OP_CLASS) LIKE ?")
-            params.append(f"%{sub_class.lower()}%")
+            # SUB_OP_CLASS_NORM is the lowercased NOCASE shadow column built by setup_db.py
+            where_conditions.append("s.SUB_OP_CLASS_NORM LIKE ?")
+            params.append(f"%{normalize_text(sub_class)}%")
 
         if is_mutagenic is not None:
             where_conditions.append("s.IS_MUTAGENIC = ?")
@@ -118,10 +278,10 @@ def query_substances_by_class_and_safety(
             params.append(is_carcinogenic)
 
         if remarks_contains is not None:
-            # Handle NULL values and use case-insensitive search
-            # Lowercase both the column and the search term for reliable case-insensitive matching
-            where_conditions.append("s.REMARKS_STUDY IS NOT NULL AND LOWER(s.REMARKS_STUDY) LIKE ?")
-            params.append(f"%{remarks_contains.lower()}%")
+            # Case-insensitive substring search against the normalized shadow column
+            # (NULL remarks never match LIKE)
+            where_conditions.append("s.REMARKS_STUDY_NORM LIKE ?")
+            params.append(f"%{normalize_text(remarks_contains)}%")
 
         where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
 
@@ -129,44 +289,27 @@ def query_substances_by_class_and_safety(
         logger.debug(f"WHERE clause: {where_clause}")
         logger.debug(f"Query params: {params}")
 
-        # First, get total count (before limit)
-        count_query = f"""
-            SELECT COUNT(DISTINCT s.SUB_COM_ID) as total_count
-            FROM study s
-            WHERE {where_clause}
-        """
-        total_count_df = pd.read_sql_query(count_query, db_connection, params=params)
-        total_count = int(total_count_df.iloc[0]["total_count"])
-
-        # Then get the limited results with joins
-        # Use GROUP BY to handle multiple synonyms per substance
-        # We'll aggregate synonyms into a comma-separated list
-        # Note: GROUP_CONCAT(DISTINCT ...) doesn't support separator argument in SQLite
-        # So we use DISTINCT without separator (defaults to comma)
-        query = f"""
-            SELECT
-                s.SUB_COM_ID,
-                c.COM_NAME,
-                c.COM_TYPE,
-                c.SUB_TYPE,
-                GROUP_CONCAT(DISTINCT syn.DESCRIPTION) as DESCRIPTION
-            FROM study s
-            INNER JOIN component c ON s.SUB_COM_ID = c.SUB_COM_ID
-            LEFT JOIN synonym syn ON s.SUB_COM_ID = syn.SUB_COM_ID
-            WHERE {where_clause}
-            GROUP BY s.SUB_COM_ID, c.COM_NAME, c.COM_TYPE, c.SUB_TYPE
-            LIMIT ?
-        """
-        params_with_limit = params + [limit]
-
-        result_df = pd.read_sql_query(query, db_connection, params=params_with_limit)
+        # Total count and limited page come from a single scan of the study table
+        result_df, total_count = _query_substance_page(
+            db_connection, where_clause, params, limit, after=page.after, total_count=page.total_count
+        )
 
         logger.debug(
             f"list_substances_by_criteria returned {len(result_df)} rows "
             f"(total matching: {total_count})"
         )
 
-        return {"results": result_df, "total_count": total_count}
+        return {
+            "results": result_df,
+            "total_count": total_count,
+            "next_cursor": next_page_cursor(
+                "query_substances_by_class_and_safety",
+                filters,
+                page,
+                result_df["SUB_COM_ID"].tolist(),
+                total_count,
+            ),
+        }
 
 
 # Dictionary mapping study types to their ID column names in STUDY table
@@ -212,6 +355,7 @@ def query_substances_by_study(
         # Get substances from genotoxicity study IDs [1, 2, 3]
         result = list_substances_by_study(ids=[1, 2, 3], study_type="genotox")
     """
+    _check_limit(limit)
     if not ids:
         return {"results": pd.DataFrame(), "total_count": 0}
 
@@ -224,44 +368,17 @@ def query_substances_by_study(
         )
 
     with get_connection() as db_connection:
-        # Build WHERE clause: filter by the ID column with IN clause
+        # Build WHERE clause: filter by the ID column, IDs bound as one JSON array
         # Also need to check that the ID column is NOT NULL
-        placeholders = ",".join("?" * len(ids))
-        where_clause = f"s.{id_column} IS NOT NULL AND s.{id_column} IN ({placeholders})"
+        where_clause = f"s.{id_column} IS NOT NULL AND s.{id_column} IN ({ID_LIST_SUBQUERY})"
+        params = [bind_ids(ids)]
 
         # Log the query for debugging
         logger.debug(f"WHERE clause: {where_clause}")
-        logger.debug(f"Query params: {ids}")
-
-        # First, get total count (before limit)
-        count_query = f"""
-            SELECT COUNT(DISTINCT s.SUB_COM_ID) as total_count
-            FROM study s
-            WHERE {where_clause}
-        """
-        total_count_df = pd.read_sql_query(count_query, db_connection, params=ids)
-        total_count = int(total_count_df.iloc[0]["total_count"])
-
-        # Then get the limited results with joins
-        # Use GROUP BY to handle multiple synonyms per substance
-        # We'll aggregate synonyms into a comma-separated list
-        query = f"""
-            SELECT
-                s.SUB_COM_ID,
-                c.COM_NAME,
-                c.COM_TYPE,
-                c.SUB_TYPE,
-                GROUP_CONCAT(DISTINCT syn.DESCRIPTION) as DESCRIPTION
-            FROM study s
-            INNER JOIN component c ON s.SUB_COM_ID = c.SUB_COM_ID
-            LEFT JOIN synonym syn ON s.SUB_COM_ID = syn.SUB_COM_ID
-            WHERE {where_clause}
-            GROUP BY s.SUB_COM_ID, c.COM_NAME, c.COM_TYPE, c.SUB_TYPE
-            LIMIT ?
-        """
-        params_with_limit = ids + [limit]
+        logger.debug(f"Query params: {params}")
 
-        result_df = pd.read_sql_query(query, db_connection, params=params_with_limit)
+        # Total count and limited page come from a single scan of the study table
+        result_df, total_count = _query_substance_page(db_connection, where_clause, params, limit)
 
         logger.debug(
             f"list_substances_by_study returned {len(result_df)} rows "
@@ -271,6 +388,50 @@ def query_substances_by_study(
         return {"results": result_df, "total_count": total_count}
 
 
+def _assessment_where_clause(
+    population_text_contains: Optional[str],
+    assessment_type: Optional[str],
+    risk_value_milli_max: Optional[float],
+    risk_value_milli_min: Optional[float],
+    has_no_risk_value: Optional[bool],
+) -> tuple[str, list]:
+    """
+    Build the CHEM_ASSESS WHERE clause and parameters shared by the assessment queries.
+
+    See query_hazard_ids_by_assessment() for the meaning of each filter.
+    """
+    # Build WHERE clause dynamically based on provided filters
+    where_conditions = []
+    params = []
+
+    if population_text_contains is not None:
+        # Case-insensitive LIKE search in POPULATIONTEXT (normalized shadow column)
+        where_conditions.append("POPULATIONTEXT_NORM LIKE ?")
+        params.append(f"%{normalize_text(population_text_contains)}%")
+
+    if assessment_type is not None:
+        # Case-insensitive LIKE search in ASSESSMENTTYPE (allows partial matches)
+        where_conditions.append("ASSESSMENTTYPE_NORM LIKE ?")
+        params.append(f"%{normalize_text(assessment_type)}%")
+
+    if risk_value_milli_max is not None:
+        # Maximum RISKVALUE_MILLI (inclusive)
+        where_conditions.append("RISKVALUE_MILLI IS NOT NULL AND RISKVALUE_MILLI <= ?")
+        params.append(risk_value_milli_max)
+
+    if risk_value_milli_min is not None:
+        # Minimum RISKVALUE_MILLI (inclusive)
+        where_conditions.append("RISKVALUE_MILLI IS NOT NULL AND RISKVALUE_MILLI >= ?")
+        params.append(risk_value_milli_min)
+
+    if has_no_risk_value is True:
+        # Only assessments with no quantitative risk value
+        where_conditions.append("RISKVALUE IS NULL")
+
+    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    return where_clause, params
+
+
 def query_hazard_ids_by_assessment(
     population_text_contains: Optional[str] = None,
     assessment_type: Optional[str] = None,
@@ -315,57 +476,170 @@ def query_hazard_ids_by_assessment(
         # Then get substances:
         substances = query_substances_by_study(hazard_ids, study_type="hazard")
     """
-    with get_connection() as db_connection:
-        # Build WHERE clause dynamically based on provided filters
-        where_conditions = []
-        params = []
-
-        if population_text_contains is not None:
-            # Case-insensitive LIKE search in POPULATIONTEXT
-            where_conditions.append("POPULATIONTEXT IS NOT NULL AND LOWER(POPULATIONTEXT) LIKE ?")
-            params.append(f"%{population_text_contains.lower()}%")
-
-        if assessment_type is not None:
-            # Case-insensitive LIKE search in ASSESSMENTTYPE (allows partial matches)
-            where_conditions.append("LOWER(ASSESSMENTTYPE) LIKE ?")
-            params.append(f"%{assessment_type.lower()}%")
+    # First page of the paginated query: HAZARD_IDs ascending, so a limit always returns the same IDs
+    return query_hazard_id_page(
+        population_text_contains=population_text_contains,
+        assessment_type=assessment_type,
+        risk_value_milli_max=risk_value_milli_max,
+        risk_value_milli_min=risk_value_milli_min,
+        has_no_risk_value=has_no_risk_value,
+        limit=limit,
+    )["results"]
+
+
+def query_hazard_id_page(
+    population_text_contains: Optional[str] = None,
+    assessment_type: Optional[str] = None,
+    risk_value_milli_max: Optional[float] = None,
+    risk_value_milli_min: Optional[float] = None,
+    has_no_risk_value: Optional[bool] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Paginated query_hazard_ids_by_assessment().
 
-        if risk_value_milli_max is not None:
-            # Maximum RISKVALUE_MILLI (inclusive)
-            where_conditions.append("RISKVALUE_MILLI IS NOT NULL AND RISKVALUE_MILLI <= ?")
-            params.append(risk_value_milli_max)
+    The first page counts the matching HAZARD_IDs; later pages continue after the last
+    HAZARD_ID of the previous page (an INTEGER primary key range), so they read only
+    their own rows.
 
-        if risk_value_milli_min is not None:
-            # Minimum RISKVALUE_MILLI (inclusive)
-            where_conditions.append("RISKVALUE_MILLI IS NOT NULL AND RISKVALUE_MILLI >= ?")
-            params.append(risk_value_milli_min)
+    Args:
+        Filters: see query_hazard_ids_by_assessment()
+        limit: Optional maximum number of HAZARD_IDs per page (all remaining if None)
+        cursor: Optional 'next_cursor' of the previous page, used with the same filters
 
-        if has_no_risk_value is True:
-            # Only assessments with no quantitative risk value
-            where_conditions.append("RISKVALUE IS NULL")
+    Returns:
+        Dictionary with:
+        - 'results': list of HAZARD_IDs (integers), ascending
+        - 'total_count': Total number of matching HAZARD_IDs (before limit)
+        - 'next_cursor': Token for the next page, or None if this is the last page
 
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    Raises:
+        ValueError: If limit is less than 1, or the cursor is invalid, was issued for other
+            filters or the dataset changed.
+    """
+    _check_limit(limit)
+    filters = {
+        "population_text_contains": population_text_contains,
+        "assessment_type": assessment_type,
+        "risk_value_milli_max": risk_value_milli_max,
+        "risk_value_milli_min": risk_value_milli_min,
+        "has_no_risk_value": has_no_risk_value,
+    }
+    page = decode_cursor(cursor, "query_hazard_id_page", filters)
+    where_clause, params = _assessment_where_clause(
+        population_text_contains,
+        assessment_type,
+        risk_value_milli_max,
+        risk_value_milli_min,
+        has_no_risk_value,
+    )
+    if page.after is not None:
+        where_clause += " AND HAZARD_ID > ?"
+        params.append(page.after)
+    total_column = "COUNT(*) OVER ()" if page.total_count is None else "NULL"
 
-        # Log the query for debugging
+    with get_connection() as db_connection:
         logger.debug(f"WHERE clause: {where_clause}")
         logger.debug(f"Query params: {params}")
-
-        # Build query to get distinct HAZARD_IDs
-        query = f"""
-            SELECT DISTINCT HAZARD_ID
+        # HAZARD_ID is an INTEGER primary key, so rows come back as Python ints
+        rows = db_connection.execute(
+            f"""
+            SELECT HAZARD_ID, {total_column}
             FROM chem_assess
             WHERE {where_clause}
-        """
+            ORDER BY HAZARD_ID
+            LIMIT ?
+            """,
+            params + [-1 if limit is None else limit],
+        ).fetchall()
 
-        if limit is not None:
-            query += f" LIMIT ?"
-            params.append(limit)
+    hazard_ids = [row[0] for row in rows]
+    total_count = page.total_count
+    if total_count is None:
+        total_count = rows[0][1] if rows else 0
+    logger.debug(f"query_hazard_id_page returned {len(hazard_ids)} HAZARD_IDs (total matching: {total_count})")
 
-        result_df = pd.read_sql_query(query, db_connection, params=params)
+    return {
+        "results": hazard_ids,
+        "total_count": total_count,
+        "next_cursor": next_page_cursor("query_hazard_id_page", filters, page, hazard_ids, total_count),
+    }
 
-        # Extract HAZARD_IDs as list of integers
-        hazard_ids = result_df["HAZARD_ID"].astype(int).tolist()
 
-        logger.debug(f"query_hazard_ids_by_assessment returned {len(hazard_ids)} HAZARD_IDs")
+def query_substances_by_assessment(
+    population_text_contains: Optional[str] = None,
+    assessment_type: Optional[str] = None,
+    risk_value_milli_max: Optional[float] = None,
+    risk_value_milli_min: Optional[float] = None,
+    has_no_risk_value: Optional[bool] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Filter substances by CHEM_ASSESS criteria and join to COMPONENT and SYNONYM tables.
+
+    Equivalent to query_hazard_ids_by_assessment() followed by query_substances_by_study(..., "hazard"),
+    but the HAZARD_ID filter runs inside SQLite as a subquery, so matching IDs never round-trip
+    through Python as thousands of bound parameters and the limit is applied in the same statement.
+
+    Args:
+        population_text_contains: Optional text search in POPULATIONTEXT (case-insensitive LIKE)
+        assessment_type: Optional ASSESSMENTTYPE filter (case-insensitive LIKE, partial match)
+        risk_value_milli_max: Optional maximum RISKVALUE_MILLI (inclusive, <=)
+        risk_value_milli_min: Optional minimum RISKVALUE_MILLI (inclusive, >=)
+        has_no_risk_value: If True, only assessments where RISKVALUE IS NULL
+        limit: Maximum number of results to return (default: 10)
+        cursor: Optional 'next_cursor' of the previous page, used with the same filters
+
+    Returns:
+        Dictionary with:
+        - 'results': DataFrame with columns: SUB_COM_ID, COM_NAME, COM_TYPE, SUB_TYPE, DESCRIPTION (synonym)
+        - 'total_count': Total number of matching substances (before limit)
+        - 'next_cursor': Token for the next page, or None if this is the last page
+
+    Raises:
+        ValueError: If limit is less than 1, or the cursor is invalid, was issued for other
+            filters or the dataset changed.
+
+    Joins: CHEM_ASSESS → STUDY (by HAZARD_ID) → COMPONENT (by SUB_COM_ID) → SYNONYM (by SUB_COM_ID)
+    """
+    assessment_where, params = _assessment_where_clause(
+        population_text_contains,
+        assessment_type,
+        risk_value_milli_max,
+        risk_value_milli_min,
+        has_no_risk_value,
+    )
+    _check_limit(limit)
+    where_clause = f"s.HAZARD_ID IN (SELECT HAZARD_ID FROM chem_assess WHERE {assessment_where})"
+    filters = {
+        "population_text_contains": population_text_contains,
+        "assessment_type": assessment_type,
+        "risk_value_milli_max": risk_value_milli_max,
+        "risk_value_milli_min": risk_value_milli_min,
+        "has_no_risk_value": has_no_risk_value,
+    }
+    page = decode_cursor(cursor, "query_substances_by_assessment", filters)
+
+    with get_connection() as db_connection:
+        # Log the query for debugging
+        logger.debug(f"WHERE clause: {where_clause}")
+        logger.debug(f"Query params: {params}")
+
+        result_df, total_count = _query_substance_page(
+            db_connection, where_clause, params, limit, after=page.after, total_count=page.total_count
+        )
+
+        logger.debug(
+            f"query_substances_by_assessment returned {len(result_df)} rows "
+            f"(total matching: {total_count})"
+        )
 
-        return hazard_ids
+        return {
+            "results": result_df,
+            "total_count": total_count,
+            "next_cursor": next_page_cursor(
+                "query_substances_by_assessment", filters, page, result_df["SUB_COM_ID"].tolist(), total_count
+            ),
+        }
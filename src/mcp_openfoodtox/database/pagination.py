@@ -0,0 +1,85 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import NamedTuple, Optional
+
+from src.mcp_openfoodtox.database.version import current_dataset_version
+
+
+class PageCursor(NamedTuple):
+    """
+    Position of the next page of a keyset-paginated query.
+
+    after: last key (SUB_COM_ID / HAZARD_ID) already returned; the next page starts after it
+    total_count: total matches computed on the first page, so later pages skip the count
+    seen: number of results returned so far
+    """
+
+    after: Optional[int] = None
+    total_count: Optional[int] = None
+    seen: int = 0
+
+
+FIRST_PAGE = PageCursor()
+
+
+def _filters_digest(filters: dict) -> str:
+    encoded = json.dumps(filters, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def encode_cursor(scope: str, filters: dict, cursor: PageCursor) -> str:
+    """
+    Encode a PageCursor as an opaque continuation token.
+
+    The token is tied to the query (`scope`), its filters and the dataset version, so it
+    cannot be replayed against different filters or a rebuilt database.
+    """
+    payload = {
+        "s": scope,
+        "f": _filters_digest(filters),
+        "v": current_dataset_version()[:16],
+        "k": cursor.after,
+        "n": cursor.total_count,
+        "c": cursor.seen,
+    }
+    token = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return token.decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str], scope: str, filters: dict) -> PageCursor:
+    """
+    Decode a continuation token from encode_cursor() (FIRST_PAGE if token is None or empty).
+
+    Raises:
+        ValueError: If the token is malformed, belongs to another query or other filters,
+            or was issued for a different version of the dataset.
+    """
+    if not token:
+        return FIRST_PAGE
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        # Keys are compared with INTEGER columns: a non-integer would silently match nothing
+        total_count = None if payload["n"] is None else int(payload["n"])
+        cursor = PageCursor(int(payload["k"]), total_count, int(payload["c"]))
+        token_scope, token_filters, token_version = payload["s"], payload["f"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor. Use the next_cursor value of a previous page.") from None
+    if token_scope != scope or token_filters != _filters_digest(filters):
+        raise ValueError("This cursor belongs to a query with different filters. Start again without a cursor.")
+    if token_version != current_dataset_version()[:16]:
+        raise ValueError("This cursor has expired because the dataset changed. Start again without a cursor.")
+    return cursor
+
+
+def next_page_cursor(
+    scope: str, filters: dict, page: PageCursor, page_keys: list[int], total_count: int
+) -> Optional[str]:
+    """
+    Token for the page after `page_keys` (the ascending keys just returned), or None on the last page.
+    """
+    seen = page.seen + len(page_keys)
+    if not page_keys or seen >= total_count:
+        return None
+    return encode_cursor(scope, filters, PageCursor(int(page_keys[-1]), total_count, seen))
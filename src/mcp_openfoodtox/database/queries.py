@@ -1,13 +1,69 @@
+import json
 import logging
 from typing import Literal, Optional, Union
 import pandas as pd
 from pandas import DataFrame
+from src.mcp_openfoodtox.database.binding import ID_LIST_SUBQUERY, bind_ids
 from src.mcp_openfoodtox.database.connection import get_connection
-from src.mcp_openfoodtox.utils.formatting import normalize_e_number
+from src.mcp_openfoodtox.utils.formatting import (
+    REGISTRY_KINDS,
+    classify_identifier,
+    normalize_e_number,
+    records_to_json,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def get_search_tables(db_connection) -> tuple[str, str]:
+    """
+    Return the (synonym, component) tables to run substring searches against.
+
+    Prefers the FTS5 trigram indexes built by scripts/setup_db.py (synonym_fts, component_fts),
+    which answer `LIKE '%term%'` from the index instead of scanning every row. They expose the
+    same column names as the base tables, so queries only swap the table name. Falls back to
+    the base tables for databases built before the indexes existed.
+    """
+    fts_tables = db_connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('synonym_fts', 'component_fts')"
+    ).fetchall()
+    if len(fts_tables) == 2:
+        return "synonym_fts", "component_fts"
+    logger.warning("FTS search indexes not found, falling back to table scans (re-run scripts/setup_db.py)")
+    return "synonym", "component"
+
+
+def has_identifier_table(db_connection) -> bool:
+    """Whether the database has the identifier lookup table built by scripts/setup_db.py."""
+    return (
+        db_connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'identifier'"
+        ).fetchone()
+        is not None
+    )
+
+
+# Identifier table hits for one query: VALUE under any of the kinds in a JSON array, kept only
+# when they all share one kind (a bare number found in several registries is ambiguous)
+IDENTIFIER_HITS_QUERY = """
+    SELECT SUB_COM_ID, ? AS MATCHED_TEXT FROM identifier
+    WHERE KIND IN (SELECT value FROM json_each(?)) AND VALUE = ?
+        AND (
+            SELECT COUNT(DISTINCT KIND) FROM identifier
+            WHERE KIND IN (SELECT value FROM json_each(?)) AND VALUE = ?
+        ) = 1
+"""
+
+
+def identifier_kinds(identifier: tuple[str, str]) -> list[str]:
+    """
+    Identifier table kinds to look a classified query up under: every registry for a bare
+    number, otherwise only its own kind.
+    """
+    kind = identifier[0]
+    return list(REGISTRY_KINDS) if kind == "number" else [kind]
+
+
 def query_by_compound(description_search):
     """
     Convenience Tools (pre-composed for common patterns)
@@ -29,11 +85,14 @@ def query_by_compound(description_search):
         logger.info(f"Normalized search query: '{description_search}' -> '{normalized_search}'")
 
     with get_connection() as db_connection:
-        # Start with SYNONYM search
+        synonym_table, component_table = get_search_tables(db_connection)
+
+        # Start with SYNONYM search (matched through the trigram index, full rows from synonym)
         synonyms = pd.read_sql_query(
-            """
+            f"""
             SELECT * FROM synonym 
-            WHERE DESCRIPTION LIKE ?
+            WHERE rowid IN (SELECT rowid FROM {synonym_table} WHERE DESCRIPTION LIKE ?)
+            ORDER BY rowid
             """,
             db_connection,
             params=[f"%{normalized_search}%"],
@@ -44,10 +103,10 @@ def query_by_compound(description_search):
         if synonyms.empty:
             # Search COMPONENT.SUB_NAME and COMPONENT.COM_NAME
             components_from_search = pd.read_sql_query(
-                """
-                SELECT DISTINCT SUB_COM_ID 
-                FROM component 
-                WHERE SUB_NAME LIKE ? OR COM_NAME LIKE ?
+                f"""
+                SELECT SUB_COM_ID FROM {component_table} WHERE SUB_NAME LIKE ?
+                UNION
+                SELECT SUB_COM_ID FROM {component_table} WHERE COM_NAME LIKE ?
                 """,
                 db_connection,
                 params=[f"%{normalized_search}%", f"%{normalized_search}%"],
@@ -61,22 +120,24 @@ def query_by_compound(description_search):
                 return None
 
             # Extract SUB_COM_IDs from COMPONENT search
-            sub_com_ids = [int(x) for x in components_from_search["SUB_COM_ID"].unique()]
+            sub_com_ids = components_from_search["SUB_COM_ID"].tolist()
 
             # Create empty synonyms DataFrame (since we found via COMPONENT, not SYNONYM)
             synonyms = pd.DataFrame()
         else:
             # Get unique SUB_COM_IDs from SYNONYM search
-            sub_com_ids = [int(x) for x in synonyms["SUB_COM_ID"].unique()]
+            sub_com_ids = synonyms["SUB_COM_ID"].unique().tolist()
+
+        id_params = [bind_ids(sub_com_ids)]
 
         # Join COMPONENT → get full component details
         components = pd.read_sql_query(
             f"""
             SELECT * FROM component 
-            WHERE SUB_COM_ID IN ({','.join('?' * len(sub_com_ids))})
+            WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
             """,
             db_connection,
-            params=sub_com_ids,
+            params=id_params,
         )
         logger.debug(f"COMPONENT query returned {len(components)} rows, shape: {components.shape}")
 
@@ -84,10 +145,10 @@ def query_by_compound(description_search):
         studies = pd.read_sql_query(
             f"""
             SELECT * FROM study 
-            WHERE SUB_COM_ID IN ({','.join('?' * len(sub_com_ids))})
+            WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
             """,
             db_connection,
-            params=sub_com_ids,
+            params=id_params,
         )
         logger.debug(f"STUDY query returned {len(studies)} rows, shape: {studies.shape}")
 
@@ -99,77 +160,49 @@ def query_by_compound(description_search):
         questions = pd.DataFrame()
 
         if not studies.empty:
-            # STUDY → GENOTOX
-            genotox_ids = [int(x) for x in studies["GENOTOX_ID"].dropna().unique()]
-            if len(genotox_ids) > 0:
-                genotox = pd.read_sql_query(
-                    f"""
-                    SELECT * FROM genotox 
-                    WHERE GENOTOX_ID IN ({','.join('?' * len(genotox_ids))})
-                    """,
-                    db_connection,
-                    params=genotox_ids,
-                )
-                logger.debug(f"GENOTOX query returned {len(genotox)} rows, shape: {genotox.shape}")
-
-            # STUDY → ENDPOINT_STUDY
-            tox_ids = [int(x) for x in studies["TOX_ID"].dropna().unique()]
-            if len(tox_ids) > 0:
-                endpoint_study = pd.read_sql_query(
+            # STUDY → GENOTOX / ENDPOINT_STUDY / CHEM_ASSESS / OPINION
+            # The study ID columns are INTEGER, so the joins run in SQL without pulling IDs into Python
+            linked_tables = [
+                ("genotox", "GENOTOX_ID"),
+                ("endpoint_study", "TOX_ID"),
+                ("chem_assess", "HAZARD_ID"),
+                ("opinion", "OP_ID"),
+            ]
+            linked = {}
+            for table_name, id_column in linked_tables:
+                linked[table_name] = pd.read_sql_query(
                     f"""
-                    SELECT * FROM endpoint_study 
-                    WHERE TOX_ID IN ({','.join('?' * len(tox_ids))})
+                    SELECT * FROM {table_name} 
+                    WHERE {id_column} IN (
+                        SELECT {id_column} FROM study WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
+                    )
                     """,
                     db_connection,
-                    params=tox_ids,
+                    params=id_params,
                 )
                 logger.debug(
-                    f"ENDPOINT_STUDY query returned {len(endpoint_study)} rows, shape: {endpoint_study.shape}"
-                )
-
-            # STUDY → CHEM_ASSESS
-            hazard_ids = [int(x) for x in studies["HAZARD_ID"].dropna().unique()]
-            if len(hazard_ids) > 0:
-                chem_assess = pd.read_sql_query(
-                    f"""
-                    SELECT * FROM chem_assess 
-                    WHERE HAZARD_ID IN ({','.join('?' * len(hazard_ids))})
-                    """,
-                    db_connection,
-                    params=hazard_ids,
+                    f"{table_name.upper()} query returned {len(linked[table_name])} rows, "
+                    f"shape: {linked[table_name].shape}"
                 )
-                logger.debug(
-                    f"CHEM_ASSESS query returned {len(chem_assess)} rows, shape: {chem_assess.shape}"
-                )
-
-            # STUDY → OPINION
-            op_ids = [int(x) for x in studies["OP_ID"].dropna().unique()]
-
-            if len(op_ids) > 0:
-                opinions = pd.read_sql_query(
-                    f"""
-                    SELECT * FROM opinion 
-                    WHERE OP_ID IN ({','.join('?' * len(op_ids))})
-                    """,
-                    db_connection,
-                    params=op_ids,
-                )
-                logger.debug(
-                    f"OPINION query returned {len(opinions)} rows, shape: {opinions.shape}"
-                )
-
-                # OPINION → QUESTION
-                questions = pd.read_sql_query(
-                    f"""
-                    SELECT * FROM question 
-                    WHERE OP_ID IN ({','.join('?' * len(op_ids))})
-                    """,
-                    db_connection,
-                    params=op_ids,
-                )
-                logger.debug(
-                    f"QUESTION query returned {len(questions)} rows, shape: {questions.shape}"
+            genotox = linked["genotox"]
+            endpoint_study = linked["endpoint_study"]
+            chem_assess = linked["chem_assess"]
+            opinions = linked["opinion"]
+
+            # OPINION → QUESTION
+            questions = pd.read_sql_query(
+                f"""
+                SELECT * FROM question 
+                WHERE OP_ID IN (
+                    SELECT OP_ID FROM study WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
                 )
+                """,
+                db_connection,
+                params=id_params,
+            )
+            logger.debug(
+                f"QUESTION query returned {len(questions)} rows, shape: {questions.shape}"
+            )
 
         result = {
             "synonyms": synonyms,
@@ -192,38 +225,144 @@ def query_by_compound(description_search):
         return result
 
 
-def query_search_substance(description_search) -> Optional[list[dict]]:
+# RELEVANCE_SCORE -> MATCH_TYPE for ranked search results
+MATCH_TYPES = {3: "exact", 2: "prefix", 1: "substring"}
+
+
+def _check_limit(limit: Optional[int]):
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be None or at least 1, got {limit}")
+
+
+def _rank_search_hits(db_connection, hits_query: str, hits_params: list, search_term: str, limit):
+    """
+    Rank the SUB_COM_IDs matched by a search and return the top `limit` of them.
+
+    `hits_query` must select (SUB_COM_ID, MATCHED_TEXT) rows. Each substance is scored by its
+    best matching text: exact match (case-insensitive) = 3, prefix match = 2, substring = 1.
+    Ties are broken by number of studies (descending), then SUB_COM_ID.
+
+    Returns:
+        DataFrame with columns SUB_COM_ID, RELEVANCE_SCORE, STUDY_COUNT, TOTAL_COUNT
+        (TOTAL_COUNT is the number of matching substances before the limit).
+    """
+    ranking_query = f"""
+        WITH hits AS ({hits_query}),
+        matches AS (
+            SELECT
+                SUB_COM_ID,
+                MAX(
+                    CASE
+                        WHEN MATCHED_TEXT = ? COLLATE NOCASE THEN 3
+                        WHEN MATCHED_TEXT LIKE ? THEN 2
+                        ELSE 1
+                    END
+                ) AS RELEVANCE_SCORE
+            FROM hits
+            GROUP BY SUB_COM_ID
+        ),
+        study_counts AS (
+            SELECT SUB_COM_ID, COUNT(*) AS STUDY_COUNT
+            FROM study
+            WHERE SUB_COM_ID IN (SELECT SUB_COM_ID FROM matches)
+            GROUP BY SUB_COM_ID
+        )
+        SELECT
+            m.SUB_COM_ID,
+            m.RELEVANCE_SCORE,
+            COALESCE(sc.STUDY_COUNT, 0) AS STUDY_COUNT,
+            COUNT(*) OVER () AS TOTAL_COUNT
+        FROM matches m
+        LEFT JOIN study_counts sc ON sc.SUB_COM_ID = m.SUB_COM_ID
+        ORDER BY m.RELEVANCE_SCORE DESC, STUDY_COUNT DESC, m.SUB_COM_ID
+        LIMIT ?
+    """
+    # LIMIT -1 means no limit in SQLite
+    params = hits_params + [search_term, f"{search_term}%", -1 if limit is None else limit]
+    return pd.read_sql_query(ranking_query, db_connection, params=params)
+
+
+def query_search_substance(description_search, limit: Optional[int] = 10) -> Optional[dict]:
     """
     Atomic query function.
     Database-agnostic search function.
 
     Returns unique substance/es (by SUB_COM_ID) with all study data aggregated into arrays.
+    Matches are ranked (exact > prefix > substring match, then by number of studies) and
+    only the top `limit` substances are hydrated with component and study data.
+
+    Identifier-shaped queries (E-number, CAS, EC, FEMA/JECFA/CoE number) are first resolved
+    through the identifier lookup table; they return exact matches only, so "E 460" does not
+    also return "E 4600". A prefixed number ("FEMA 2698") is looked up in its registry only,
+    a bare number in every registry. Text search is used when the lookup finds nothing, or
+    when a bare number is found in more than one registry.
+
+    Args:
+        description_search: Search term (name, E-number, CAS number, ...)
+        limit: Maximum number of substances to return (default: 10, None for all)
+
+    Returns:
+        Dictionary with:
+        - 'results': list of substance dicts in rank order, each with RELEVANCE_SCORE,
+          MATCH_TYPE and STUDY_COUNT
+        - 'total_count': Total number of matching substances (before limit)
+        or None if no matches are found.
+
+    Raises:
+        ValueError: If limit is less than 1.
     """
+    _check_limit(limit)
     normalized_search = normalize_e_number(description_search)
+    pattern = f"%{normalized_search}%"
+
+    identifier = classify_identifier(description_search)
 
     with get_connection() as db_connection:
-        # Step 1: Find SUB_COM_IDs (database-agnostic via pandas)
-        synonyms = pd.read_sql_query(
-            "SELECT DISTINCT SUB_COM_ID FROM synonym WHERE DESCRIPTION LIKE ?",
-            db_connection,
-            params=[f"%{normalized_search}%"],
-        )
+        synonym_table, component_table = get_search_tables(db_connection)
 
-        sub_com_ids = synonyms["SUB_COM_ID"].unique().tolist()
+        ranked = None
+        if identifier is not None and has_identifier_table(db_connection):
+            # Step 0: Exact identifier lookup (primary key B-tree), every hit is an exact match
+            kinds = json.dumps(identifier_kinds(identifier))
+            ranked = _rank_search_hits(
+                db_connection,
+                IDENTIFIER_HITS_QUERY,
+                [normalized_search, kinds, identifier[1], kinds, identifier[1]],
+                normalized_search,
+                limit,
+            )
 
-        if not sub_com_ids:
+        if ranked is None or ranked.empty:
+            # Step 1: Rank matching SUB_COM_IDs, SYNONYM first
+            ranked = _rank_search_hits(
+                db_connection,
+                f"SELECT SUB_COM_ID, DESCRIPTION AS MATCHED_TEXT FROM {synonym_table} WHERE DESCRIPTION LIKE ?",
+                [pattern],
+                normalized_search,
+                limit,
+            )
+
+        if ranked.empty:
             # Try component search...
-            components = pd.read_sql_query(
-                "SELECT DISTINCT SUB_COM_ID FROM component WHERE SUB_NAME LIKE ? OR COM_NAME LIKE ?",
+            ranked = _rank_search_hits(
                 db_connection,
-                params=[f"%{normalized_search}%", f"%{normalized_search}%"],
+                f"""
+                SELECT SUB_COM_ID, SUB_NAME AS MATCHED_TEXT FROM {component_table} WHERE SUB_NAME LIKE ?
+                UNION ALL
+                SELECT SUB_COM_ID, COM_NAME AS MATCHED_TEXT FROM {component_table} WHERE COM_NAME LIKE ?
+                """,
+                [pattern, pattern],
+                normalized_search,
+                limit,
             )
-            if components.empty:
+            if ranked.empty:
                 return None
-            sub_com_ids = components["SUB_COM_ID"].unique().tolist()
+
+        total_count = int(ranked["TOTAL_COUNT"].iloc[0])
+        sub_com_ids = ranked["SUB_COM_ID"].tolist()
 
         # Step 2: Get unique component info (one row per SUB_COM_ID)
-        placeholders = ",".join("?" * len(sub_com_ids))
+        id_params = [bind_ids(sub_com_ids)]
         component_query = f"""
             SELECT DISTINCT
                 SUB_COM_ID,
@@ -232,9 +371,9 @@ def query_search_substance(description_search) -> Optional[list[dict]]:
                 MOLECULARFORMULA,
                 SUB_DESCRIPTION
             FROM component
-            WHERE SUB_COM_ID IN ({placeholders})
+            WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
         """
-        components_df = pd.read_sql_query(component_query, db_connection, params=sub_com_ids)
+        components_df = pd.read_sql_query(component_query, db_connection, params=id_params)
 
         # Step 3: Get all studies for these SUB_COM_IDs
         study_query = f"""
@@ -247,81 +386,320 @@ def query_search_substance(description_search) -> Optional[list[dict]]:
                 HAZARD_ID,
                 OP_ID
             FROM study
-            WHERE SUB_COM_ID IN ({placeholders})
+            WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
         """
-        studies_df = pd.read_sql_query(study_query, db_connection, params=sub_com_ids)
+        # Nullable integer dtype keeps the INTEGER IDs as ints (not NaN-padded floats)
+        id_dtypes = {column: "Int64" for column in ["GENOTOX_ID", "TOX_ID", "HAZARD_ID", "OP_ID"]}
+        studies_df = pd.read_sql_query(
+            study_query, db_connection, params=id_params, dtype=id_dtypes
+        )
 
         # Step 4: Group studies by SUB_COM_ID and aggregate into arrays
-        result = []
-
-        for _, component_row in components_df.iterrows():
-            sub_com_id = component_row["SUB_COM_ID"]
-
-            # Get all studies for this component
-            component_studies = studies_df[studies_df["SUB_COM_ID"] == sub_com_id]
-
-            # Helper function to convert to array, filtering out None/NaN
-            def to_array_or_none(series):
-                """Convert pandas series to list of non-null values, or None if empty."""
-                values = series.dropna().unique().tolist()
-                # Convert numpy types to native Python types
-                cleaned = []
-                for val in values:
-                    if pd.notna(val):
-                        if hasattr(val, "item"):
-                            cleaned.append(val.item())
-                        else:
-                            cleaned.append(val)
-                return cleaned if cleaned else None
-
-            # Helper function for string arrays (like SUB_OP_CLASS, REMARKS)
-            def to_string_array_or_none(series):
-                """Convert pandas series to list of non-null strings, or None if empty."""
-                values = series.dropna().unique().tolist()
-                cleaned = [str(v) for v in values if pd.notna(v) and str(v).strip()]
-                return cleaned if cleaned else None
-
-            # Helper to safely get value or None
-            def safe_get(val):
-                """Get value if not null, else None."""
-                try:
-                    if pd.isna(val):
-                        return None
-                    if hasattr(val, "item"):
-                        return val.item()
-                    return val
-                except (TypeError, ValueError):
-                    return None
-
-            # Build result entry
-            entry = {
-                "SUB_COM_ID": int(sub_com_id),
-                "COM_NAME": safe_get(component_row["COM_NAME"]),
-                "COM_TYPE": safe_get(component_row["COM_TYPE"]),
-                "MOLECULARFORMULA": safe_get(component_row["MOLECULARFORMULA"]),
-                "SUB_DESCRIPTION": safe_get(component_row["SUB_DESCRIPTION"]),
+        results = _aggregate_studies(components_df, studies_df)
+
+        # Step 5: Attach relevance and return in rank order
+        ranking = {
+            row.SUB_COM_ID: (position, int(row.RELEVANCE_SCORE), int(row.STUDY_COUNT))
+            for position, row in enumerate(ranked.itertuples(index=False))
+        }
+        for entry in results:
+            _, relevance_score, study_count = ranking[entry["SUB_COM_ID"]]
+            entry["RELEVANCE_SCORE"] = relevance_score
+            entry["MATCH_TYPE"] = MATCH_TYPES[relevance_score]
+            entry["STUDY_COUNT"] = study_count
+        results.sort(key=lambda entry: ranking[entry["SUB_COM_ID"]][0])
+
+        logger.debug(f"query_search_substance returned {len(results)} of {total_count} matches")
+
+        return {"results": results, "total_count": total_count}
+
+
+# Maximum number of inputs accepted by the batch queries
+MAX_BATCH_SIZE = 500
+
+# Search terms bound as one JSON array of [TERM_INDEX, TERM, KINDS, VALUE] rows
+# (KINDS: identifier kinds to look VALUE up under, see identifier_kinds)
+BATCH_TERMS_CTE = """
+    terms AS (
+        SELECT
+            json_extract(value, '$[0]') AS TERM_INDEX,
+            json_extract(value, '$[1]') AS TERM,
+            json_extract(value, '$[2]') AS KINDS,
+            json_extract(value, '$[3]') AS VALUE
+        FROM json_each(?)
+    )
+"""
+
+
+def _check_batch_size(values: list, name: str):
+    if not isinstance(values, list):
+        raise TypeError(f"{name} must be a list, got {type(values)}")
+    if len(values) > MAX_BATCH_SIZE:
+        raise ValueError(f"{name} has {len(values)} entries, at most {MAX_BATCH_SIZE} are allowed per call")
+
+
+def _rank_batch_search_hits(db_connection, hits_query: str, terms: list, limit: Optional[int]) -> DataFrame:
+    """
+    Rank the SUB_COM_IDs matched by many search terms at once; the batch form of _rank_search_hits.
+
+    `terms` rows are [TERM_INDEX, normalized term, identifier kinds, identifier value] and are
+    bound as a single JSON parameter. `hits_query` reads them from the `terms` CTE and must
+    select (TERM_INDEX, SUB_COM_ID, MATCHED_TEXT, SEARCH_TERM) rows. Scoring and tie-breaking
+    are the same as _rank_search_hits, applied per term.
+
+    Returns:
+        DataFrame with columns TERM_INDEX, SUB_COM_ID, RELEVANCE_SCORE, STUDY_COUNT, TOTAL_COUNT
+        (top `limit` substances per term, in rank order)
+    """
+    ranking_query = f"""
+        WITH {BATCH_TERMS_CTE},
+        hits AS ({hits_query}),
+        matches AS (
+            SELECT
+                TERM_INDEX,
+                SUB_COM_ID,
+                MAX(
+                    CASE
+                        WHEN MATCHED_TEXT = SEARCH_TERM COLLATE NOCASE THEN 3
+                        WHEN MATCHED_TEXT LIKE SEARCH_TERM || '%' THEN 2
+                        ELSE 1
+                    END
+                ) AS RELEVANCE_SCORE
+            FROM hits
+            GROUP BY TERM_INDEX, SUB_COM_ID
+        ),
+        study_counts AS (
+            SELECT SUB_COM_ID, COUNT(*) AS STUDY_COUNT
+            FROM study
+            WHERE SUB_COM_ID IN (SELECT SUB_COM_ID FROM matches)
+            GROUP BY SUB_COM_ID
+        ),
+        ranked AS (
+            SELECT
+                m.TERM_INDEX,
+                m.SUB_COM_ID,
+                m.RELEVANCE_SCORE,
+                COALESCE(sc.STUDY_COUNT, 0) AS STUDY_COUNT,
+                ROW_NUMBER() OVER (
+                    PARTITION BY m.TERM_INDEX
+                    ORDER BY m.RELEVANCE_SCORE DESC, COALESCE(sc.STUDY_COUNT, 0) DESC, m.SUB_COM_ID
+                ) AS TERM_RANK,
+                COUNT(*) OVER (PARTITION BY m.TERM_INDEX) AS TOTAL_COUNT
+            FROM matches m
+            LEFT JOIN study_counts sc ON sc.SUB_COM_ID = m.SUB_COM_ID
+        )
+        SELECT TERM_INDEX, SUB_COM_ID, RELEVANCE_SCORE, STUDY_COUNT, TOTAL_COUNT
+        FROM ranked
+        WHERE ? IS NULL OR TERM_RANK <= ?
+        ORDER BY TERM_INDEX, TERM_RANK
+    """
+    params = [json.dumps(terms), limit, limit]
+    return pd.read_sql_query(ranking_query, db_connection, params=params)
+
+
+def query_search_substance_batch(descriptions: list[str], limit: Optional[int] = 3) -> dict:
+    """
+    Batch form of query_search_substance() for screening ingredient lists.
+
+    All inputs are resolved together with a constant number of set-based queries, whatever
+    the batch size: the search terms are bound as one JSON array and joined against the
+    identifier table, then the synonym index (terms still unresolved), then the component
+    index (terms still unresolved), followed by one component and one study query for every
+    matched substance. Matching and ranking per input are the same as query_search_substance().
+
+    Args:
+        descriptions: Search terms (names, E-numbers, CAS numbers, ...), at most MAX_BATCH_SIZE
+        limit: Maximum number of substances per input (default: 3, None for all)
+
+    Returns:
+        Dictionary with:
+        - 'results': one entry per input, in input order: {'input', 'resolved', 'results',
+          'total_count'}, where 'results' is ranked like query_search_substance() results
+        - 'unresolved': inputs without any match
+
+    Raises:
+        TypeError: If descriptions is not a list.
+        ValueError: If descriptions has more than MAX_BATCH_SIZE entries, or limit is less than 1.
+    """
+    _check_batch_size(descriptions, "descriptions")
+    _check_limit(limit)
+    # Duplicate inputs are searched once
+    term_indexes = {}
+    for description in descriptions:
+        term_indexes.setdefault(str(description), len(term_indexes))
+    terms = []
+    for description, term_index in term_indexes.items():
+        identifier = classify_identifier(description)
+        kinds, value = (identifier_kinds(identifier), identifier[1]) if identifier else (None, None)
+        terms.append([term_index, normalize_e_number(description), kinds, value])
+
+    ranked_frames = []
+    with get_connection() as db_connection:
+        synonym_table, component_table = get_search_tables(db_connection)
+
+        def rank_pending(pending_terms, hits_query):
+            if not pending_terms:
+                return pending_terms
+            ranked = _rank_batch_search_hits(db_connection, hits_query, pending_terms, limit)
+            ranked_frames.append(ranked)
+            resolved = set(ranked["TERM_INDEX"].tolist())
+            return [term for term in pending_terms if term[0] not in resolved]
+
+        # Step 0: exact identifier lookups; identifier inputs that find nothing (or a bare
+        # number found in several registries) fall through
+        pending = [term for term in terms if term[2] is None]
+        identifier_terms = [term for term in terms if term[2] is not None]
+        if identifier_terms and has_identifier_table(db_connection):
+            identifier_terms = rank_pending(
+                identifier_terms,
+                """
+                SELECT t.TERM_INDEX, i.SUB_COM_ID, t.TERM AS MATCHED_TEXT, t.TERM AS SEARCH_TERM
+                FROM terms t
+                JOIN identifier i ON i.KIND IN (SELECT value FROM json_each(t.KINDS)) AND i.VALUE = t.VALUE
+                WHERE (
+                    SELECT COUNT(DISTINCT a.KIND) FROM identifier a
+                    WHERE a.KIND IN (SELECT value FROM json_each(t.KINDS)) AND a.VALUE = t.VALUE
+                ) = 1
+                """,
+            )
+        pending = sorted(pending + identifier_terms)
+
+        # Step 1: synonym text search. CROSS JOIN keeps the terms as the outer loop, so each
+        # term's LIKE pattern is answered by the trigram index instead of a full index scan
+        pending = rank_pending(
+            pending,
+            f"""
+            SELECT t.TERM_INDEX, f.SUB_COM_ID, f.DESCRIPTION AS MATCHED_TEXT, t.TERM AS SEARCH_TERM
+            FROM terms t CROSS JOIN {synonym_table} f ON f.DESCRIPTION LIKE '%' || t.TERM || '%'
+            """,
+        )
+
+        # Step 2: component name search
+        rank_pending(
+            pending,
+            f"""
+            SELECT t.TERM_INDEX, f.SUB_COM_ID, f.SUB_NAME AS MATCHED_TEXT, t.TERM AS SEARCH_TERM
+            FROM terms t CROSS JOIN {component_table} f ON f.SUB_NAME LIKE '%' || t.TERM || '%'
+            UNION ALL
+            SELECT t.TERM_INDEX, f.SUB_COM_ID, f.COM_NAME AS MATCHED_TEXT, t.TERM AS SEARCH_TERM
+            FROM terms t CROSS JOIN {component_table} f ON f.COM_NAME LIKE '%' || t.TERM || '%'
+            """,
+        )
+
+        ranked_frames = [frame for frame in ranked_frames if not frame.empty]
+        ranked = pd.concat(ranked_frames, ignore_index=True) if ranked_frames else pd.DataFrame(
+            columns=["TERM_INDEX", "SUB_COM_ID", "RELEVANCE_SCORE", "STUDY_COUNT", "TOTAL_COUNT"]
+        )
+
+        # Step 3: hydrate every matched substance once (same fields as query_search_substance)
+        entries = {}
+        sub_com_ids = ranked["SUB_COM_ID"].unique().tolist()
+        if sub_com_ids:
+            id_params = [bind_ids(sub_com_ids)]
+            components_df = pd.read_sql_query(
+                f"""
+                SELECT DISTINCT SUB_COM_ID, COM_NAME, COM_TYPE, MOLECULARFORMULA, SUB_DESCRIPTION
+                FROM component
+                WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
+                """,
+                db_connection,
+                params=id_params,
+            )
+            id_dtypes = {column: "Int64" for column in ["GENOTOX_ID", "TOX_ID", "HAZARD_ID", "OP_ID"]}
+            studies_df = pd.read_sql_query(
+                f"""
+                SELECT SUB_COM_ID, SUB_OP_CLASS, REMARKS_STUDY, GENOTOX_ID, TOX_ID, HAZARD_ID, OP_ID
+                FROM study
+                WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})
+                """,
+                db_connection,
+                params=id_params,
+                dtype=id_dtypes,
+            )
+            entries = {entry["SUB_COM_ID"]: entry for entry in _aggregate_studies(components_df, studies_df)}
+
+    # Step 4: group the ranked matches per input
+    by_term = {}
+    for row in ranked.itertuples(index=False):
+        entry = entries.get(row.SUB_COM_ID)
+        if entry is None:
+            continue
+        relevance_score = int(row.RELEVANCE_SCORE)
+        matches = by_term.setdefault(int(row.TERM_INDEX), {"results": [], "total_count": int(row.TOTAL_COUNT)})
+        matches["results"].append(
+            {
+                **entry,
+                "RELEVANCE_SCORE": relevance_score,
+                "MATCH_TYPE": MATCH_TYPES[relevance_score],
+                "STUDY_COUNT": int(row.STUDY_COUNT),
             }
+        )
 
-            if not component_studies.empty:
-                # Aggregate study fields into arrays
-                entry["SUB_OP_CLASS"] = to_string_array_or_none(component_studies["SUB_OP_CLASS"])
-                entry["REMARKS"] = to_string_array_or_none(component_studies["REMARKS_STUDY"])
-                entry["GENOTOX_ID"] = to_array_or_none(component_studies["GENOTOX_ID"])
-                entry["TOX_ID"] = to_array_or_none(component_studies["TOX_ID"])
-                entry["HAZARD_ID"] = to_array_or_none(component_studies["HAZARD_ID"])
-                entry["OP_ID"] = to_array_or_none(component_studies["OP_ID"])
-            else:
-                # No studies found for this component
-                entry["SUB_OP_CLASS"] = None
-                entry["REMARKS"] = None
-                entry["GENOTOX_ID"] = None
-                entry["TOX_ID"] = None
-                entry["HAZARD_ID"] = None
-                entry["OP_ID"] = None
-
-            result.append(entry)
+    results = []
+    for description in descriptions:
+        matches = by_term.get(term_indexes[str(description)], {"results": [], "total_count": 0})
+        results.append({"input": description, "resolved": bool(matches["results"]), **matches})
+    unresolved = [result["input"] for result in results if not result["resolved"]]
+    logger.debug(
+        f"query_search_substance_batch resolved {len(results) - len(unresolved)} of {len(results)} inputs"
+    )
+    return {"results": results, "unresolved": unresolved}
+
+
+# Result field -> (STUDY column, aggregate as strings) for query_search_substance
+STUDY_ARRAY_FIELDS = {
+    "SUB_OP_CLASS": ("SUB_OP_CLASS", True),
+    "REMARKS": ("REMARKS_STUDY", True),
+    "GENOTOX_ID": ("GENOTOX_ID", False),
+    "TOX_ID": ("TOX_ID", False),
+    "HAZARD_ID": ("HAZARD_ID", False),
+    "OP_ID": ("OP_ID", False),
+}
+
+
+def _unique_values_by_substance(studies_df: DataFrame, column: str, as_string: bool) -> dict:
+    """
+    Map each SUB_COM_ID to the unique non-null values of a STUDY column, in first-seen order.
 
-        return result
+    String columns are converted with str() and blank values are dropped.
+    Substances without any remaining value are absent from the returned dict.
+    """
+    values = studies_df[["SUB_COM_ID", column]].dropna(subset=[column]).drop_duplicates()
+    if as_string:
+        values = values.assign(**{column: values[column].astype(str)})
+        values = values[values[column].str.strip() != ""]
+    # Bucket in one linear pass; tolist() converts numpy scalars to native Python types
+    grouped = {}
+    for sub_com_id, value in zip(values["SUB_COM_ID"].tolist(), values[column].tolist()):
+        grouped.setdefault(sub_com_id, []).append(value)
+    return grouped
+
+
+def _aggregate_studies(components_df: DataFrame, studies_df: DataFrame) -> list[dict]:
+    """
+    Build one entry per component row with its studies aggregated into arrays.
+
+    Each STUDY column is de-duplicated and bucketed once for all substances, instead of
+    re-filtering the studies for every component. Array fields are None when a substance has
+    no values for them.
+    """
+    aggregated = {
+        field: _unique_values_by_substance(studies_df, column, as_string)
+        for field, (column, as_string) in STUDY_ARRAY_FIELDS.items()
+    }
+
+    component_columns = ["SUB_COM_ID", "COM_NAME", "COM_TYPE", "MOLECULARFORMULA", "SUB_DESCRIPTION"]
+    components = components_df[component_columns].astype(object)
+    components = components.where(components.notna(), None)
+
+    result = []
+    for component in components.to_dict("records"):
+        entry = dict(component)
+        for field, values_by_substance in aggregated.items():
+            entry[field] = values_by_substance.get(component["SUB_COM_ID"])
+        result.append(entry)
+
+    return result
 
 
 def query_safety_assessment(sub_com_id) -> DataFrame:
@@ -356,26 +734,81 @@ def query_safety_assessment(sub_com_id) -> DataFrame:
         return safety_assessment
 
 
-def query_by_id(id_value: Union[int, list[int]], table_name: str) -> DataFrame:
+def query_safety_assessment_batch(sub_com_ids: list[int]) -> dict:
     """
-    Generic query function that retrieves records from a table by unique ID(s).
+    Batch form of query_safety_assessment(): safety assessments of many substances at once.
 
-    Only works with tables where the ID column is unique (one row per ID).
-    Tables with non-unique IDs (synonym, study, question) are not supported.
+    Runs two queries for the whole batch (the IDs are bound as one JSON array): one for the
+    substances that exist and one for their STUDY rows joined with OPINION.
+
+    Returns:
+        Dictionary with:
+        - 'results': one entry per input ID, in input order: {'SUB_COM_ID', 'found',
+          'safety_assessment'}, where 'safety_assessment' has the same fields as
+          query_safety_assessment(), sorted by PUBLICATIONDATE
+        - 'not_found': input IDs that match no substance
+
+    Raises:
+        TypeError: If sub_com_ids is not a list.
+        ValueError: If sub_com_ids has more than MAX_BATCH_SIZE entries.
+    """
+    _check_batch_size(sub_com_ids, "sub_com_ids")
+    id_params = [bind_ids(sub_com_ids)]
+    with get_connection() as db_connection:
+        found = {
+            row[0]
+            for row in db_connection.execute(
+                f"SELECT SUB_COM_ID FROM component WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})", id_params
+            )
+        }
+        assessments = {}
+        cursor = _records_cursor(
+            db_connection,
+            f"""
+            SELECT
+                s.SUB_COM_ID,
+                s.SUB_OP_CLASS,
+                s.IS_MUTAGENIC,
+                s.IS_GENOTOXIC,
+                s.IS_CARCINOGENIC,
+                s.REMARKS_STUDY,
+                s.TOXREF_ID,
+                s.OP_ID,
+                o.ADOPTIONDATE,
+                o.PUBLICATIONDATE,
+                o.AUTHOR,
+                o.TITLE
+            FROM study s
+            LEFT JOIN opinion o ON s.OP_ID = o.OP_ID
+            WHERE s.SUB_COM_ID IN ({ID_LIST_SUBQUERY})
+            ORDER BY s.SUB_COM_ID, o.PUBLICATIONDATE ASC
+            """,
+            id_params,
+        )
+        for record in cursor:
+            assessments.setdefault(record.pop("SUB_COM_ID"), []).append(record)
+
+    results = [
+        {
+            "SUB_COM_ID": sub_com_id,
+            "found": sub_com_id in found,
+            "safety_assessment": assessments.get(sub_com_id, []),
+        }
+        for sub_com_id in sub_com_ids
+    ]
+    return {"results": results, "not_found": [result["SUB_COM_ID"] for result in results if not result["found"]]}
 
-    Args:
-        id_value: Single ID (int) or list of IDs (list[int]) to query.
-                 IDs correspond to: TOX_ID, GENOTOX_ID, HAZARD_ID, OP_ID, SUB_COM_ID
-        table_name: The target table name (case-insensitive). Supported:
-            - endpoint_study (TOX_ID)
-            - genotox (GENOTOX_ID)
-            - chem_assess (HAZARD_ID)
-            - opinion (OP_ID)
-            - component (SUB_COM_ID)
+
+def _id_lookup_query(id_value: Union[int, list[int]], table_name: str) -> Optional[tuple[str, list]]:
+    """
+    Validate a query_by_id() request and build its (query, params).
 
     Returns:
-        DataFrame with matching records, all data (columns) (0 to N rows, where N = number of IDs provided),
-        or empty DataFrame if no matches
+        (query, params) selecting every column of the matching rows, or None for an empty ID list
+
+    Raises:
+        ValueError: If the table is unsupported (non-unique IDs) or unknown.
+        TypeError: If id_value is not an int or a list of ints.
     """
     table_name_lower = table_name.lower()
 
@@ -418,28 +851,122 @@ def query_by_id(id_value: Union[int, list[int]], table_name: str) -> DataFrame:
         id_list = [id_value]
     elif isinstance(id_value, list):
         if not id_value:
-            logger.warning("Empty ID list provided, returning empty DataFrame")
-            return pd.DataFrame()
+            logger.warning("Empty ID list provided, returning no records")
+            return None
         id_list = id_value
     else:
         raise TypeError(f"id_value must be int or list[int], got {type(id_value)}")
 
+    # One constant statement per table for any number of IDs
+    query = f"SELECT * FROM {table_name_lower} WHERE {id_column} IN ({ID_LIST_SUBQUERY})"
+    return query, [bind_ids(id_list)]
+
+
+def query_by_id(id_value: Union[int, list[int]], table_name: str) -> DataFrame:
+    """
+    Generic query function that retrieves records from a table by unique ID(s).
+
+    Only works with tables where the ID column is unique (one row per ID).
+    Tables with non-unique IDs (synonym, study, question) are not supported.
+
+    Args:
+        id_value: Single ID (int) or list of IDs (list[int]) to query.
+                 IDs correspond to: TOX_ID, GENOTOX_ID, HAZARD_ID, OP_ID, SUB_COM_ID
+        table_name: The target table name (case-insensitive). Supported:
+            - endpoint_study (TOX_ID)
+            - genotox (GENOTOX_ID)
+            - chem_assess (HAZARD_ID)
+            - opinion (OP_ID)
+            - component (SUB_COM_ID)
+
+    Returns:
+        DataFrame with matching records, all data (columns) (0 to N rows, where N = number of IDs provided),
+        or empty DataFrame if no matches
+    """
+    lookup = _id_lookup_query(id_value, table_name)
+    if lookup is None:
+        return pd.DataFrame()
+    query, params = lookup
+
     with get_connection() as db_connection:
         try:
-            # Use IN clause for multiple IDs, = for single ID
-            if len(id_list) == 1:
-                query = f"SELECT * FROM {table_name_lower} WHERE {id_column} = ?"
-                params = [id_list[0]]
-            else:
-                placeholders = ",".join("?" * len(id_list))
-                query = f"SELECT * FROM {table_name_lower} WHERE {id_column} IN ({placeholders})"
-                params = id_list
-
             result = pd.read_sql_query(query, db_connection, params=params)
             logger.debug(f"query_by_id({id_value}, {table_name}) returned {len(result)} rows")
             return result
         except Exception as e:
-            logger.error(f"Error querying {table_name} by {id_column}={id_value}: {e}")
+            logger.error(f"Error querying {table_name} by ID {id_value}: {e}")
             return pd.DataFrame()
 
 
+def _record_row_factory(description):
+    """sqlite3 row factory returning each row as a {column: value} dict (names resolved once)."""
+    columns = [column[0] for column in description]
+
+    def row_factory(cursor, row) -> dict:
+        return dict(zip(columns, row))
+
+    return row_factory
+
+
+def _records_cursor(db_connection, query: str, params: list):
+    """Execute a query on a cursor whose rows are {column: value} dicts."""
+    cursor = db_connection.execute(query, params)
+    # Rows are built on fetch, so the factory can be set once the columns are known
+    cursor.row_factory = _record_row_factory(cursor.description)
+    return cursor
+
+
+def query_records_by_id(id_value: Union[int, list[int]], table_name: str) -> list[dict]:
+    """
+    Same lookup as query_by_id(), without pandas.
+
+    Rows are read through a dict row factory set on the cursor (the pooled connection is
+    left untouched), so no DataFrame is built and NULLs stay None instead of becoming NaN.
+
+    Returns:
+        List of {column: value} dicts (one per matching row), or an empty list if no matches
+
+    Raises:
+        ValueError: If the table is unsupported (non-unique IDs) or unknown.
+        TypeError: If id_value is not an int or a list of ints.
+    """
+    lookup = _id_lookup_query(id_value, table_name)
+    if lookup is None:
+        return []
+    query, params = lookup
+
+    with get_connection() as db_connection:
+        try:
+            records = _records_cursor(db_connection, query, params).fetchall()
+            logger.debug(f"query_records_by_id({id_value}, {table_name}) returned {len(records)} rows")
+            return records
+        except Exception as e:
+            logger.error(f"Error querying {table_name} by ID {id_value}: {e}")
+            return []
+
+
+def query_json_by_id(id_value: Union[int, list[int]], table_name: str) -> str:
+    """
+    Same lookup as query_records_by_id(), serialized to a record-oriented JSON array.
+
+    Rows are encoded one at a time as the cursor yields them (see records_to_json), so
+    neither a DataFrame nor the full list of row dicts is ever held in memory.
+
+    Returns:
+        JSON array string, "[]" if no matches
+
+    Raises:
+        ValueError: If the table is unsupported (non-unique IDs) or unknown.
+        TypeError: If id_value is not an int or a list of ints.
+    """
+    lookup = _id_lookup_query(id_value, table_name)
+    if lookup is None:
+        return "[]"
+    query, params = lookup
+
+    with get_connection() as db_connection:
+        try:
+            return records_to_json(_records_cursor(db_connection, query, params))
+        except Exception as e:
+            logger.error(f"Error querying {table_name} by ID {id_value}: {e}")
+            return "[]"
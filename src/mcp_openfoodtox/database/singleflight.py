@@ -0,0 +1,52 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class _Call:
+    """One in-flight execution and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent async calls into one execution.
+
+    The first caller for a key starts the execution as a task; callers arriving with the
+    same key while it runs wait on that task and share its result (or exception). The
+    execution is only cancelled when every waiting caller has been cancelled, so one client
+    giving up does not fail the others.
+
+    `coalesced` counts the calls that were answered by another caller's execution.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls: dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Run fn() for `key`, or wait for the execution already in flight for it."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller was cancelled: stop the execution too
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
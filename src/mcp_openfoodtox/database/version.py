@@ -0,0 +1,83 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.mcp_openfoodtox.database.connection import get_db_path
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between checks of the database file for changes
+DATASET_CHECK_INTERVAL_SECONDS = 1.0
+
+
+class DatasetVersion:
+    """
+    Content hash of the database file, recomputed when the file changes.
+
+    current() does no I/O: it returns the hash from the last refresh(). refresh() compares
+    a cheap os.stat() signature (size, mtime, inode) and only re-hashes the file when it
+    changed, e.g. after `make db` rebuilt it. It blocks, so it runs at startup
+    (cache.configure_cache) and on a worker thread (see cache.cache_tool), never on the
+    event loop.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path is not None else None
+        self._signature = None
+        self._hash = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current(self) -> str:
+        """Return the hash of the database file as of the last refresh() ("missing" if it did not exist)."""
+        if self._hash is None:
+            return self.refresh()
+        return self._hash
+
+    def refresh(self) -> str:
+        """Re-check the database file, re-hash it if it changed, and return the hash."""
+        db_path = self.db_path or get_db_path()
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(db_path)
+            except FileNotFoundError:
+                self._signature, self._hash = None, "missing"
+                return self._hash
+            signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            if signature != self._signature:
+                digest = hashlib.blake2b(digest_size=16)
+                with open(db_path, "rb") as db_file:
+                    for chunk in iter(lambda: db_file.read(1 << 20), b""):
+                        digest.update(chunk)
+                self._signature, self._hash = signature, digest.hexdigest()
+                logger.debug(f"Dataset version {self._hash} ({db_path})")
+            return self._hash
+
+    def claim_check(self, interval: float = DATASET_CHECK_INTERVAL_SECONDS) -> bool:
+        """
+        Return True (at most once per `interval` seconds) when the caller should schedule a refresh().
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < interval:
+                return False
+            self._checked_at = now
+            return True
+
+
+_dataset_version = DatasetVersion()
+
+
+def get_dataset_version() -> DatasetVersion:
+    """The DatasetVersion of the served database file, shared by the result cache and page cursors."""
+    return _dataset_version
+
+
+def current_dataset_version() -> str:
+    """Content hash of the served database file (see DatasetVersion)."""
+    return _dataset_version.current()
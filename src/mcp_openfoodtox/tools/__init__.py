@@ -0,0 +1,8 @@
+"""
+MCP tool functions registered by main.py.
+
+Tool modules import the database layer inside each function rather than at module level.
+The database layer pulls in pandas and numpy; keeping them off the import path lets the
+server answer `initialize` before paying for them (FastMCP.add_tool only reads signatures
+and docstrings). They load on the first tool call.
+"""
@@ -0,0 +1,48 @@
+"""
+Async variants of every MCP tool, as registered by main.py.
+
+Each variant runs the synchronous tool on the database executor (database/executor.py):
+ID lookups on the "lookup" lane, searches and list queries on the "query" lane. Calls are
+subject to the executor's time limit, and a cancelled or timed-out call interrupts its
+SQLite statement. Results are cached per dataset version (database/cache.py), so repeated
+calls skip the executor entirely.
+"""
+
+from src.mcp_openfoodtox.database.cache import cache_tool
+from src.mcp_openfoodtox.database.executor import run_in_executor
+from src.mcp_openfoodtox.tools.count_substances_by_facets import count_substances_by_facets
+from src.mcp_openfoodtox.tools.get_genotox_details import get_genotox_details
+from src.mcp_openfoodtox.tools.get_opinions import get_opinions
+from src.mcp_openfoodtox.tools.get_risk_assessments import get_risk_assessments
+from src.mcp_openfoodtox.tools.get_substance_dossier import get_substance_dossier
+from src.mcp_openfoodtox.tools.get_toxicity_endpoints import get_toxicity_endpoints
+from src.mcp_openfoodtox.tools.list_hazard_ids_by_assessment import list_hazard_ids_by_assessment
+from src.mcp_openfoodtox.tools.list_substances_by_assessment import list_substances_by_assessment
+from src.mcp_openfoodtox.tools.list_substances_by_class_and_safety import (
+    list_substances_by_class_and_safety,
+)
+from src.mcp_openfoodtox.tools.search_substance import search_substance
+from src.mcp_openfoodtox.tools.search_substance_batch import search_substance_batch
+from src.mcp_openfoodtox.tools.substance_safety_assessment import get_substance_safety_assessment
+from src.mcp_openfoodtox.tools.substance_safety_assessment_batch import (
+    get_substance_safety_assessment_batch,
+)
+
+# (tool, worker lane) in registration order
+TOOL_LANES = [
+    (search_substance, "query"),
+    (get_risk_assessments, "lookup"),
+    (get_toxicity_endpoints, "lookup"),
+    (get_genotox_details, "lookup"),
+    (get_opinions, "lookup"),
+    (get_substance_safety_assessment, "lookup"),
+    (get_substance_dossier, "lookup"),
+    (list_substances_by_class_and_safety, "query"),
+    (list_hazard_ids_by_assessment, "query"),
+    (list_substances_by_assessment, "query"),
+    (search_substance_batch, "query"),
+    (get_substance_safety_assessment_batch, "lookup"),
+    (count_substances_by_facets, "lookup"),
+]
+
+ASYNC_TOOLS = [cache_tool(run_in_executor(tool, lane=lane)) for tool, lane in TOOL_LANES]
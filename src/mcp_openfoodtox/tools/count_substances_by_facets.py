@@ -0,0 +1,112 @@
+from typing import Literal, Optional
+
+
+def count_substances_by_facets(
+    group_by: Optional[
+        list[
+            Literal[
+                "sub_class",
+                "is_mutagenic",
+                "is_genotoxic",
+                "is_carcinogenic",
+                "assessment_type",
+                "population",
+            ]
+        ]
+    ] = None,
+    sub_class: Optional[str] = None,
+    is_mutagenic: Optional[
+        Literal[
+            "Positive",
+            "Negative",
+            "Ambiguous",
+            "No data",
+            "Not applicable",
+            "Not determined",
+            "Other",
+        ]
+    ] = None,
+    is_genotoxic: Optional[
+        Literal[
+            "Positive",
+            "Negative",
+            "Ambiguous",
+            "No data",
+            "Not applicable",
+            "Not determined",
+            "Other",
+        ]
+    ] = None,
+    is_carcinogenic: Optional[
+        Literal[
+            "Positive",
+            "Negative",
+            "Ambiguous",
+            "No data",
+            "Not applicable",
+            "Not determined",
+            "Other",
+        ]
+    ] = None,
+    assessment_type: Optional[str] = None,
+    population: Optional[str] = None,
+    limit: int = 50,
+):
+    """
+    Count substances per substance class, safety flag, assessment type and population.
+
+    Use this for statistics and comparisons instead of paging through
+    list_substances_by_class_and_safety: the counts are precomputed when the database is
+    built, so any breakdown is answered instantly and counts are exact.
+
+    ## Example questions it can answer:
+    * "Which category has the most carcinogenic positives?"
+      -> group_by=["sub_class"], is_carcinogenic="Positive"
+    * "How many food additives are genotoxic?"
+      -> sub_class="Food additives", is_genotoxic="Positive" (read total_count)
+    * "Break down pesticides by mutagenicity and genotoxicity"
+      -> group_by=["is_mutagenic", "is_genotoxic"], sub_class="Pesticides"
+    * "How many substances have an ADI for children, by class?"
+      -> group_by=["sub_class"], assessment_type="ADI", population="Consumers - Children"
+
+    Args:
+        group_by: Facets to break the counts down by (default: none, only total_count).
+                  - "sub_class": SUB_OP_CLASS (e.g. "Food additives", "Pesticides", "Flavourings")
+                  - "is_mutagenic", "is_genotoxic", "is_carcinogenic": safety flags
+                  - "assessment_type": ASSESSMENTTYPE of the risk assessment (e.g. "ADI", "TDI", "ARfD")
+                  - "population": POPULATIONTEXT of the risk assessment (e.g. "Consumers - Children")
+                  A facet cannot be grouped and filtered at the same time.
+        sub_class: Optional SUB_OP_CLASS filter. Exact class name, case-insensitive
+                   (see list_substances_by_class_and_safety for the list of classes).
+        is_mutagenic: Optional IS_MUTAGENIC filter (exact match)
+        is_genotoxic: Optional IS_GENOTOXIC filter (exact match)
+        is_carcinogenic: Optional IS_CARCINOGENIC filter (exact match)
+        assessment_type: Optional ASSESSMENTTYPE filter, exact and case-insensitive (e.g. "ADI")
+        population: Optional POPULATIONTEXT filter, exact and case-insensitive
+                    (see list_substances_by_assessment for the list of populations)
+        limit: Maximum number of groups to return, largest counts first (default: 50, at least 1)
+
+    Returns:
+        Dictionary with:
+        - 'results': List of groups, largest first. Each group has one key per group_by
+          facet (SUB_OP_CLASS, IS_MUTAGENIC, IS_GENOTOXIC, IS_CARCINOGENIC, ASSESSMENTTYPE,
+          POPULATIONTEXT) and SUBSTANCE_COUNT. A null facet value means "not set" (e.g. no
+          risk assessment for ASSESSMENTTYPE).
+        - 'total_count': Number of distinct substances matching the filters.
+
+        Counts are distinct substances (SUB_COM_ID). All filters and group values must come
+        from the same study (and its risk assessment), as in list_substances_by_class_and_safety.
+        A substance can appear in several groups, so group counts may add up to more than
+        total_count.
+    """
+    from src.mcp_openfoodtox.database.facets import query_facet_counts
+
+    filters = {
+        "sub_class": sub_class,
+        "is_mutagenic": is_mutagenic,
+        "is_genotoxic": is_genotoxic,
+        "is_carcinogenic": is_carcinogenic,
+        "assessment_type": assessment_type,
+        "population": population,
+    }
+    return query_facet_counts(group_by=group_by, filters=filters, limit=limit)
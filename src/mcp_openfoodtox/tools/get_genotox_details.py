@@ -1,5 +1,4 @@
 from typing import Union
-from src.mcp_openfoodtox.database.queries import query_by_id
 
 
 def get_genotox_details(genotox_id: Union[int, list[int]]):
@@ -15,7 +14,7 @@ def get_genotox_details(genotox_id: Union[int, list[int]]):
                    Use search_substance tool first to find GENOTOX_IDs through the STUDY table.
 
     Returns:
-        JSON string containing a DataFrame with genotoxicity study records. Each record
+        JSON array of genotoxicity study records, one object per row. Each record
         includes study category, test guidelines, species, exposure conditions, and
         genotoxicity results.
 
@@ -49,5 +48,6 @@ def get_genotox_details(genotox_id: Union[int, list[int]]):
     <description>Remarks on genotoxicity study</description>
     </dictionary_descriptions>
     """
-    df = query_by_id(genotox_id, "genotox")
-    return df.to_json()
+    from src.mcp_openfoodtox.database.queries import query_json_by_id
+
+    return query_json_by_id(genotox_id, "genotox")
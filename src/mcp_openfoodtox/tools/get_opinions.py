@@ -1,5 +1,4 @@
 from typing import Union
-from src.mcp_openfoodtox.database.queries import query_by_id
 
 
 def get_opinions(op_id: Union[int, list[int]]):
@@ -15,7 +14,7 @@ def get_opinions(op_id: Union[int, list[int]]):
               Use search_substance tool first to find OP_IDs through the STUDY table.
 
     Returns:
-        JSON string containing a DataFrame with opinion document records. Each record
+        JSON array of opinion document records, one object per row. Each record
         includes publication metadata, regulatory information, and document access details.
 
     The returned data includes:
@@ -61,5 +60,6 @@ def get_opinions(op_id: Union[int, list[int]]):
     <description>Organization or entity that owns or published the document</description>
     </dictionary_descriptions>
     """
-    df = query_by_id(op_id, "opinion")
-    return df.to_json()
+    from src.mcp_openfoodtox.database.queries import query_json_by_id
+
+    return query_json_by_id(op_id, "opinion")
@@ -1,5 +1,4 @@
 from typing import Union
-from src.mcp_openfoodtox.database.queries import query_by_id
 
 
 def get_risk_assessments(hazard_id: Union[int, list[int]]):
@@ -16,7 +15,7 @@ def get_risk_assessments(hazard_id: Union[int, list[int]]):
                   Use search_substance tool first to find HAZARD_IDs through the STUDY table.
 
     Returns:
-        JSON string containing a DataFrame with risk assessment records. Each record
+        JSON array of risk assessment records, one object per row. Each record
         includes assessment type, risk values, units, safety factors, and population
         information.
 
@@ -55,5 +54,6 @@ def get_risk_assessments(hazard_id: Union[int, list[int]]):
     <description>Assessment summarised where no reference value is set</description>
     </dictionary_descriptions>
     """
-    df = query_by_id(hazard_id, "chem_assess")
-    return df.to_json()
+    from src.mcp_openfoodtox.database.queries import query_json_by_id
+
+    return query_json_by_id(hazard_id, "chem_assess")
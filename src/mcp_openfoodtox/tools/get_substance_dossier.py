@@ -0,0 +1,47 @@
+from typing import Optional
+
+
+def get_substance_dossier(sub_com_id: int, sections: Optional[list[str]] = None):
+    """
+    Get everything the database holds about one substance in a single call.
+
+    Use this for "tell me everything about [substance]" questions instead of calling
+    get_substance_safety_assessment, get_risk_assessments, get_toxicity_endpoints,
+    get_genotox_details and get_opinions one after another. The dossier is precomputed
+    when the database is built, so it is returned with a single lookup.
+
+    Args:
+        sub_com_id (int): The SUB_COM_ID identifier for the substance component.
+                          Use search_substance tool first to find the SUB_COM_ID for a
+                          given substance name or E-number.
+        sections: Optional list of sections to return (default: all sections).
+                  Valid sections:
+                  - "component": substance and chemical names, type, formula (COMPONENT)
+                  - "synonyms": alternative names, E-numbers, CAS numbers (SYNONYM)
+                  - "safety_assessment": safety flags and opinion metadata, same records
+                    as get_substance_safety_assessment, oldest first
+                  - "risk_assessments": ADI/TDI/ARfD values (CHEM_ASSESS), as get_risk_assessments
+                  - "toxicity_endpoints": NOAEL, LD50, target organs (ENDPOINTSTUDY), as get_toxicity_endpoints
+                  - "genotox": genotoxicity studies (GENOTOX), as get_genotox_details
+                  - "opinions": EFSA opinion documents (OPINION), as get_opinions
+                  - "questions": EFSA question numbers of those opinions (QUESTION)
+                  Example: ["safety_assessment", "risk_assessments"] for a short safety summary.
+
+    Returns:
+        JSON object with "SUB_COM_ID" and one key per requested section. "component" is
+        a single record; every other section is an array of records (empty if the
+        substance has no data of that kind). Returns null if no substance has this SUB_COM_ID.
+
+    Example usage:
+        # Full profile of a substance found with search_substance
+        dossier_json = get_substance_dossier(sub_com_id=1234)
+
+        # Only safety flags and safe intake limits
+        dossier_json = get_substance_dossier(
+            sub_com_id=1234,
+            sections=["safety_assessment", "risk_assessments"]
+        )
+    """
+    from src.mcp_openfoodtox.database.dossier import query_dossier
+
+    return query_dossier(sub_com_id, sections=sections)
@@ -1,5 +1,4 @@
 from typing import Union
-from src.mcp_openfoodtox.database.queries import query_by_id
 
 
 def get_toxicity_endpoints(tox_id: Union[int, list[int]]):
@@ -15,7 +14,7 @@ def get_toxicity_endpoints(tox_id: Union[int, list[int]]):
                Use search_substance tool first to find TOX_IDs through the STUDY table.
 
     Returns:
-        JSON string containing a DataFrame with toxicity endpoint records. Each record
+        JSON array of toxicity endpoint records, one object per row. Each record
         includes endpoint type, toxicity values, study conditions, and target organs.
 
     The returned data includes:
@@ -53,5 +52,6 @@ def get_toxicity_endpoints(tox_id: Union[int, list[int]]):
     <description>Additional remarks on toxicological study. Free text on hazard assessment including (if necessary): 1) short explanation on how the study has been carried on; 2) any conclusions on the hazard identication (for example, explanation on why an hazard could not be identified)</description>
     </dictionary_descriptions>
     """
-    df = query_by_id(tox_id, "endpoint_study")
-    return df.to_json()
+    from src.mcp_openfoodtox.database.queries import query_json_by_id
+
+    return query_json_by_id(tox_id, "endpoint_study")
@@ -1,6 +1,5 @@
 import json
 from typing import Optional
-from src.mcp_openfoodtox.database.multi_sub_queries import query_hazard_ids_by_assessment
 
 
 def list_hazard_ids_by_assessment(
@@ -10,6 +9,7 @@ def list_hazard_ids_by_assessment(
     risk_value_milli_min: Optional[float] = None,
     has_no_risk_value: Optional[bool] = None,
     limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
     """
     Find HAZARD_IDs from risk assessments (CHEM_ASSESS table) filtered by population,
@@ -89,6 +89,8 @@ def list_hazard_ids_by_assessment(
                           These may have qualitative assessments in the ASSESS field instead.
         limit: Optional maximum number of HAZARD_IDs to return. Use to limit results
               for large queries. If None, returns all matching HAZARD_IDs.
+        cursor: Optional next_cursor value from a previous call with the same filters,
+                to get the next page of results. Omit for the first page.
 
     Population Text Reference:
         The following are accepted POPULATIONTEXT values in the database. Use partial
@@ -221,10 +223,14 @@ def list_hazard_ids_by_assessment(
             - Animal for food production - unspecified
 
     Returns:
-        JSON string containing a list of HAZARD_IDs (integers) that match the criteria.
-        Returns an empty list if no assessments match.
+        JSON string with three keys:
+        - "results": list of HAZARD_IDs (integers, ascending) that match the criteria.
+          Empty if no assessments match.
+        - "total_count": how many HAZARD_IDs match the criteria before the limit is applied.
+        - "next_cursor": pass it back as `cursor` (with the same filters) to get the next
+          page; null when there are no more results.
 
-        Example return value: "[123, 456, 789]"
+        Example return value: '{"results": [123, 456, 789], "total_count": 250, "next_cursor": "eyJzIjoi..."}'
 
     Workflow:
         1. Use this tool to find HAZARD_IDs matching your criteria
@@ -242,15 +248,18 @@ def list_hazard_ids_by_assessment(
             limit=20
         )
         # Parse and use with list_substances_by_study
-        hazard_ids = json.loads(hazard_ids_json)
+        hazard_ids = json.loads(hazard_ids_json)["results"]
         # substances = list_substances_by_study(ids=hazard_ids, study_type="hazard")
     """
-    hazard_ids = query_hazard_ids_by_assessment(
+    from src.mcp_openfoodtox.database.multi_sub_queries import query_hazard_id_page
+
+    page = query_hazard_id_page(
         population_text_contains=population_text_contains,
         assessment_type=assessment_type,
         risk_value_milli_max=risk_value_milli_max,
         risk_value_milli_min=risk_value_milli_min,
         has_no_risk_value=has_no_risk_value,
         limit=limit,
+        cursor=cursor,
     )
-    return json.dumps(hazard_ids)
+    return json.dumps(page)
@@ -1,9 +1,4 @@
 from typing import Optional
-import pandas as pd
-from src.mcp_openfoodtox.database.multi_sub_queries import (
-    query_hazard_ids_by_assessment,
-    query_substances_by_study,
-)
 
 
 def list_substances_by_assessment(
@@ -13,6 +8,7 @@ def list_substances_by_assessment(
     risk_value_milli_min: Optional[float] = None,
     has_no_risk_value: Optional[bool] = None,
     limit: int = 10,
+    cursor: Optional[str] = None,
 ):
     """
     Find substances from risk assessments (CHEM_ASSESS table) filtered by population,
@@ -93,6 +89,8 @@ def list_substances_by_assessment(
                           These may have qualitative assessments in the ASSESS field instead.
         limit: Maximum number of substances to return (default: 10). This limits the final
               substance results after filtering by assessment criteria.
+        cursor: Optional next_cursor value from a previous call with the same filters,
+                to get the next page of results. Omit for the first page.
 
     Population Text Reference:
         The following are accepted POPULATIONTEXT values in the database. Use partial
@@ -225,8 +223,12 @@ def list_substances_by_assessment(
             - Animal for food production - unspecified
 
     Returns:
-        JSON string containing a DataFrame with substance records. Each record includes
-        substance identification, classification, and alternative names/E-numbers.
+        JSON string with three keys:
+        - "results": DataFrame with substance records. Each record includes substance
+          identification, classification, and alternative names/E-numbers.
+        - "total_count": how many substances match the criteria before the limit is applied.
+        - "next_cursor": pass it back as `cursor` (with the same filters) to get the next
+          page; null when there are no more results.
 
         The returned data includes:
         - Substance identification: SUB_COM_ID (unique identifier)
@@ -234,7 +236,7 @@ def list_substances_by_assessment(
         - Classification: SUB_TYPE (substance type qualifier)
         - Alternative names: DESCRIPTION (comma-separated synonyms, E-numbers, trade names)
 
-        Returns an empty DataFrame (as JSON) if no substances match the criteria.
+        Returns an empty DataFrame (as JSON) and total_count 0 if no substances match the criteria.
 
         Joins: CHEM_ASSESS → STUDY (by HAZARD_ID) → COMPONENT (by SUB_COM_ID) → SYNONYM (by SUB_COM_ID)
         Returns unique substances (DISTINCT by SUB_COM_ID).
@@ -253,27 +255,18 @@ def list_substances_by_assessment(
             limit=20
         )
     """
-    # Step 1: Get HAZARD_IDs matching the assessment criteria
-    # Use a high limit to ensure we get all matching HAZARD_IDs, then limit substances
-    hazard_ids = query_hazard_ids_by_assessment(
+    from src.mcp_openfoodtox.database.multi_sub_queries import query_substances_by_assessment
+    from src.mcp_openfoodtox.utils.formatting import page_to_json
+
+    # Assessment filter, HAZARD_ID join and limit run as one SQL statement
+    result = query_substances_by_assessment(
         population_text_contains=population_text_contains,
         assessment_type=assessment_type,
         risk_value_milli_max=risk_value_milli_max,
         risk_value_milli_min=risk_value_milli_min,
         has_no_risk_value=has_no_risk_value,
-        limit=None,  # Get all matching HAZARD_IDs
-    )
-
-    # Step 2: If no HAZARD_IDs found, return empty result
-    if not hazard_ids:
-        return pd.DataFrame().to_json()
-
-    # Step 3: Get substances from those HAZARD_IDs
-    result = query_substances_by_study(
-        ids=hazard_ids,
-        study_type="hazard",
         limit=limit,
+        cursor=cursor,
     )
 
-    # Step 4: Return substances as JSON
-    return result["results"].to_json()
+    return page_to_json(result)
@@ -1,5 +1,4 @@
 from typing import Literal, Optional
-from src.mcp_openfoodtox.database.multi_sub_queries import query_substances_by_class_and_safety
 
 
 def list_substances_by_class_and_safety(
@@ -39,6 +38,7 @@ def list_substances_by_class_and_safety(
     ] = None,
     remarks_contains: Optional[str] = None,
     limit: int = 10,
+    cursor: Optional[str] = None,
 ):
     """
     Retrieves substances from the EFSA OpenFoodTox database filtered by safety assessment
@@ -114,12 +114,16 @@ def list_substances_by_class_and_safety(
         is_carcinogenic: Optional IS_CARCINOGENIC filter (exact match: "Positive", "Negative", "Ambiguous", etc.)
         remarks_contains: Optional text search in REMARKS_STUDY (case-insensitive LIKE, substring match)
         limit: Maximum number of results to return (default: 10)
+        cursor: Optional next_cursor value from a previous call with the same filters,
+                to get the next page of results. Omit for the first page.
 
     Returns:
-        JSON string containing a DataFrame with substance records. Each record includes
-        substance identification, classification, and alternative names/E-numbers.
-        The function also returns a total_count indicating how many substances match
-        the criteria before the limit is applied.
+        JSON string with three keys:
+        - "results": DataFrame with substance records. Each record includes substance
+          identification, classification, and alternative names/E-numbers.
+        - "total_count": how many substances match the criteria before the limit is applied.
+        - "next_cursor": pass it back as `cursor` (with the same filters) to get the next
+          page; null when there are no more results.
 
     The returned data includes:
     - Substance identification: SUB_COM_ID (unique identifier)
@@ -134,6 +138,9 @@ def list_substances_by_class_and_safety(
     Use the search_substance tool to get detailed information about specific substances
     from the results.
     """
+    from src.mcp_openfoodtox.database.multi_sub_queries import query_substances_by_class_and_safety
+    from src.mcp_openfoodtox.utils.formatting import page_to_json
+
     result = query_substances_by_class_and_safety(
         sub_class=sub_class,
         is_mutagenic=is_mutagenic,
@@ -141,5 +148,6 @@ def list_substances_by_class_and_safety(
         is_carcinogenic=is_carcinogenic,
         remarks_contains=remarks_contains,
         limit=limit,
+        cursor=cursor,
     )
-    return result["results"].to_json()
+    return page_to_json(result)
@@ -1,7 +1,4 @@
-from src.mcp_openfoodtox.database.queries import query_search_substance
-
-
-def search_substance(description_search):
+def search_substance(description_search, limit: int = 10):
     """
     MCP tool to search the OpenFoodTox database for substances by name, E-number, or description.
 
@@ -12,18 +9,27 @@ def search_substance(description_search):
     The search is case-insensitive and supports partial matches. E-numbers are automatically
     normalized (e.g., "E 951" or "E-951" becomes "E951").
 
-    Returns a list of unique substances (one dictionary per SUB_COM_ID) with all study data
+    Matches are ranked: exact name/E-number/CAS hits first, then names starting with the search
+    term, then names containing it; ties are ordered by number of studies. Only the top `limit`
+    substances are returned, together with the total number of matches.
+
+    Returns unique substances (one dictionary per SUB_COM_ID) with all study data
     aggregated into arrays. Each substance may have multiple studies, opinions, and assessments,
     which are grouped together by SUB_COM_ID.
 
     Args:
         description_search: Search term (substance or component name e.g. "aspartame", OR E-number e.g. "E 951") or any of the following CAS name, Council of Europe number, E number, E.C enzyme number, EC name, EU Flavour Information System number, EUgroup-no, Flavour and Extract Manufacturers Association number, Joint FAO/WHO Expert Committee on Food Additives number, Name, OECD Toolbox Classification, Pharmalogical class, Swiss Prot no., Trade name
+        limit: Maximum number of substances to return, best matches first (default: 10, at least 1).
+               Increase it if total_count shows more relevant matches than were returned.
 
     Returns:
-        List of dictionaries, where each dictionary represents a unique substance with:
-        - Basic component information (name, type, formula, description)
-        - Aggregated study identifiers (arrays of IDs linking to related tables)
-        - Study classifications and remarks (arrays of unique values from all studies)
+        Dictionary with:
+        - 'results': List of dictionaries in rank order, where each dictionary represents a unique substance with:
+            - Basic component information (name, type, formula, description)
+            - Aggregated study identifiers (arrays of IDs linking to related tables)
+            - Study classifications and remarks (arrays of unique values from all studies)
+            - Relevance information (RELEVANCE_SCORE, MATCH_TYPE, STUDY_COUNT)
+        - 'total_count': Total number of matching substances (before limit)
 
         Returns None if no matches are found.
 
@@ -50,7 +56,15 @@ def search_substance(description_search):
     <description>Array of unique identifiers linking to the CHEM_ASSESS table. Each ID represents a chemical risk assessment (e.g., ADI, TDI values). May be None if no assessments exist.</description>
     <name>OP_ID</name>
     <description>Array of unique identifiers linking to the OPINION table. Each ID represents an EFSA published opinion/document associated with this substance. May be None if no opinions exist.</description>
+    <name>RELEVANCE_SCORE</name>
+    <description>How well the substance matched the search term: 3 = exact match, 2 = name starts with the term, 1 = name contains the term.</description>
+    <name>MATCH_TYPE</name>
+    <description>Label for RELEVANCE_SCORE: "exact", "prefix" or "substring".</description>
+    <name>STUDY_COUNT</name>
+    <description>Number of STUDY records for this substance. Used to order equally relevant matches.</description>
     </dictionary_descriptions>
     """
-    results = query_search_substance(description_search)
+    from src.mcp_openfoodtox.database.queries import query_search_substance
+
+    results = query_search_substance(description_search, limit=limit)
     return results
@@ -0,0 +1,36 @@
+from typing import Optional
+
+
+def search_substance_batch(descriptions: list[str], limit: Optional[int] = 3):
+    """
+    MCP tool to search for many substances at once, e.g. every ingredient on a product label.
+
+    Use this instead of calling search_substance once per ingredient. Each input is matched
+    and ranked exactly like search_substance (identifier lookup for E-numbers and CAS/EC
+    numbers, then synonyms, then component names), but the whole list is resolved in a few
+    database queries, so screening 300 ingredients costs about as much as screening 3.
+
+    Args:
+        descriptions: List of search terms, one per ingredient (names, E-numbers such as
+                      "E 951", CAS numbers, trade names, ...). At most 500 entries per call.
+        limit: Maximum number of substances returned per input, best matches first
+               (default: 3, at least 1; None for all matches).
+
+    Returns:
+        Dictionary with:
+        - 'results': One entry per input, in input order, with:
+            - 'input': the search term as given
+            - 'resolved': False if nothing in the database matches the input
+            - 'results': matching substances, with the same fields as search_substance results
+              (SUB_COM_ID, COM_NAME, study ID arrays, RELEVANCE_SCORE, MATCH_TYPE, STUDY_COUNT)
+            - 'total_count': number of matching substances before the limit
+        - 'unresolved': list of the inputs that matched nothing (check spelling or try a
+          synonym / E-number with search_substance)
+
+    Example usage:
+        batch = search_substance_batch(["sugar", "E 330", "aspartame", "E 202"])
+        # then get_substance_safety_assessment_batch with the SUB_COM_IDs of the top matches
+    """
+    from src.mcp_openfoodtox.database.queries import query_search_substance_batch
+
+    return query_search_substance_batch(descriptions, limit=limit)
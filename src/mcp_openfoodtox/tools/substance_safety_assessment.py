@@ -1,6 +1,3 @@
-from src.mcp_openfoodtox.database.queries import query_safety_assessment
-
-
 def get_substance_safety_assessment(sub_com_id):
     """
     Get comprehensive safety assessment data for a substance by SUB_COM_ID.
@@ -54,5 +51,7 @@ def get_substance_safety_assessment(sub_com_id):
     <description>Complete date of the publication of the document in the format yyyymmdd</description>
     </dictionary_descriptions>
     """
+    from src.mcp_openfoodtox.database.queries import query_safety_assessment
+
     df = query_safety_assessment(sub_com_id)
     return df.to_json()
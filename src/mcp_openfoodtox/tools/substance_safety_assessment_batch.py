@@ -0,0 +1,28 @@
+def get_substance_safety_assessment_batch(sub_com_ids: list[int]):
+    """
+    Get safety assessments for many substances at once by SUB_COM_ID.
+
+    Use this instead of calling get_substance_safety_assessment once per substance, e.g.
+    after search_substance_batch has resolved the ingredients of a product label. The whole
+    list is answered with two database queries.
+
+    Args:
+        sub_com_ids (list[int]): SUB_COM_IDs of the substances (at most 500 per call).
+                                 Use search_substance_batch or search_substance to find them.
+
+    Returns:
+        Dictionary with:
+        - 'results': One entry per input ID, in input order, with:
+            - 'SUB_COM_ID': the input ID
+            - 'found': False if no substance has this SUB_COM_ID
+            - 'safety_assessment': list of safety assessment records with the same fields as
+              get_substance_safety_assessment (IS_MUTAGENIC, IS_GENOTOXIC, IS_CARCINOGENIC,
+              SUB_OP_CLASS, REMARKS_STUDY, TOXREF_ID, OP_ID, AUTHOR, TITLE, ADOPTIONDATE,
+              PUBLICATIONDATE), sorted chronologically by PUBLICATIONDATE
+        - 'not_found': list of the input IDs that match no substance
+
+    See get_substance_safety_assessment for the meaning of each field.
+    """
+    from src.mcp_openfoodtox.database.queries import query_safety_assessment_batch
+
+    return query_safety_assessment_batch(sub_com_ids)
@@ -1,3 +1,21 @@
-from .formatting import normalize_e_number
+from .formatting import (
+    classify_identifier,
+    is_valid_cas,
+    is_valid_ec_number,
+    normalize_e_number,
+    normalize_text,
+    page_to_json,
+    records_to_json,
+    registry_kind,
+)
 
-__all__ = ["normalize_e_number"]
+__all__ = [
+    "classify_identifier",
+    "is_valid_cas",
+    "is_valid_ec_number",
+    "normalize_e_number",
+    "normalize_text",
+    "page_to_json",
+    "records_to_json",
+    "registry_kind",
+]
@@ -1,4 +1,6 @@
+import json
 import re
+from typing import Iterable, Optional
 
 
 def normalize_e_number(query: str) -> str:
@@ -49,3 +51,163 @@ def normalize_e_number(query: str) -> str:
         return "E905"
     else:
         return f"E {number}"
+
+
+def normalize_text(value) -> str:
+    """
+    Normalize free text for case-insensitive matching: lowercase, trim and collapse whitespace.
+
+    Used both when building the *_NORM shadow columns (scripts/setup_db.py) and on query
+    parameters, so stored values and search terms are always normalized the same way.
+
+    Examples:
+        >>> normalize_text("  Food   Additives ")
+        'food additives'
+    """
+    return " ".join(str(value).split()).lower()
+
+
+# Identifier shapes recognised by classify_identifier (whole string, case-insensitive)
+E_NUMBER_PATTERN = re.compile(r"^E\s*-?\s*(\d{3,4})\s*[a-z]?\s*(\(?\s*(?:i{1,3}|iv|v)\s*\)?)?$", re.IGNORECASE)
+CAS_PATTERN = re.compile(r"^(?:CAS\s*(?:no\.?|number)?\s*:?\s*)?(\d{2,7})-(\d{2})-(\d)$", re.IGNORECASE)
+EC_NUMBER_PATTERN = re.compile(r"^(?:EC\s*(?:no\.?|number)?\s*:?\s*)?(\d{3})-(\d{3})-(\d)$", re.IGNORECASE)
+# FEMA, JECFA and Council of Europe numbers are plain integers, optionally prefixed
+NUMBER_PATTERN = re.compile(r"^(?:(FEMA|JECFA|CoE)\s*(?:no\.?|number)?\s*:?\s*)?(\d{1,6})$", re.IGNORECASE)
+# Identifier kinds of the numbered registries; their number ranges overlap, so each has its own kind
+REGISTRY_KINDS = ("fema", "jecfa", "coe")
+REGISTRY_TYPE_PATTERN = re.compile(r"\b(FEMA|JECFA|CoE|Council of Europe)\b", re.IGNORECASE)
+
+
+def is_valid_cas(cas_number: str) -> bool:
+    """
+    Validate a CAS Registry Number (e.g. "22839-47-0") by its check digit.
+
+    The check digit is the sum of the other digits, each multiplied by its position
+    counted from the right (starting at 1), modulo 10.
+
+    Examples:
+        >>> is_valid_cas("7732-18-5")
+        True
+        >>> is_valid_cas("7732-18-4")
+        False
+    """
+    match = re.fullmatch(r"(\d{2,7})-(\d{2})-(\d)", cas_number.strip())
+    if not match:
+        return False
+    digits = match.group(1) + match.group(2)
+    checksum = sum(position * int(digit) for position, digit in enumerate(reversed(digits), 1))
+    return checksum % 10 == int(match.group(3))
+
+
+def is_valid_ec_number(ec_number: str) -> bool:
+    """
+    Validate an EC (EINECS/ELINCS) number (e.g. "231-791-2") by its check digit.
+
+    The check digit is the sum of the first six digits, each multiplied by its position
+    (starting at 1), modulo 11.
+    """
+    match = re.fullmatch(r"(\d{3})-(\d{3})-(\d)", ec_number.strip())
+    if not match:
+        return False
+    digits = match.group(1) + match.group(2)
+    checksum = sum(position * int(digit) for position, digit in enumerate(digits, 1))
+    return checksum % 11 == int(match.group(3))
+
+
+def classify_identifier(value) -> Optional[tuple[str, str]]:
+    """
+    Recognise identifier-shaped text and return its (kind, normalized key).
+
+    Kinds and keys:
+    - "e_number": "E460" for "E 460", "e460i", "E 460(ii)" (suffixes stripped)
+    - "cas": "22839-47-0" (leading zeros stripped, check digit must be valid)
+    - "ec_number": "231-791-2" (check digit must be valid)
+    - "fema", "jecfa", "coe": "2698" for a registry-prefixed number ("FEMA 2698", "JECFA no. 62")
+    - "number": "2698" for a bare number, which may belong to any of those registries
+
+    The same function builds the identifier lookup table (scripts/setup_db.py) and
+    classifies search queries, so both sides always produce the same keys.
+
+    Returns:
+        (kind, key) tuple, or None if the text is not identifier-shaped or fails validation
+
+    Examples:
+        >>> classify_identifier("E 460(i)")
+        ('e_number', 'E460')
+        >>> classify_identifier("CAS 22839-47-0")
+        ('cas', '22839-47-0')
+        >>> classify_identifier("aspartame") is None
+        True
+    """
+    text = " ".join(str(value).split())
+
+    match = E_NUMBER_PATTERN.match(text)
+    if match:
+        return "e_number", f"E{int(match.group(1))}"
+
+    match = CAS_PATTERN.match(text)
+    if match:
+        cas_number = f"{int(match.group(1))}-{match.group(2)}-{match.group(3)}"
+        return ("cas", cas_number) if is_valid_cas(cas_number) else None
+
+    match = EC_NUMBER_PATTERN.match(text)
+    if match:
+        ec_number = "-".join(match.groups())
+        return ("ec_number", ec_number) if is_valid_ec_number(ec_number) else None
+
+    match = NUMBER_PATTERN.match(text)
+    if match:
+        registry = match.group(1)
+        return (registry.lower() if registry else "number"), str(int(match.group(2)))
+
+    return None
+
+
+def registry_kind(synonym_type) -> Optional[str]:
+    """
+    Identifier kind ("fema", "jecfa" or "coe") of the registry named by a synonym's
+    SYNONYM_TYPE, or None for other synonym types.
+
+    Examples:
+        >>> registry_kind("FEMA number")
+        'fema'
+        >>> registry_kind("Name") is None
+        True
+    """
+    match = REGISTRY_TYPE_PATTERN.search(str(synonym_type or ""))
+    if not match:
+        return None
+    registry = match.group(1).lower()
+    return "coe" if registry == "council of europe" else registry
+
+
+def page_to_json(result: dict) -> str:
+    """
+    Serialize a {'results': DataFrame, 'total_count': int} query result for an MCP tool.
+
+    The DataFrame keeps its usual DataFrame.to_json() layout under "results"; "total_count"
+    tells the caller how many substances matched before the limit was applied. A
+    'next_cursor' entry (paginated queries) is passed through, null on the last page.
+    """
+    page = {"results": json.loads(result["results"].to_json()), "total_count": int(result["total_count"])}
+    if "next_cursor" in result:
+        page["next_cursor"] = result["next_cursor"]
+    return json.dumps(page)
+
+
+# Compact JSON encoder for tool output (no whitespace, non-ASCII text kept as-is)
+_RECORD_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def records_to_json(records: Iterable[dict]) -> str:
+    """
+    Serialize rows as a compact record-oriented JSON array.
+
+    Accepts any iterable of dicts (a list, or a sqlite3 cursor with a dict row factory);
+    rows are encoded one at a time, so a cursor is streamed without building a list of rows.
+
+    Example:
+        >>> records_to_json([{"OP_ID": 1, "TITLE": "Scientific Opinion", "DOI": None}])
+        '[{"OP_ID":1,"TITLE":"Scientific Opinion","DOI":null}]'
+    """
+    return "[" + ",".join(map(_RECORD_ENCODER.encode, records)) + "]"
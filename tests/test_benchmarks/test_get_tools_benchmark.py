@@ -0,0 +1,76 @@
+import pytest
+import logging
+import time
+import tracemalloc
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.queries import query_by_id, query_json_by_id
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+# Tables served by the get_* tools and their ID columns
+GET_TOOL_TABLES = {
+    "opinion": "OP_ID",
+    "genotox": "GENOTOX_ID",
+    "chem_assess": "HAZARD_ID",
+    "endpoint_study": "TOX_ID",
+}
+
+REPEATS = 50
+
+# Relative timings are noisy on loaded machines: only run with `make bench`
+pytestmark = pytest.mark.benchmark
+
+
+def _dataframe_path(id_value, table_name) -> str:
+    """Previous get_* tool path: DataFrame, then column-major to_json()."""
+    return query_by_id(id_value, table_name).to_json()
+
+
+def _records_path(id_value, table_name) -> str:
+    """Current get_* tool path: cursor rows streamed into a record-oriented JSON array."""
+    return query_json_by_id(id_value, table_name)
+
+
+def _measure(path, id_value, table_name) -> tuple[float, int]:
+    """Return (mean seconds per call, peak bytes allocated by one call)."""
+    path(id_value, table_name)  # warm the connection and statement cache
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        path(id_value, table_name)
+    mean_seconds = (time.perf_counter() - start) / REPEATS
+
+    tracemalloc.start()
+    path(id_value, table_name)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mean_seconds, peak_bytes
+
+
+@pytest.mark.parametrize("table_name", list(GET_TOOL_TABLES))
+def test_get_tools_records_path_benchmark(table_name):
+    """Compare latency and peak allocation of the DataFrame and record paths.
+    run with:
+    `uv run pytest tests/test_benchmarks/test_get_tools_benchmark.py -v -s`
+    """
+    id_column = GET_TOOL_TABLES[table_name]
+    with get_connection() as db_connection:
+        id_value = [
+            row[0]
+            for row in db_connection.execute(f"SELECT {id_column} FROM {table_name} LIMIT 50")
+        ]
+
+    dataframe_seconds, dataframe_peak = _measure(_dataframe_path, id_value, table_name)
+    records_seconds, records_peak = _measure(_records_path, id_value, table_name)
+
+    logging.info(
+        f"{table_name} ({len(id_value)} IDs): "
+        f"DataFrame {dataframe_seconds * 1000:.2f} ms / {dataframe_peak / 1024:.0f} KiB peak, "
+        f"records {records_seconds * 1000:.2f} ms / {records_peak / 1024:.0f} KiB peak"
+    )
+    assert records_seconds < dataframe_seconds
+    assert records_peak < dataframe_peak
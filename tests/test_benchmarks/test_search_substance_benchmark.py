@@ -0,0 +1,88 @@
+import pytest
+import logging
+import time
+import numpy as np
+import pandas as pd
+from src.mcp_openfoodtox.database.queries import _aggregate_studies, query_search_substance
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+# Broad terms match thousands of substances and used to hit the O(components x studies) path
+BROAD_TERMS = ["acid", "extract", "oil", "sodium"]
+
+# Generous wall-clock budgets (seconds); the old per-component loop took far longer at these sizes
+SEARCH_BUDGET_SECONDS = 5.0
+AGGREGATION_BUDGET_SECONDS = 2.0
+
+
+def _synthetic_frames(n_components: int, n_studies: int):
+    """Build component/study frames shaped like the query_search_substance intermediate results."""
+    rng = np.random.default_rng(42)
+    components_df = pd.DataFrame(
+        {
+            "SUB_COM_ID": np.arange(1, n_components + 1),
+            "COM_NAME": [f"substance {i}" for i in range(1, n_components + 1)],
+            "COM_TYPE": "single",
+            "MOLECULARFORMULA": None,
+            "SUB_DESCRIPTION": "synthetic",
+        }
+    )
+
+    def sparse_ids():
+        ids = rng.integers(1, 50_000, n_studies).astype(float)
+        ids[rng.random(n_studies) < 0.6] = np.nan
+        return ids
+
+    studies_df = pd.DataFrame(
+        {
+            "SUB_COM_ID": rng.integers(1, n_components + 1, n_studies),
+            "SUB_OP_CLASS": rng.choice(["Food additives", "Pesticides", "Flavourings"], n_studies),
+            "REMARKS_STUDY": rng.choice(["chronic study", "re-evaluation", None], n_studies),
+            "GENOTOX_ID": sparse_ids(),
+            "TOX_ID": sparse_ids(),
+            "HAZARD_ID": sparse_ids(),
+            "OP_ID": rng.integers(1, 2_500, n_studies).astype(float),
+        }
+    )
+    return components_df, studies_df
+
+
+def test_aggregate_studies_scales_linearly():
+    """Aggregating a broad result set must be a single grouping pass, not components x studies.
+    run with:
+    `uv run pytest tests/test_benchmarks/test_search_substance_benchmark.py -v -s`
+    """
+    components_df, studies_df = _synthetic_frames(n_components=8_000, n_studies=55_000)
+
+    start = time.perf_counter()
+    result = _aggregate_studies(components_df, studies_df)
+    elapsed = time.perf_counter() - start
+
+    logging.info(
+        f"Aggregated {len(studies_df)} studies into {len(result)} substances in {elapsed * 1000:.1f} ms"
+    )
+    assert len(result) == len(components_df)
+    assert elapsed < AGGREGATION_BUDGET_SECONDS
+
+    # Spot-check one substance against a direct filter of the studies
+    entry = result[0]
+    studies = studies_df[studies_df["SUB_COM_ID"] == entry["SUB_COM_ID"]]
+    expected_op_ids = studies["OP_ID"].dropna().unique().tolist()
+    assert entry["OP_ID"] == (expected_op_ids or None)
+
+
+@pytest.mark.parametrize("search_term", BROAD_TERMS)
+def test_search_substance_broad_term_benchmark(search_term):
+    """Time query_search_substance for broad terms against the real database."""
+    start = time.perf_counter()
+    # limit=None hydrates every match, the worst case for the aggregation step
+    search_result = query_search_substance(search_term, limit=None)
+    elapsed = time.perf_counter() - start
+
+    count = len(search_result["results"]) if search_result else 0
+    logging.info(f"'{search_term}': {count} substances in {elapsed * 1000:.1f} ms")
+    assert elapsed < SEARCH_BUDGET_SECONDS
@@ -0,0 +1,51 @@
+import logging
+import sys
+import time
+from pathlib import Path
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Generous wall-clock budgets (seconds) measured from process spawn
+INITIALIZE_BUDGET_SECONDS = 5.0
+FIRST_TOOL_BUDGET_SECONDS = 10.0
+
+
+async def _time_startup() -> tuple[float, float]:
+    """Spawn the stdio server and return (seconds to initialize result, seconds to first tool result)."""
+    server = StdioServerParameters(command=sys.executable, args=["main.py"], cwd=PROJECT_ROOT)
+
+    start = time.perf_counter()
+    async with stdio_client(server) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            initialize_seconds = time.perf_counter() - start
+
+            result = await session.call_tool("get_opinions", {"op_id": 1})
+            first_tool_seconds = time.perf_counter() - start
+            assert not result.isError
+    return initialize_seconds, first_tool_seconds
+
+
+def test_server_startup_benchmark():
+    """Time-to-first-initialize-response and time-to-first-tool-result for `python main.py`.
+    run with:
+    `uv run pytest tests/test_benchmarks/test_startup_benchmark.py -v -s`
+    """
+    initialize_seconds, first_tool_seconds = anyio.run(_time_startup)
+
+    logging.info(
+        f"initialize: {initialize_seconds * 1000:.0f} ms, "
+        f"first tool result: {first_tool_seconds * 1000:.0f} ms (from process spawn)"
+    )
+    assert initialize_seconds < INITIALIZE_BUDGET_SECONDS
+    assert first_tool_seconds < FIRST_TOOL_BUDGET_SECONDS
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.queries import (
+    MAX_BATCH_SIZE,
+    query_safety_assessment,
+    query_safety_assessment_batch,
+    query_search_substance,
+    query_search_substance_batch,
+)
+
+SEARCH_TERMS = ["aspartame", "E 951", "E951", "Chloride", "chloride ester 6", "xyzzy-not-a-substance", "aspartame"]
+
+
+def _count_statements(fn, *args, **kwargs) -> int:
+    """
+    Number of SQL statements fn runs on this thread's pooled connection.
+
+    Statements SQLite runs internally (FTS5 shadow table reads, prefixed with "--"; FTS
+    config and PRAGMA reads) are not counted.
+    """
+    statements = []
+    with get_connection() as db_connection:
+        db_connection.set_trace_callback(statements.append)
+        try:
+            fn(*args, **kwargs)
+        finally:
+            db_connection.set_trace_callback(None)
+    return sum(
+        1
+        for statement in statements
+        if not statement.startswith(("--", "PRAGMA")) and "'main'." not in statement
+    )
+
+
+@pytest.mark.parametrize("limit", [3, None])
+def test_search_batch_matches_single_searches(limit):
+    """Every batch entry has the same matches, in the same order, as search_substance.
+    run with:
+    `uv run pytest tests/test_database/test_batch_queries.py -v -s`
+    """
+    batch = query_search_substance_batch(SEARCH_TERMS, limit=limit)
+
+    assert [entry["input"] for entry in batch["results"]] == SEARCH_TERMS
+    for entry in batch["results"]:
+        single = query_search_substance(entry["input"], limit=limit)
+        if single is None:
+            assert not entry["resolved"]
+            assert entry["results"] == [] and entry["total_count"] == 0
+        else:
+            assert entry["resolved"]
+            assert json.dumps(entry["results"]) == json.dumps(single["results"])
+            assert entry["total_count"] == single["total_count"]
+    assert batch["unresolved"] == ["xyzzy-not-a-substance"]
+
+
+def test_search_batch_runs_constant_number_of_queries():
+    # Both batches go through every step (identifier, synonym and component search)
+    small = _count_statements(query_search_substance_batch, ["E 951", "aspartame", "xyzzy-not-a-substance"])
+    large = _count_statements(query_search_substance_batch, SEARCH_TERMS * 20 + [f"ester {n}" for n in range(50)])
+    assert large == small
+
+
+def test_safety_assessment_batch_matches_single_lookups():
+    with get_connection() as db_connection:
+        sub_com_ids = [row[0] for row in db_connection.execute("SELECT SUB_COM_ID FROM component LIMIT 5")]
+    sub_com_ids += [-1, sub_com_ids[0]]
+
+    batch = query_safety_assessment_batch(sub_com_ids)
+
+    assert [entry["SUB_COM_ID"] for entry in batch["results"]] == sub_com_ids
+    assert batch["not_found"] == [-1]
+    for entry in batch["results"]:
+        single = query_safety_assessment(entry["SUB_COM_ID"])
+        single_records = json.loads(single.to_json(orient="records"))
+        assert entry["safety_assessment"] == single_records
+
+
+def test_safety_assessment_batch_runs_constant_number_of_queries():
+    assert _count_statements(query_safety_assessment_batch, [1, 2]) == _count_statements(
+        query_safety_assessment_batch, list(range(1, 400))
+    )
+
+
+def test_batch_size_limit():
+    with pytest.raises(ValueError, match="at most"):
+        query_search_substance_batch(["aspartame"] * (MAX_BATCH_SIZE + 1))
+    with pytest.raises(TypeError):
+        query_safety_assessment_batch(42)
+    with pytest.raises(ValueError, match="limit"):
+        query_search_substance_batch(["aspartame"], limit=0)
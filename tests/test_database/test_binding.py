@@ -0,0 +1,24 @@
+import json
+from src.mcp_openfoodtox.database.binding import ID_LIST_SUBQUERY, bind_ids
+from src.mcp_openfoodtox.database.connection import get_connection
+
+
+def test_bind_ids_normalizes_values():
+    """IDs are encoded as JSON integers; missing values are dropped."""
+    assert json.loads(bind_ids([3, 1.0, None, float("nan")])) == [3, 1]
+    assert bind_ids([]) == "[]"
+
+
+def test_id_list_subquery_uses_one_statement():
+    """Any number of IDs goes through the same SQL text and a single parameter."""
+    query = f"SELECT COUNT(*) FROM component WHERE SUB_COM_ID IN ({ID_LIST_SUBQUERY})"
+
+    with get_connection() as db_connection:
+        few = db_connection.execute(query, [bind_ids([1, 2])]).fetchone()[0]
+        many = db_connection.execute(query, [bind_ids(range(1, 100_001))]).fetchone()[0]
+        total = db_connection.execute(
+            "SELECT COUNT(*) FROM component WHERE SUB_COM_ID BETWEEN 1 AND 100000"
+        ).fetchone()[0]
+
+    assert few <= 2
+    assert many == total
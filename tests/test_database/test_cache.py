@@ -0,0 +1,287 @@
+import asyncio
+import inspect
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.mcp_openfoodtox.database import cache as cache_module
+from src.mcp_openfoodtox.database.cache import DiskCache, ResultCache, cache_tool
+from src.mcp_openfoodtox.database.version import DatasetVersion
+
+
+def search(description_search, limit: int = 10):
+    """Signature stand-in for a tool."""
+
+
+SIGNATURE = inspect.signature(search)
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_path = tmp_path / "openfoodtox.db"
+    db_path.write_bytes(b"version 1")
+    return db_path
+
+
+def test_key_normalizes_arguments(db_file):
+    """Positional, keyword and default spellings of one call share a key."""
+    cache = ResultCache(dataset_version=DatasetVersion(db_file))
+
+    keys = {
+        cache.key("search", SIGNATURE, ("aspartame",), {}),
+        cache.key("search", SIGNATURE, (), {"description_search": "aspartame", "limit": 10}),
+        cache.key("search", SIGNATURE, ("aspartame", 10), {}),
+    }
+    assert len(keys) == 1
+    assert cache.key("search", SIGNATURE, ("aspartame", 5), {}) not in keys
+
+
+def test_lru_eviction_within_budget(db_file):
+    """Least recently used entries are evicted once the memory budget is exceeded."""
+    value = "x" * 1000
+    cache = ResultCache(max_bytes=2500, dataset_version=DatasetVersion(db_file))
+    keys = [cache.key("search", SIGNATURE, (term,), {}) for term in ["a", "b", "c"]]
+
+    cache.put(keys[0], value)
+    cache.put(keys[1], value)
+    assert cache.get(keys[0])[0]  # "a" is now most recently used
+    cache.put(keys[2], value)
+
+    assert cache.get(keys[0]) == (True, value)
+    assert cache.get(keys[1]) == (False, None)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["bytes"] <= 2500
+
+
+def test_ttl_expiry(db_file):
+    cache = ResultCache(ttl_seconds=0.05, dataset_version=DatasetVersion(db_file))
+    key = cache.key("search", SIGNATURE, ("a",), {})
+    cache.put(key, "result")
+
+    assert cache.get(key) == (True, "result")
+    time.sleep(0.1)
+    assert cache.get(key) == (False, None)
+
+
+def test_invalidated_when_database_changes(db_file):
+    """Rewriting the database file changes the dataset version and drops cached results."""
+    cache = ResultCache(dataset_version=DatasetVersion(db_file))
+    key = cache.key("search", SIGNATURE, ("a",), {})
+    cache.put(key, "old result")
+
+    db_file.write_bytes(b"version 2, rebuilt")
+    # The file is only re-checked by refresh() (off the event loop, see cache_tool)
+    assert cache.key("search", SIGNATURE, ("a",), {}) == key
+    cache.dataset_version.refresh()
+    new_key = cache.key("search", SIGNATURE, ("a",), {})
+
+    assert new_key != key
+    assert cache.get(new_key) == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_cache_survives_restart(db_file, tmp_path):
+    """A new cache on the same sidecar file (a restarted server) answers from disk."""
+    cache_path = tmp_path / "openfoodtox.cache.db"
+    cache = ResultCache(dataset_version=DatasetVersion(db_file), disk=DiskCache(cache_path, 1 << 20))
+    cache.put(cache.key("search", SIGNATURE, ("a",), {}), '[{"SUB_COM_ID": 1}]')
+    cache.disk.close()
+
+    restarted = ResultCache(dataset_version=DatasetVersion(db_file), disk=DiskCache(cache_path, 1 << 20))
+    key = restarted.key("search", SIGNATURE, ("a",), {})
+    assert restarted.get(key) == (True, '[{"SUB_COM_ID": 1}]')
+    assert restarted.get(key) == (True, '[{"SUB_COM_ID": 1}]')
+    stats = restarted.stats()
+    assert stats["disk_hits"] == 1 and stats["hits"] == 1  # second read served from memory
+    restarted.disk.close()
+
+
+def test_disk_cache_size_eviction(tmp_path):
+    """Least recently read entries are deleted once the file's entries exceed the budget."""
+    disk = DiskCache(tmp_path / "cache.db", max_bytes=2500)
+    value = "x" * 1000
+    disk.put(("v1", "search", "a"), value)
+    time.sleep(0.01)
+    disk.put(("v1", "search", "b"), value)
+    time.sleep(0.01)
+    assert disk.get(("v1", "search", "a"))[0]
+    time.sleep(0.01)
+    disk.put(("v1", "search", "c"), value)
+
+    assert disk.get(("v1", "search", "a")) == (True, value)
+    assert disk.get(("v1", "search", "b")) == (False, None)
+    assert disk.stats()["bytes"] <= 2500
+    disk.close()
+
+
+def test_disk_cache_purges_old_dataset_versions(tmp_path):
+    """Entries of other dataset versions are deleted when the file is opened."""
+    disk = DiskCache(tmp_path / "cache.db", max_bytes=1 << 20)
+    disk.put(("v1", "search", "a"), "old")
+    disk.put(("v2", "search", "a"), "new")
+    assert disk.stats()["entries"] == 2
+    disk.close()
+
+    reopened = DiskCache(tmp_path / "cache.db", max_bytes=1 << 20, version="v2")
+    assert reopened.stats()["entries"] == 1
+    assert reopened.get(("v2", "search", "a")) == (True, "new")
+    reopened.close()
+
+
+def test_disk_cache_purged_when_dataset_changes(db_file, tmp_path):
+    cache = ResultCache(dataset_version=DatasetVersion(db_file), disk=DiskCache(tmp_path / "cache.db", 1 << 20))
+    cache.put(cache.key("search", SIGNATURE, ("a",), {}), "old result")
+
+    db_file.write_bytes(b"version 2, rebuilt")
+    cache.refresh_dataset_version()
+
+    assert cache.disk.stats()["entries"] == 0
+    cache.disk.close()
+
+
+def test_disk_cache_hits_do_not_write(tmp_path):
+    """Read times are written in batches, not on every hit."""
+    disk = DiskCache(tmp_path / "cache.db", max_bytes=1 << 20)
+    disk.put(("v1", "search", "a"), "value")
+    statements = []
+    disk._conn.set_trace_callback(statements.append)
+    disk._read_conn.set_trace_callback(statements.append)
+
+    for _ in range(10):
+        assert disk.get(("v1", "search", "a")) == (True, "value")
+
+    assert not any(statement.startswith(("UPDATE", "BEGIN")) for statement in statements)
+    disk.close()
+
+
+def test_disk_cache_shared_between_processes(tmp_path):
+    """Several caches (one per server process) read and write the same file concurrently."""
+    cache_path = tmp_path / "cache.db"
+    caches = [DiskCache(cache_path, max_bytes=1 << 20) for _ in range(4)]
+    errors = []
+
+    def worker(disk, worker_id):
+        try:
+            for i in range(25):
+                disk.put(("v1", "search", f"{worker_id}-{i}"), [worker_id, i])
+                assert disk.get(("v1", "search", f"{worker_id}-{i}")) == (True, [worker_id, i])
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(disk, n)) for n, disk in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert caches[0].stats()["entries"] == 100
+    for disk in caches:
+        disk.close()
+
+
+def test_cache_tool_skips_repeated_calls(db_file, monkeypatch):
+    """Repeated calls are answered from the cache; failures are not cached."""
+    monkeypatch.setattr(cache_module, "_cache", ResultCache(dataset_version=DatasetVersion(db_file)))
+    calls = []
+
+    async def lookup(item_id: int):
+        calls.append(item_id)
+        if item_id < 0:
+            raise ValueError("bad id")
+        return f"[{item_id}]"
+
+    cached_lookup = cache_tool(lookup)
+
+    async def exercise():
+        assert await cached_lookup(1) == "[1]"
+        assert await cached_lookup(item_id=1) == "[1]"
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await cached_lookup(-1)
+
+    asyncio.run(exercise())
+
+    assert calls == [1, -1, -1]
+    assert cached_lookup.__name__ == "lookup"
+    assert cache_module.cache_stats()["hits"] == 1
+
+
+def test_hits_return_independent_copies(db_file):
+    """Mutating a result returned from the cache does not change what later hits return."""
+    cache = ResultCache(dataset_version=DatasetVersion(db_file))
+    key = cache.key("search", SIGNATURE, ("a",), {})
+    cache.put(key, {"results": [1, 2]})
+
+    _, first = cache.get(key)
+    first["results"].append(3)
+    assert cache.get(key) == (True, {"results": [1, 2]})
+
+
+def test_cache_tool_checks_dataset_version_off_the_event_loop(db_file, monkeypatch):
+    """Calls use the last known version; a changed file is picked up by a background refresh."""
+    dataset_version = DatasetVersion(db_file)
+    monkeypatch.setattr(cache_module, "_cache", ResultCache(dataset_version=dataset_version))
+    old_version = dataset_version.refresh()  # as configure_cache() does at startup
+    refresh_threads = []
+    refresh = dataset_version.refresh
+
+    def recording_refresh():
+        refresh_threads.append(threading.current_thread())
+        return refresh()
+
+    monkeypatch.setattr(dataset_version, "refresh", recording_refresh)
+
+    async def lookup(item_id: int):
+        return f"[{item_id}]"
+
+    cached_lookup = cache_tool(lookup)
+
+    async def exercise():
+        await cached_lookup(1)
+        db_file.write_bytes(b"version 2, rebuilt")
+        monkeypatch.setattr(dataset_version, "_checked_at", 0.0)
+        await cached_lookup(1)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(exercise())
+
+    assert refresh_threads and threading.main_thread() not in refresh_threads
+    assert dataset_version.current() != old_version
+
+
+def test_cache_tool_does_not_block_on_disk_cache_lock(db_file, tmp_path, monkeypatch):
+    """Another process holding the sidecar write lock does not stall the event loop."""
+    monkeypatch.setattr(cache_module, "DISK_CACHE_BUSY_TIMEOUT", 1.0)
+    cache_path = tmp_path / "cache.db"
+    cache = ResultCache(dataset_version=DatasetVersion(db_file), disk=DiskCache(cache_path, 1 << 20))
+    monkeypatch.setattr(cache_module, "_cache", cache)
+
+    async def lookup(item_id: int):
+        return f"[{item_id}]"
+
+    cached_lookup = cache_tool(lookup)
+    other_process = sqlite3.connect(cache_path, isolation_level=None)
+    other_process.execute("BEGIN IMMEDIATE")
+
+    async def exercise():
+        start = time.monotonic()
+        assert await cached_lookup(1) == "[1]"
+        assert await cached_lookup(2) == "[2]"
+        assert await cached_lookup(1) == "[1]"  # memory hit while the disk write waits
+        elapsed = time.monotonic() - start
+        other_process.execute("ROLLBACK")
+        return elapsed
+
+    try:
+        elapsed = asyncio.run(exercise())  # waits for the background disk writes
+    finally:
+        other_process.close()
+
+    assert elapsed < 0.5
+    assert cache.disk.stats()["entries"] == 2
+    cache.disk.close()
@@ -0,0 +1,157 @@
+import pytest
+import sqlite3
+import threading
+from src.mcp_openfoodtox.database.connection import (
+    close_all_connections,
+    configure_connections,
+    get_connection,
+    verify_snapshot,
+)
+
+
+def test_connection_reused_within_thread():
+    """The same thread gets the same pooled connection back."""
+    with get_connection() as first:
+        pass
+    with get_connection() as second:
+        pass
+    assert first is second
+
+
+def test_connection_per_thread():
+    """Each thread gets its own connection."""
+    connections = []
+
+    def worker():
+        connections.append(get_connection())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(connection) for connection in connections}) == 3
+    assert get_connection() not in connections
+
+
+def test_connection_is_read_only():
+    """Pooled connections reject writes (PRAGMA query_only)."""
+    with pytest.raises(sqlite3.OperationalError):
+        get_connection().execute("CREATE TABLE should_not_exist (x INTEGER)")
+
+
+def test_close_all_connections():
+    """Closing the pool closes open connections; the next call reconnects."""
+    connection = get_connection()
+    close_all_connections()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
+
+    reopened = get_connection()
+    assert reopened is not connection
+    assert reopened.execute("SELECT 1").fetchone() == (1,)
+
+
+def test_close_all_leaves_live_worker_connection_open():
+    """A live thread's connection is retired, not closed under it; the thread closes it later."""
+    opened, reopened = [], []
+    started, closed = threading.Event(), threading.Event()
+
+    def worker():
+        opened.append(get_connection())
+        started.set()
+        closed.wait()
+        # Still usable: close_all() ran on another thread while this one held it
+        opened[0].execute("SELECT 1")
+        reopened.append(get_connection())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    try:
+        started.wait()
+        close_all_connections()
+    finally:
+        closed.set()
+    thread.join()
+
+    assert reopened[0] is not opened[0]
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def _make_db(path, vacuum: bool):
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE t (x INTEGER)")
+    connection.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(5000)])
+    connection.commit()
+    connection.execute("DELETE FROM t")
+    connection.commit()
+    if vacuum:
+        connection.execute("VACUUM")
+    connection.close()
+
+
+def test_verify_snapshot_accepts_vacuumed_db(tmp_path):
+    """A vacuumed database in rollback-journal mode is a valid snapshot."""
+    db_path = tmp_path / "snapshot.db"
+    _make_db(db_path, vacuum=True)
+    verify_snapshot(db_path)
+
+
+def test_verify_snapshot_rejects_unvacuumed_db(tmp_path):
+    """Free pages left over from writes mean the file was not finalized."""
+    db_path = tmp_path / "dirty.db"
+    _make_db(db_path, vacuum=False)
+    with pytest.raises(RuntimeError, match="not vacuumed"):
+        verify_snapshot(db_path)
+
+
+def test_verify_snapshot_rejects_hot_journal(tmp_path):
+    """A journal file next to the database means a write is in progress."""
+    db_path = tmp_path / "busy.db"
+    _make_db(db_path, vacuum=True)
+    (tmp_path / "busy.db-journal").write_bytes(b"")
+    with pytest.raises(RuntimeError, match="journal"):
+        verify_snapshot(db_path)
+
+
+def test_immutable_mode():
+    """Immutable mode serves queries read-only from the finalized database."""
+    try:
+        configure_connections("immutable")
+        connection = get_connection()
+        assert connection.execute("SELECT COUNT(*) FROM component").fetchone()[0] > 0
+        with pytest.raises(sqlite3.OperationalError):
+            connection.execute("CREATE TABLE should_not_exist (x INTEGER)")
+    finally:
+        configure_connections("default")
+
+
+def test_configure_connections_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        configure_connections("bogus")
+
+
+def test_memory_mode():
+    """Memory mode serves queries from an in-memory copy shared by all threads."""
+    try:
+        configure_connections("memory")
+        connection = get_connection()
+        # The main database of an in-memory connection has no file name
+        assert connection.execute("PRAGMA database_list").fetchone()[2] == ""
+        count = connection.execute("SELECT COUNT(*) FROM component").fetchone()[0]
+        assert count > 0
+
+        counts = []
+        thread = threading.Thread(
+            target=lambda: counts.append(
+                get_connection().execute("SELECT COUNT(*) FROM component").fetchone()[0]
+            )
+        )
+        thread.start()
+        thread.join()
+        assert counts == [count]
+    finally:
+        configure_connections("default")
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.dossier import DOSSIER_SECTIONS, build_dossiers, query_dossier
+from src.mcp_openfoodtox.database.queries import query_records_by_id, query_safety_assessment
+
+
+def _substance_with_studies() -> int:
+    with get_connection() as db_connection:
+        return db_connection.execute(
+            """
+            SELECT SUB_COM_ID FROM study
+            GROUP BY SUB_COM_ID
+            HAVING COUNT(HAZARD_ID) > 0 AND COUNT(TOX_ID) > 0 AND COUNT(GENOTOX_ID) > 0
+            ORDER BY SUB_COM_ID LIMIT 1
+            """
+        ).fetchone()[0]
+
+
+def test_dossier_matches_base_tables():
+    """The stored dossier equals the profile assembled from the base tables.
+    run with:
+    `uv run pytest tests/test_database/test_dossier.py -v -s`
+    """
+    sub_com_id = _substance_with_studies()
+    dossier = json.loads(query_dossier(sub_com_id))
+
+    with get_connection() as db_connection:
+        rebuilt = build_dossiers(db_connection, sub_com_id)[sub_com_id]
+    assert dossier == json.loads(json.dumps(rebuilt))
+    assert list(dossier) == ["SUB_COM_ID", *DOSSIER_SECTIONS]
+    assert dossier["component"]["SUB_COM_ID"] == sub_com_id
+
+
+def test_dossier_sections_match_get_tools():
+    """Sections hold the same records the individual get_* tools return."""
+    sub_com_id = _substance_with_studies()
+    dossier = json.loads(query_dossier(sub_com_id))
+
+    safety = query_safety_assessment(sub_com_id)
+    assert [record["OP_ID"] for record in dossier["safety_assessment"]] == safety["OP_ID"].tolist()
+
+    hazard_ids = sorted({record["HAZARD_ID"] for record in dossier["risk_assessments"]})
+    expected = query_records_by_id(hazard_ids, "chem_assess")
+    strip_norm = lambda record: {k: v for k, v in record.items() if not k.endswith("_NORM")}
+    assert sorted(map(json.dumps, dossier["risk_assessments"])) == sorted(
+        json.dumps(strip_norm(record)) for record in expected
+    )
+    assert dossier["toxicity_endpoints"] and dossier["genotox"]
+
+
+def test_dossier_section_filter():
+    sub_com_id = _substance_with_studies()
+    dossier = json.loads(query_dossier(sub_com_id, sections=["risk_assessments", "component"]))
+
+    assert list(dossier) == ["SUB_COM_ID", "risk_assessments", "component"]
+    assert dossier["risk_assessments"]
+
+
+def test_dossier_unknown_section():
+    with pytest.raises(ValueError, match="Valid sections"):
+        query_dossier(_substance_with_studies(), sections=["toxicity"])
+
+
+def test_dossier_missing_substance():
+    assert query_dossier(-1) is None
@@ -0,0 +1,158 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database import facets
+from src.mcp_openfoodtox.database.facets import (
+    CUBE_DIMENSIONS,
+    CUBE_FACTS_QUERY,
+    FacetIndex,
+    get_facet_index,
+    query_facet_counts,
+)
+from src.mcp_openfoodtox.database.multi_sub_queries import (
+    _query_substance_page,
+    query_substances_by_class_and_safety,
+)
+from src.mcp_openfoodtox.utils.formatting import normalize_text
+
+SUB_CLASSES = [None, "Food additives", "additives", "PESTICIDES", "no such class"]
+FLAGS = [None, "Positive", "Negative", "Ambiguous"]
+
+
+def _sql_filter(sub_class, is_mutagenic, is_genotoxic, is_carcinogenic) -> tuple[str, list]:
+    """The WHERE clause the SQL path of query_substances_by_class_and_safety() uses."""
+    conditions, params = ["1=1"], []
+    if sub_class is not None:
+        conditions.append("s.SUB_OP_CLASS_NORM LIKE ?")
+        params.append(f"%{normalize_text(sub_class)}%")
+    for column, value in [
+        ("IS_MUTAGENIC", is_mutagenic),
+        ("IS_GENOTOXIC", is_genotoxic),
+        ("IS_CARCINOGENIC", is_carcinogenic),
+    ]:
+        if value is not None:
+            conditions.append(f"s.{column} = ?")
+            params.append(value)
+    return " AND ".join(conditions), params
+
+
+@pytest.mark.parametrize("sub_class", SUB_CLASSES)
+def test_facet_index_matches_sql(sub_class):
+    """Bitmap intersections give exactly the substances the STUDY scan finds.
+    run with:
+    `uv run pytest tests/test_database/test_facets.py -v -s`
+    """
+    index = get_facet_index()
+    with get_connection() as db_connection:
+        for flags in itertools.product(FLAGS, repeat=3):
+            where_clause, params = _sql_filter(sub_class, *flags)
+            expected = [
+                row[0]
+                for row in db_connection.execute(
+                    f"""
+                    SELECT DISTINCT s.SUB_COM_ID FROM study s
+                    WHERE {where_clause} AND s.SUB_COM_ID IN (SELECT SUB_COM_ID FROM component)
+                    ORDER BY s.SUB_COM_ID
+                    """,
+                    params,
+                )
+            ]
+            assert index.match(sub_class, *flags).tolist() == expected, (sub_class, flags)
+
+
+def test_conditions_apply_to_the_same_study():
+    """A substance matches only if one of its studies satisfies every filter."""
+    db_connection = sqlite3.connect(":memory:")
+    db_connection.executescript(
+        """
+        CREATE TABLE component (SUB_COM_ID INTEGER PRIMARY KEY);
+        CREATE TABLE study (
+            SUB_COM_ID INTEGER, SUB_OP_CLASS_NORM TEXT, IS_MUTAGENIC TEXT, IS_GENOTOXIC TEXT, IS_CARCINOGENIC TEXT
+        );
+        INSERT INTO component VALUES (1);
+        INSERT INTO study (SUB_COM_ID, SUB_OP_CLASS_NORM, IS_GENOTOXIC)
+            VALUES (1, 'food additives', 'Negative'), (1, 'pesticides', 'Positive');
+        """
+    )
+    index = FacetIndex.build(db_connection)
+    db_connection.close()
+
+    assert index.match(sub_class="food additives", is_genotoxic="Negative").tolist() == [1]
+    assert index.match(sub_class="food additives", is_genotoxic="Positive").tolist() == []
+
+
+def test_class_and_safety_query_uses_same_page_as_sql():
+    """The facet path returns the same page and total count as the single-scan SQL path."""
+    filters = dict(sub_class="food additives", is_genotoxic="Negative")
+    result = query_substances_by_class_and_safety(**filters, limit=5)
+
+    where_clause, params = _sql_filter(filters["sub_class"], None, filters["is_genotoxic"], None)
+    with get_connection() as db_connection:
+        expected_df, expected_total = _query_substance_page(db_connection, where_clause, params, 5)
+
+    assert result["total_count"] == expected_total
+    assert result["results"].to_json() == expected_df.to_json()
+
+
+CUBE_QUERIES = [
+    (["sub_class"], {"is_carcinogenic": "Positive"}),
+    (["is_mutagenic", "is_genotoxic"], {"sub_class": "food additives"}),
+    (["assessment_type", "population"], {}),
+    ([], {"sub_class": "Pesticides", "is_genotoxic": "Negative", "assessment_type": "adi"}),
+    (["sub_class", "is_carcinogenic", "assessment_type"], {"population": "Consumers - Children"}),
+]
+
+
+def _count_from_study(group_by: list[str], filters: dict) -> tuple[list, int]:
+    """Distinct substance counts computed straight from the study and chem_assess rows."""
+    group_columns = [CUBE_DIMENSIONS[dimension] for dimension in group_by]
+    where = "".join(f" AND {CUBE_DIMENSIONS[dimension]} = ? COLLATE NOCASE" for dimension in filters)
+    with get_connection() as db_connection:
+        groups = db_connection.execute(
+            f"""
+            SELECT {", ".join([*group_columns, "COUNT(DISTINCT SUB_COM_ID)"])}
+            FROM ({CUBE_FACTS_QUERY}) WHERE 1=1{where}
+            {f"GROUP BY {', '.join(group_columns)}" if group_columns else ""}
+            """,
+            list(filters.values()),
+        ).fetchall()
+        total = db_connection.execute(
+            f"SELECT COUNT(DISTINCT SUB_COM_ID) FROM ({CUBE_FACTS_QUERY}) WHERE 1=1{where}",
+            list(filters.values()),
+        ).fetchone()[0]
+    return sorted(groups, key=repr), total
+
+
+@pytest.mark.parametrize("group_by, filters", CUBE_QUERIES)
+def test_facet_cube_counts_are_exact(group_by, filters):
+    result = query_facet_counts(group_by, filters, limit=None)
+
+    expected_groups, expected_total = _count_from_study(group_by, filters)
+    groups = [tuple(row.values()) for row in result["results"]]
+    if not group_by and expected_total == 0:
+        expected_groups = []
+    assert sorted(groups, key=repr) == expected_groups
+    assert result["total_count"] == expected_total
+    counts = [row["SUBSTANCE_COUNT"] for row in result["results"]]
+    assert counts == sorted(counts, reverse=True)
+
+
+@pytest.mark.parametrize("group_by, filters", CUBE_QUERIES[:2])
+def test_facet_counts_without_cube(group_by, filters, monkeypatch):
+    """Databases without facet_cube give the same answer from the base tables."""
+    expected = query_facet_counts(group_by, filters)
+    monkeypatch.setattr(facets, "has_facet_cube", lambda db_connection: False)
+    assert query_facet_counts(group_by, filters) == expected
+
+
+def test_facet_counts_validation():
+    with pytest.raises(ValueError, match="Valid facets"):
+        query_facet_counts(["category"])
+    with pytest.raises(ValueError, match="both grouped and filtered"):
+        query_facet_counts(["sub_class"], {"sub_class": "Pesticides"})
+    for limit in [0, -1]:
+        with pytest.raises(ValueError, match="limit must be at least 1"):
+            query_facet_counts(["sub_class"], limit=limit)
@@ -28,17 +28,18 @@ def test_get_safety_assessment_log_output():
     logging.info(f"Step 1: Finding SUB_COM_ID for '{search_term}'")
     logging.info(f"=" * 80)
 
-    search_results = query_search_substance(search_term)
+    search_result = query_search_substance(search_term)
 
-    if search_results is None or len(search_results) == 0:
+    if search_result is None or len(search_result["results"]) == 0:
         logging.warning(f"No results found for '{search_term}', trying 'E951' instead")
-        search_results = query_search_substance("E951")
+        search_result = query_search_substance("E951")
 
-    if search_results is None or len(search_results) == 0:
+    if search_result is None or len(search_result["results"]) == 0:
         logging.error("Could not find any substance to test with")
         pytest.skip("No test substance found")
 
     # Get the first SUB_COM_ID from results
+    search_results = search_result["results"]
     sub_com_id = search_results[0].get("SUB_COM_ID")
     substance_name = search_results[0].get("COM_NAME", "Unknown")
 
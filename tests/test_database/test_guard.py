@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import anyio
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.executor import DatabaseExecutor, run_in_executor
+from src.mcp_openfoodtox.database.guard import (
+    DEFAULT_QUERY_LIMITS,
+    TOOL_QUERY_LIMITS,
+    QueryLimits,
+    QueryTooExpensiveError,
+    limits_for_tool,
+)
+from src.mcp_openfoodtox.tools.get_opinions import get_opinions
+from src.mcp_openfoodtox.tools.list_substances_by_class_and_safety import (
+    list_substances_by_class_and_safety,
+)
+
+
+def endless_query() -> int:
+    """A SQLite statement that never finishes on its own."""
+    with get_connection() as db_connection:
+        return db_connection.execute(
+            "WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT COUNT(*) FROM r"
+        ).fetchone()[0]
+
+
+def _run(limits: QueryLimits, fn, *args, **kwargs):
+    executor = DatabaseExecutor(lanes={"query": 1}, timeout=5.0)
+    try:
+        return asyncio.run(executor.run("query", fn, *args, limits=limits, **kwargs))
+    finally:
+        executor.shutdown()
+
+
+def test_limits_for_tool():
+    """List tools have their own limits, lookups fall back to the defaults."""
+    assert limits_for_tool("list_substances_by_class_and_safety") is TOOL_QUERY_LIMITS[
+        "list_substances_by_class_and_safety"
+    ]
+    assert limits_for_tool("get_opinions") is DEFAULT_QUERY_LIMITS
+
+
+@pytest.mark.parametrize(
+    "limits, exceeded",
+    [
+        (QueryLimits(max_instructions=100_000), "max_instructions"),
+        (QueryLimits(max_seconds=0.2), "max_seconds"),
+    ],
+)
+def test_guard_aborts_expensive_statement(limits, exceeded):
+    """A statement over its instruction budget or deadline fails with a structured error."""
+    with pytest.raises(QueryTooExpensiveError) as error:
+        _run(limits, endless_query)
+
+    assert error.value.limit == exceeded
+    assert error.value.to_dict()["error"] == "query_too_expensive"
+    assert error.value.instructions > 0 and error.value.elapsed_seconds >= 0
+    assert "narrow your filters" in str(error.value)
+
+
+def test_guard_raises_when_query_helper_swallows_error():
+    """Helpers that log and return empty results still surface the guard error."""
+    with pytest.raises(QueryTooExpensiveError):
+        _run(QueryLimits(max_instructions=1_000), get_opinions, list(range(1, 5_000)))
+
+    # Within budget the same call succeeds
+    assert _run(QueryLimits(max_instructions=10_000_000), get_opinions, 1).startswith("[")
+
+
+def test_list_tool_reports_query_too_expensive():
+    """Through MCP the client gets an error result carrying the structured error as JSON.
+    run with:
+    `uv run pytest tests/test_database/test_guard.py -v -s`
+    """
+    server = FastMCP("guard-test")
+    server.add_tool(
+        run_in_executor(
+            list_substances_by_class_and_safety, lane="query", limits=QueryLimits(max_instructions=1_000)
+        )
+    )
+    results = []
+
+    async def exercise():
+        async with create_connected_server_and_client_session(server) as session:
+            results.append(
+                await session.call_tool("list_substances_by_class_and_safety", {"remarks_contains": "a"})
+            )
+
+    anyio.run(exercise)
+
+    assert results[0].isError
+    text = results[0].content[0].text
+    error = json.loads(text[text.index("{") :])
+    assert error["error"] == "query_too_expensive"
+    assert error["tool"] == "list_substances_by_class_and_safety"
+    assert error["limit"] == "max_instructions" and error["limit_value"] == 1_000
+    assert error["instructions"] > 1_000 and error["elapsed_seconds"] >= 0
+    assert "narrow your filters" in error["hint"]
@@ -0,0 +1,41 @@
+import pytest
+import logging
+from src.mcp_openfoodtox.database.multi_sub_queries import (
+    query_hazard_ids_by_assessment,
+    query_substances_by_assessment,
+    query_substances_by_study,
+)
+
+# Configure logging to see output
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"assessment_type": "ADI"},
+        {"population_text_contains": "children", "risk_value_milli_max": 1.0},
+        {"has_no_risk_value": True},
+        {"assessment_type": "no such assessment"},
+    ],
+)
+def test_substances_by_assessment_matches_two_step_path(filters):
+    """The single-statement join must match HAZARD_ID lookup + query_substances_by_study.
+    run with:
+    `uv run pytest tests/test_database/test_list_substances_by_assessment.py -v -s`
+    """
+    result = query_substances_by_assessment(**filters, limit=10)
+
+    hazard_ids = query_hazard_ids_by_assessment(**filters)
+    expected = query_substances_by_study(hazard_ids, study_type="hazard", limit=10)
+
+    logging.info(f"{filters}: {len(hazard_ids)} HAZARD_IDs, {result['total_count']} substances")
+    assert result["total_count"] == expected["total_count"]
+    if hazard_ids:
+        assert result["results"]["SUB_COM_ID"].tolist() == expected["results"]["SUB_COM_ID"].tolist()
+    else:
+        assert result["results"].empty
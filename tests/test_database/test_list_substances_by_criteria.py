@@ -1,7 +1,12 @@
 import pytest
 import logging
 import pandas as pd
+import json
+from src.mcp_openfoodtox.database.connection import get_connection
 from src.mcp_openfoodtox.database.multi_sub_queries import query_substances_by_class_and_safety
+from src.mcp_openfoodtox.tools.list_substances_by_class_and_safety import (
+    list_substances_by_class_and_safety,
+)
 
 # Configure logging to see output
 logging.basicConfig(
@@ -174,3 +179,40 @@ def test_list_substances_by_criteria_combined_filters():
             logging.info(f"  {row.get('COM_NAME')} (SUB_COM_ID: {row.get('SUB_COM_ID')})")
 
     logging.info(f"=" * 80)
+
+
+def test_list_substances_by_criteria_total_count_and_pages():
+    """total_count matches a direct COUNT(DISTINCT) and consecutive limits return stable pages.
+    run with:
+    `uv run pytest tests/test_database/test_list_substances_by_criteria.py::test_list_substances_by_criteria_total_count_and_pages -v -s`
+    """
+    with get_connection() as db_connection:
+        expected_count = db_connection.execute(
+            """
+            SELECT COUNT(DISTINCT SUB_COM_ID) FROM study
+            WHERE SUB_OP_CLASS_NORM LIKE '%additives%'
+              AND SUB_COM_ID IN (SELECT SUB_COM_ID FROM component)
+            """
+        ).fetchone()[0]
+
+    small = query_substances_by_class_and_safety(sub_class="additives", limit=5)
+    large = query_substances_by_class_and_safety(sub_class="additives", limit=10)
+
+    assert small["total_count"] == large["total_count"] == expected_count
+    assert "TOTAL_COUNT" not in small["results"].columns
+    ids = large["results"]["SUB_COM_ID"].tolist()
+    assert ids == sorted(ids)
+    assert small["results"]["SUB_COM_ID"].tolist() == ids[:5]
+
+    tool_result = json.loads(list_substances_by_class_and_safety(sub_class="additives", limit=5))
+    assert tool_result["total_count"] == expected_count
+    assert len(tool_result["results"]["SUB_COM_ID"]) == len(small["results"])
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_list_substances_rejects_limit_below_one(limit):
+    """An empty page must not be reported as total_count 0 when substances match."""
+    with pytest.raises(ValueError, match="limit"):
+        query_substances_by_class_and_safety(sub_class="additives", limit=limit)
+    with pytest.raises(ValueError, match="limit"):
+        query_substances_by_class_and_safety(remarks_contains="e", limit=limit)
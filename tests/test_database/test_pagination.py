@@ -0,0 +1,157 @@
+import base64
+import json
+
+import pytest
+
+from src.mcp_openfoodtox.database import multi_sub_queries, pagination
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.multi_sub_queries import (
+    query_hazard_id_page,
+    query_hazard_ids_by_assessment,
+    query_substances_by_assessment,
+    query_substances_by_class_and_safety,
+)
+from src.mcp_openfoodtox.utils.formatting import page_to_json
+
+PAGE_SIZE = 7
+ALL = 1_000_000  # a limit larger than any result
+
+
+def _all_pages(query, **kwargs) -> tuple[list[int], list[int]]:
+    """Follow next_cursor to the last page; returns (all keys, total_count of every page)."""
+    keys, totals, cursor = [], [], None
+    while True:
+        page = query(**kwargs, limit=PAGE_SIZE, cursor=cursor)
+        results = page["results"]
+        keys += results if isinstance(results, list) else results["SUB_COM_ID"].tolist()
+        totals.append(page["total_count"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return keys, totals
+        assert len(totals) < 1000, "pagination does not terminate"
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"sub_class": "additives"},
+        {"is_genotoxic": "Positive"},
+        # remarks_contains and LIKE wildcards take the SQL path instead of the facet index
+        {"remarks_contains": "e"},
+        {"sub_class": "food%additives"},
+    ],
+)
+def test_class_and_safety_pages_match_unpaged_result(filters):
+    """Concatenated pages are the unpaged result, in order, each page with the same total."""
+    expected = query_substances_by_class_and_safety(**filters, limit=ALL)
+    keys, totals = _all_pages(query_substances_by_class_and_safety, **filters)
+
+    assert keys == expected["results"]["SUB_COM_ID"].tolist()
+    assert set(totals) == {expected["total_count"]}
+
+
+@pytest.mark.parametrize("filters", [{}, {"assessment_type": "ADI"}, {"has_no_risk_value": True}])
+def test_assessment_pages_match_unpaged_result(filters):
+    expected = query_substances_by_assessment(**filters, limit=ALL)
+    keys, totals = _all_pages(query_substances_by_assessment, **filters)
+
+    assert keys == expected["results"]["SUB_COM_ID"].tolist()
+    assert set(totals) == {expected["total_count"]}
+
+
+@pytest.mark.parametrize("filters", [{}, {"assessment_type": "ADI"}, {"assessment_type": "no such assessment"}])
+def test_hazard_id_pages_match_unpaged_result(filters):
+    expected = query_hazard_ids_by_assessment(**filters)
+    keys, totals = _all_pages(query_hazard_id_page, **filters)
+
+    assert keys == expected == sorted(expected)
+    assert set(totals) == {len(expected)}
+
+
+@pytest.mark.parametrize(
+    "query, filters",
+    [
+        (query_substances_by_assessment, {}),
+        (query_substances_by_assessment, {"assessment_type": "ADI"}),
+        (query_substances_by_class_and_safety, {"remarks_contains": "e"}),
+    ],
+)
+def test_later_pages_walk_study_in_key_order(query, filters, monkeypatch):
+    """The keyset page reads study rows in SUB_COM_ID order: no temp B-tree to sort every match."""
+    statements = []
+    read_sql_query = multi_sub_queries.pd.read_sql_query
+
+    def recording_read_sql_query(sql, connection, params=None, **kwargs):
+        statements.append((sql, params))
+        return read_sql_query(sql, connection, params=params, **kwargs)
+
+    first = query(**filters, limit=PAGE_SIZE)
+    monkeypatch.setattr(multi_sub_queries.pd, "read_sql_query", recording_read_sql_query)
+    query(**filters, limit=PAGE_SIZE, cursor=first["next_cursor"])
+
+    (sql, params), = statements
+    plan = get_connection().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    # Plan rows are (id, parent, _, detail): keep the subtree that builds the page
+    page_nodes = {node_id for node_id, _, _, detail in plan if detail == "MATERIALIZE page"}
+    for node_id, parent, _, _ in plan:
+        if parent in page_nodes:
+            page_nodes.add(node_id)
+    page_plan = [detail for node_id, _, _, detail in plan if node_id in page_nodes]
+
+    assert any("idx_study_sub_com_id (SUB_COM_ID>?)" in detail for detail in page_plan)
+    assert not any("TEMP B-TREE" in detail for detail in page_plan)
+
+
+def test_last_page_has_no_cursor():
+    result = query_substances_by_class_and_safety(sub_class="no such class", limit=PAGE_SIZE)
+    assert result["total_count"] == 0
+    assert result["next_cursor"] is None
+
+    result = query_hazard_id_page()
+    assert len(result["results"]) == result["total_count"]
+    assert result["next_cursor"] is None
+
+
+def test_cursor_is_bound_to_query_and_filters():
+    first = query_substances_by_class_and_safety(sub_class="additives", limit=1)
+    assert first["next_cursor"] is not None
+
+    with pytest.raises(ValueError, match="different filters"):
+        query_substances_by_class_and_safety(sub_class="pesticides", cursor=first["next_cursor"])
+    with pytest.raises(ValueError, match="different filters"):
+        query_substances_by_assessment(cursor=first["next_cursor"])
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        query_substances_by_class_and_safety(sub_class="additives", cursor="not a cursor")
+
+    # The limit may change between pages
+    second = query_substances_by_class_and_safety(sub_class="additives", limit=3, cursor=first["next_cursor"])
+    assert second["results"]["SUB_COM_ID"].iloc[0] > first["results"]["SUB_COM_ID"].iloc[0]
+
+
+def test_tampered_cursor_is_rejected():
+    """Keys that are not integers are rejected instead of silently returning an empty page."""
+    token = query_substances_by_class_and_safety(sub_class="additives", limit=1)["next_cursor"]
+    payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+    for field, value in [("k", "abc"), ("k", None), ("n", "abc")]:
+        tampered = base64.urlsafe_b64encode(json.dumps({**payload, field: value}).encode()).decode()
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            query_substances_by_class_and_safety(sub_class="additives", cursor=tampered)
+
+
+def test_cursor_expires_when_dataset_changes(monkeypatch):
+    first = query_hazard_id_page(limit=1)
+    assert first["next_cursor"] is not None
+
+    monkeypatch.setattr(pagination, "current_dataset_version", lambda: "0" * 64)
+    with pytest.raises(ValueError, match="dataset changed"):
+        query_hazard_id_page(limit=1, cursor=first["next_cursor"])
+
+
+def test_page_to_json_includes_next_cursor():
+    result = query_substances_by_class_and_safety(limit=1)
+    payload = json.loads(page_to_json(result))
+
+    assert payload["next_cursor"] == result["next_cursor"]
+    assert payload["total_count"] == result["total_count"]
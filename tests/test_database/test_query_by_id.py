@@ -1,7 +1,8 @@
 import pytest
 import logging
 import pandas as pd
-from src.mcp_openfoodtox.database.queries import query_by_id
+import json
+from src.mcp_openfoodtox.database.queries import query_by_id, query_json_by_id, query_records_by_id
 
 # Configure logging to see output
 logging.basicConfig(
@@ -70,3 +71,34 @@ def test_query_by_id():
     except Exception as e:
         logging.error(f"Unexpected error: {type(e).__name__}: {e}")
         raise
+
+
+def test_query_by_id_large_id_list():
+    """ID lists of any length bind as one JSON parameter (no SQLite variable limit).
+    run with:
+    `uv run pytest tests/test_database/test_query_by_id.py::test_query_by_id_large_id_list -v -s`
+    """
+    single = query_by_id(1, "component")
+    many = query_by_id(list(range(1, 50_001)), "component")
+
+    logging.info(f"Single ID: {len(single)} row(s), 50,000 IDs: {len(many)} row(s)")
+    assert len(single) <= 1
+    assert many["SUB_COM_ID"].is_unique
+    assert set(single["SUB_COM_ID"]) <= set(many["SUB_COM_ID"])
+
+
+@pytest.mark.parametrize(
+    "table_name, id_value",
+    [("opinion", [1, 2, 3]), ("genotox", 1), ("chem_assess", [1, 5, 9]), ("endpoint_study", [])],
+)
+def test_query_records_by_id_matches_dataframe(table_name, id_value):
+    """query_records_by_id / query_json_by_id return the same rows as query_by_id, as plain dicts."""
+    df = query_by_id(id_value, table_name)
+    records = query_records_by_id(id_value, table_name)
+
+    assert len(records) == len(df)
+    assert json.loads(query_json_by_id(id_value, table_name)) == records
+    if records:
+        assert list(records[0]) == list(df.columns)
+        expected = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        assert sorted(records, key=str) == sorted(expected, key=str)
@@ -0,0 +1,45 @@
+import pytest
+from src.mcp_openfoodtox.database.connection import get_connection
+
+
+def _column_types(table_name: str) -> dict:
+    with get_connection() as db_connection:
+        rows = db_connection.execute(f"PRAGMA table_info({table_name})").fetchall()
+    # (cid, name, type, notnull, default, pk)
+    return {row[1]: (row[2], row[5]) for row in rows}
+
+
+@pytest.mark.parametrize(
+    "table_name, id_column",
+    [
+        ("component", "SUB_COM_ID"),
+        ("opinion", "OP_ID"),
+        ("chem_assess", "HAZARD_ID"),
+        ("genotox", "GENOTOX_ID"),
+        ("endpoint_study", "TOX_ID"),
+    ],
+)
+def test_primary_keys_are_integer(table_name, id_column):
+    """One-row-per-ID tables declare their ID as INTEGER PRIMARY KEY."""
+    column_type, is_primary_key = _column_types(table_name)[id_column]
+    assert column_type == "INTEGER"
+    assert is_primary_key
+
+
+def test_study_columns_are_typed():
+    """STUDY ID columns are INTEGER and filter columns have normalized shadow columns."""
+    columns = _column_types("study")
+    for id_column in ["SUB_COM_ID", "GENOTOX_ID", "TOX_ID", "HAZARD_ID", "OP_ID"]:
+        assert columns[id_column][0] == "INTEGER"
+    assert "SUB_OP_CLASS_NORM" in columns
+    assert "REMARKS_STUDY_NORM" in columns
+
+
+def test_dates_are_integer_yyyymmdd():
+    """Opinion dates are stored as INTEGER yyyymmdd values."""
+    with get_connection() as db_connection:
+        row = db_connection.execute(
+            "SELECT PUBLICATIONDATE, typeof(PUBLICATIONDATE) FROM opinion WHERE PUBLICATIONDATE IS NOT NULL LIMIT 1"
+        ).fetchone()
+    assert row[1] == "integer"
+    assert 19000101 <= row[0] <= 21001231
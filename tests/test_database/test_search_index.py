@@ -0,0 +1,58 @@
+import pytest
+import logging
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.queries import get_search_tables
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+@pytest.mark.parametrize("search_term", ["acid", "E 951", "aspartame", "vitamin a", "123477-69-0", "E"])
+def test_search_index_matches_table_scan(search_term):
+    """The FTS5 trigram index must return the same SUB_COM_IDs as a LIKE scan of the base tables.
+    run with:
+    `uv run pytest tests/test_database/test_search_index.py -v -s`
+    """
+    pattern = f"%{search_term}%"
+
+    with get_connection() as db_connection:
+        synonym_table, component_table = get_search_tables(db_connection)
+        assert synonym_table == "synonym_fts", "Search index missing - run `make db`"
+
+        indexed_synonyms = {
+            row[0]
+            for row in db_connection.execute(
+                f"SELECT SUB_COM_ID FROM {synonym_table} WHERE DESCRIPTION LIKE ?", [pattern]
+            )
+        }
+        scanned_synonyms = {
+            row[0]
+            for row in db_connection.execute(
+                "SELECT SUB_COM_ID FROM synonym WHERE DESCRIPTION LIKE ?", [pattern]
+            )
+        }
+        assert indexed_synonyms == scanned_synonyms
+
+        indexed_components = {
+            row[0]
+            for row in db_connection.execute(
+                f"SELECT SUB_COM_ID FROM {component_table} WHERE SUB_NAME LIKE ? OR COM_NAME LIKE ?",
+                [pattern, pattern],
+            )
+        }
+        scanned_components = {
+            row[0]
+            for row in db_connection.execute(
+                "SELECT SUB_COM_ID FROM component WHERE SUB_NAME LIKE ? OR COM_NAME LIKE ?",
+                [pattern, pattern],
+            )
+        }
+        assert indexed_components == scanned_components
+
+    logging.info(
+        f"'{search_term}': {len(indexed_synonyms)} synonym matches, "
+        f"{len(indexed_components)} component matches"
+    )
@@ -1,6 +1,9 @@
 import pytest
 import logging
-from src.mcp_openfoodtox.database.queries import query_search_substance
+import shutil
+import sqlite3
+from src.mcp_openfoodtox.database import connection
+from src.mcp_openfoodtox.database.queries import query_search_substance, query_search_substance_batch
 
 # Configure logging to see output
 logging.basicConfig(
@@ -21,18 +24,20 @@ def test_search_substance_log_output():
     logging.info(f"Testing search_substance with: '{search_term}'")
     logging.info(f"=" * 80)
 
-    results = query_search_substance(search_term)
+    search_result = query_search_substance(search_term)
 
-    if results is None:
+    if search_result is None:
         logging.info("No results found (returned None)")
         return
 
-    logging.info(f"\nFound {len(results)} entries")
+    results = search_result["results"]
+    logging.info(f"\nFound {len(results)} entries (total matching: {search_result['total_count']})")
     logging.info(f"\n" + "-" * 80)
 
     for idx, entry in enumerate(results, 1):
         logging.info(f"\nEntry {idx}:")
         logging.info(f"  SUB_COM_ID: {entry.get('SUB_COM_ID')}")
+        logging.info(f"  MATCH_TYPE: {entry.get('MATCH_TYPE')} (studies: {entry.get('STUDY_COUNT')})")
         logging.info(f"  COM_NAME: {entry.get('COM_NAME')}")
         logging.info(f"  COM_TYPE: {entry.get('COM_TYPE')}")
         logging.info(f"  MOLECULARFORMULA: {entry.get('MOLECULARFORMULA')}")
@@ -82,3 +87,81 @@ def test_search_substance_log_output():
     logging.info(f"\n" + "=" * 80)
     logging.info(f"Test complete. Total entries: {len(results)}")
     logging.info(f"=" * 80)
+
+
+def test_search_substance_ranking_and_limit():
+    """Exact matches rank first, results respect the limit and total_count covers all matches."""
+    search_result = query_search_substance("E951", limit=1)
+
+    assert search_result is not None
+    assert len(search_result["results"]) == 1
+    assert search_result["total_count"] >= 1
+    assert search_result["results"][0]["MATCH_TYPE"] == "exact"
+
+    broad_result = query_search_substance("acid", limit=5)
+    assert broad_result is not None
+    assert len(broad_result["results"]) <= 5
+    assert broad_result["total_count"] >= len(broad_result["results"])
+
+    scores = [entry["RELEVANCE_SCORE"] for entry in broad_result["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_search_substance_rejects_limit_below_one(limit):
+    with pytest.raises(ValueError, match="limit"):
+        query_search_substance("aspartame", limit=limit)
+
+
+@pytest.mark.parametrize("search_term", ["E 460", "E460", "e 460(i)"])
+def test_search_substance_identifier_fast_path(search_term):
+    """Identifier-shaped queries resolve through the identifier table as exact matches only."""
+    search_result = query_search_substance(search_term, limit=None)
+
+    assert search_result is not None
+    assert all(entry["MATCH_TYPE"] == "exact" for entry in search_result["results"])
+
+    # Every variant of the same E-number resolves to the same substances
+    reference = query_search_substance("E 460", limit=None)
+    assert {entry["SUB_COM_ID"] for entry in search_result["results"]} == {
+        entry["SUB_COM_ID"] for entry in reference["results"]
+    }
+
+
+@pytest.fixture
+def registry_collision_db(tmp_path, monkeypatch):
+    """
+    Copy of the database where JECFA number 3738 belongs to another substance than FEMA 3738.
+    Returns (FEMA substance, JECFA substance).
+    """
+    db_path = tmp_path / "openfoodtox.db"
+    shutil.copy(connection.get_db_path(), db_path)
+    with sqlite3.connect(db_path) as db:
+        fema_id = db.execute("SELECT SUB_COM_ID FROM identifier WHERE KIND = 'fema' AND VALUE = '3738'").fetchone()[0]
+        jecfa_id = db.execute("SELECT MIN(SUB_COM_ID) FROM component WHERE SUB_COM_ID != ?", (fema_id,)).fetchone()[0]
+        db.execute("INSERT INTO identifier (KIND, VALUE, SUB_COM_ID) VALUES ('jecfa', '3738', ?)", (jecfa_id,))
+    connection.close_all_connections()
+    monkeypatch.setattr(connection, "get_db_path", lambda: db_path)
+    yield fema_id, jecfa_id
+    monkeypatch.undo()
+    connection.close_all_connections()
+
+
+def test_search_substance_registry_numbers_do_not_collide(registry_collision_db):
+    """A prefixed number only matches its registry; a bare number in several registries is ambiguous."""
+    fema_id, jecfa_id = registry_collision_db
+
+    def sub_com_ids(result):
+        return [entry["SUB_COM_ID"] for entry in result["results"]]
+
+    fema = query_search_substance("FEMA 3738", limit=None)
+    assert sub_com_ids(fema) == [fema_id]
+    assert fema["results"][0]["MATCH_TYPE"] == "exact"
+    assert sub_com_ids(query_search_substance("JECFA no. 3738", limit=None)) == [jecfa_id]
+
+    # The bare number falls through to text search, which finds the FEMA synonym "3738"
+    bare = query_search_substance("3738", limit=None)
+    assert fema_id in sub_com_ids(bare) and jecfa_id not in sub_com_ids(bare)
+
+    batch = query_search_substance_batch(["FEMA 3738", "JECFA 3738", "3738"], limit=None)["results"]
+    assert [sub_com_ids(entry) for entry in batch] == [[fema_id], [jecfa_id], sub_com_ids(bare)]
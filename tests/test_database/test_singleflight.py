@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+
+from src.mcp_openfoodtox.database import cache as cache_module
+from src.mcp_openfoodtox.database.cache import ResultCache, cache_tool
+from src.mcp_openfoodtox.database.version import DatasetVersion
+from src.mcp_openfoodtox.database.singleflight import SingleFlight
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    singleflight = SingleFlight()
+    executions = []
+
+    async def search():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "[]"
+
+    async def exercise():
+        return await asyncio.gather(*[singleflight.do(("search", "a"), search) for _ in range(5)])
+
+    assert asyncio.run(exercise()) == ["[]"] * 5
+    assert len(executions) == 1
+    assert singleflight.coalesced == 4
+    assert singleflight.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    singleflight = SingleFlight()
+
+    async def exercise():
+        return await asyncio.gather(
+            singleflight.do("a", lambda: asyncio.sleep(0.01, result="a")),
+            singleflight.do("b", lambda: asyncio.sleep(0.01, result="b")),
+        )
+
+    assert asyncio.run(exercise()) == ["a", "b"]
+    assert singleflight.coalesced == 0
+
+
+def test_exception_is_shared_and_not_remembered():
+    singleflight = SingleFlight()
+    executions = []
+
+    async def failing():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("query failed")
+
+    async def exercise():
+        results = await asyncio.gather(
+            *[singleflight.do("a", failing) for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await singleflight.do("a", failing)
+
+    asyncio.run(exercise())
+    assert len(executions) == 2
+
+
+def test_cancelling_one_caller_keeps_the_execution_for_others():
+    singleflight = SingleFlight()
+    executions = []
+
+    async def search():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "[]"
+
+    async def exercise():
+        first = asyncio.ensure_future(singleflight.do("a", search))
+        second = asyncio.ensure_future(singleflight.do("a", search))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "[]"
+        assert first.cancelled()
+
+    asyncio.run(exercise())
+    assert len(executions) == 1
+
+
+def test_cancelling_every_caller_cancels_the_execution():
+    singleflight = SingleFlight()
+    finished = []
+
+    async def search():
+        await asyncio.sleep(1)
+        finished.append(1)
+
+    async def exercise():
+        callers = [asyncio.ensure_future(singleflight.do("a", search)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert singleflight.in_flight() == 0
+
+    asyncio.run(exercise())
+    assert finished == []
+
+
+def test_cache_tool_coalesces_concurrent_calls(tmp_path, monkeypatch):
+    """Concurrent identical tool calls run once even with the result cache disabled."""
+    db_file = tmp_path / "openfoodtox.db"
+    db_file.write_bytes(b"version 1")
+    monkeypatch.setattr(
+        cache_module, "_cache", ResultCache(max_bytes=0, dataset_version=DatasetVersion(db_file))
+    )
+    monkeypatch.setattr(cache_module, "_singleflight", SingleFlight())
+    executions = []
+
+    async def search_substance(description_search: str, limit: int = 10):
+        executions.append(description_search)
+        await asyncio.sleep(0.05)
+        return json.dumps([description_search])
+
+    tool = cache_tool(search_substance)
+
+    async def exercise():
+        return await asyncio.gather(tool("aspartame"), tool("aspartame", limit=10), tool("sucralose"))
+
+    assert asyncio.run(exercise()) == ['["aspartame"]', '["aspartame"]', '["sucralose"]']
+    assert sorted(executions) == ["aspartame", "sucralose"]
+    assert cache_module.cache_stats()["coalesced"] == 1
@@ -0,0 +1,157 @@
+import asyncio
+import inspect
+import json
+import time
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.mcp_openfoodtox.database.connection import get_connection
+from src.mcp_openfoodtox.database.executor import (
+    WORKER_LANES,
+    DatabaseExecutor,
+    configure_executor,
+    run_in_executor,
+)
+from src.mcp_openfoodtox.tools.async_tools import ASYNC_TOOLS
+
+SLOW_QUERY_SECONDS = 0.5
+
+
+def slow_query(label: str) -> str:
+    """Stand-in for a long list query: blocks its worker thread."""
+    time.sleep(SLOW_QUERY_SECONDS)
+    return label
+
+
+def fast_lookup(item_id: int) -> str:
+    """Stand-in for an ID lookup."""
+    return json.dumps({"id": item_id})
+
+
+def endless_query() -> int:
+    """A SQLite statement that never finishes on its own."""
+    with get_connection() as db_connection:
+        return db_connection.execute(
+            "WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT COUNT(*) FROM r"
+        ).fetchone()[0]
+
+
+def test_async_tools_are_coroutines():
+    """Every registered tool has an async variant that keeps the tool's name."""
+    assert len(ASYNC_TOOLS) == 13
+    assert all(inspect.iscoroutinefunction(tool) for tool in ASYNC_TOOLS)
+    assert "search_substance" in {tool.__name__ for tool in ASYNC_TOOLS}
+
+
+def test_run_in_executor_keeps_tool_schema():
+    """The async wrapper registers with the same name, description and parameters."""
+    server = FastMCP("executor-test")
+    server.add_tool(run_in_executor(fast_lookup, lane="lookup"))
+
+    async def list_tools():
+        return await server.list_tools()
+
+    (tool,) = anyio.run(list_tools)
+    assert tool.name == "fast_lookup"
+    assert tool.description == fast_lookup.__doc__
+    assert list(tool.inputSchema["properties"]) == ["item_id"]
+
+
+def test_slow_queries_do_not_block_lookups():
+    """Lookups complete while every "query" worker is busy with a slow call.
+    run with:
+    `uv run pytest tests/test_tools/test_executor.py -v -s`
+    """
+    configure_executor(1)
+    server = FastMCP("executor-test")
+    server.add_tool(run_in_executor(slow_query, lane="query"))
+    server.add_tool(run_in_executor(fast_lookup, lane="lookup"))
+    lookup_seconds = []
+
+    async def exercise():
+        async with create_connected_server_and_client_session(server) as session:
+            async with anyio.create_task_group() as task_group:
+                for label in ["a", "b", "c"]:
+                    task_group.start_soon(session.call_tool, "slow_query", {"label": label})
+                await anyio.sleep(0.05)
+
+                start = time.perf_counter()
+                result = await session.call_tool("fast_lookup", {"item_id": 7})
+                lookup_seconds.append(time.perf_counter() - start)
+                assert json.loads(result.content[0].text) == {"id": 7}
+
+    try:
+        anyio.run(exercise)
+    finally:
+        configure_executor(WORKER_LANES["query"])
+
+    assert lookup_seconds[0] < SLOW_QUERY_SECONDS
+
+
+def test_server_serves_concurrent_clients_in_process():
+    """The real server answers concurrent tool calls from an in-process client."""
+    import main
+
+    results = {}
+
+    async def exercise():
+        async with create_connected_server_and_client_session(main.mcp) as session:
+
+            async def call(name, arguments):
+                results[name] = await session.call_tool(name, arguments)
+
+            async with anyio.create_task_group() as task_group:
+                task_group.start_soon(call, "search_substance", {"description_search": "acid", "limit": 3})
+                task_group.start_soon(call, "get_opinions", {"op_id": [1, 2]})
+                task_group.start_soon(call, "list_substances_by_class_and_safety", {"limit": 3})
+
+    anyio.run(exercise)
+
+    assert not any(result.isError for result in results.values())
+    assert isinstance(json.loads(results["get_opinions"].content[0].text), list)
+    assert "total_count" in json.loads(results["list_substances_by_class_and_safety"].content[0].text)
+
+
+def test_timeout_interrupts_sqlite_statement():
+    """A timed-out call fails with a time-limit error and its worker is freed for the next call."""
+    executor = DatabaseExecutor(lanes={"query": 1}, timeout=0.2)
+
+    async def exercise():
+        start = time.perf_counter()
+        try:
+            await executor.run("query", endless_query)
+        except TimeoutError as e:
+            message = str(e)
+        # The single worker only gets free if the endless statement was interrupted
+        assert await executor.run("query", fast_lookup, 1, timeout=2.0) == json.dumps({"id": 1})
+        return message, time.perf_counter() - start
+
+    try:
+        message, elapsed = asyncio.run(exercise())
+    finally:
+        executor.shutdown()
+
+    assert "time limit" in message
+    assert elapsed < 2.0
+
+
+def test_cancellation_interrupts_sqlite_statement():
+    """Cancelling the awaiting task stops the statement running on the worker."""
+    executor = DatabaseExecutor(lanes={"query": 1}, timeout=None)
+
+    async def exercise():
+        task = asyncio.create_task(executor.run("query", endless_query))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return await executor.run("query", fast_lookup, 2, timeout=2.0)
+
+    try:
+        assert asyncio.run(exercise()) == json.dumps({"id": 2})
+    finally:
+        executor.shutdown()
@@ -2,7 +2,9 @@
 import pytest
 import logging
 from src.mcp_openfoodtox.tools.search_substance import search_substance
-from src.mcp_openfoodtox.tools.substance_safety_assessment import substance_safety_assessment
+from src.mcp_openfoodtox.tools.substance_safety_assessment import (
+    get_substance_safety_assessment as substance_safety_assessment,
+)
 from pandas import DataFrame
 
 
@@ -14,13 +16,15 @@ def test_search_substance_tool():
     # Test with a known substance
     result = search_substance("aspartame")
     
-    # Verify it returns a list or None
-    assert result is None or isinstance(result, list)
+    # Verify it returns a dict with results and total_count, or None
+    assert result is None or isinstance(result, dict)
     
     if result:
         logging.info(f"Result: {result}")
+        assert isinstance(result["results"], list)
+        assert result["total_count"] >= len(result["results"])
         # Verify structure of first entry
-        entry = result[0]
+        entry = result["results"][0]
         assert "SUB_COM_ID" in entry
         assert "COM_NAME" in entry
         assert "COM_TYPE" in entry
@@ -29,7 +33,7 @@ def test_search_substance_tool():
 def test_search_substance_tool_e_number():
     """Test E-number normalization."""
     result = search_substance("E951")
-    assert result is not None or isinstance(result, list)
+    assert result is not None or isinstance(result, dict)
     
 def test_substance_safety_assessment_tool():
     """Test the substance safety assessment tool."""
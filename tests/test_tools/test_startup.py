@@ -0,0 +1,74 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Libraries that must not load before the first tool call
+HEAVY_MODULES = ["pandas", "numpy"]
+
+
+def test_server_import_skips_heavy_modules():
+    """Importing main.py (registering every tool) must not import pandas or numpy.
+    run with:
+    `uv run pytest tests/test_tools/test_startup.py -v -s`
+    """
+    # Fresh interpreter: this test process has already imported pandas
+    code = (
+        "import sys, main; "
+        f"print(','.join(sorted(set({HEAVY_MODULES!r}) & set(sys.modules))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_server_registers_all_tools():
+    """Lazy imports keep every tool registered with its signature."""
+    import main
+
+    tools = asyncio.run(main.mcp.list_tools())
+    names = {tool.name for tool in tools}
+    assert {
+        "search_substance",
+        "get_opinions",
+        "list_substances_by_assessment",
+        "get_substance_safety_assessment",
+    } <= names
+    assert len(tools) == 13
+
+
+def test_server_exposes_stats_resource():
+    """The stats resource reports cache counters and coalesced calls."""
+    import main
+
+    (contents,) = asyncio.run(main.mcp.read_resource("openfoodtox://stats"))
+    stats = json.loads(contents.content)
+    assert {"hits", "misses", "coalesced"} <= set(stats)
+
+
+def test_http_host_check_stays_on(monkeypatch):
+    """Binding to a public interface keeps DNS rebinding protection unless explicitly disabled."""
+    import main
+
+    monkeypatch.setattr(main.mcp.settings, "transport_security", main.mcp.settings.transport_security)
+    monkeypatch.setattr(main.mcp.settings, "host", main.mcp.settings.host)
+    monkeypatch.setattr(main.mcp.settings, "port", main.mcp.settings.port)
+
+    main.configure_http("0.0.0.0", 8000, [])
+    security = main.mcp.settings.transport_security
+    assert security.enable_dns_rebinding_protection
+    assert "localhost:*" in security.allowed_hosts
+    assert not any("example" in allowed_host for allowed_host in security.allowed_hosts)
+
+    main.configure_http("0.0.0.0", 8000, ["mcp.example.org", "10.0.0.5:8000"])
+    security = main.mcp.settings.transport_security
+    assert {"mcp.example.org", "mcp.example.org:*", "10.0.0.5:8000"} <= set(security.allowed_hosts)
+    assert "10.0.0.5:8000:*" not in security.allowed_hosts
+    assert "https://mcp.example.org" in security.allowed_origins
+
+    main.configure_http("0.0.0.0", 8000, [], disable_host_check=True)
+    assert main.mcp.settings.transport_security is None
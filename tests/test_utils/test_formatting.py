@@ -1,5 +1,13 @@
 import pytest
-from src.mcp_openfoodtox.utils.formatting import normalize_e_number
+from src.mcp_openfoodtox.utils.formatting import (
+    classify_identifier,
+    is_valid_cas,
+    is_valid_ec_number,
+    normalize_e_number,
+    normalize_text,
+    records_to_json,
+    registry_kind,
+)
 
 
 class TestNormalizeENumber:
@@ -101,3 +109,79 @@ class TestNormalizeENumber:
         assert normalize_e_number("E 500") == normalize_e_number("e 500")
         assert normalize_e_number("E905") == normalize_e_number("e905")
 
+
+class TestNormalizeText:
+    """Test cases for free-text normalization (shadow *_NORM columns and query terms)."""
+
+    def test_lowercase_and_trim(self):
+        assert normalize_text("Food additives") == "food additives"
+        assert normalize_text("  Pesticides ") == "pesticides"
+
+    def test_collapse_whitespace(self):
+        assert normalize_text("Consumers  -\tChildren") == "consumers - children"
+
+    def test_non_string_input(self):
+        assert normalize_text(42) == "42"
+
+
+class TestClassifyIdentifier:
+    """Test cases for identifier classification (identifier lookup table and search fast path)."""
+
+    def test_e_numbers(self):
+        """E-number variants share one key, suffixes are stripped."""
+        assert classify_identifier("E 460") == ("e_number", "E460")
+        assert classify_identifier("e460") == ("e_number", "E460")
+        assert classify_identifier("E 460(i)") == ("e_number", "E460")
+        assert classify_identifier("E 160a (ii)") == ("e_number", "E160")
+        assert classify_identifier("E 4600") == ("e_number", "E4600")
+
+    def test_cas_numbers(self):
+        """CAS numbers are validated by check digit and stripped of leading zeros."""
+        assert classify_identifier("22839-47-0") == ("cas", "22839-47-0")
+        assert classify_identifier("022839-47-0") == ("cas", "22839-47-0")
+        assert classify_identifier("CAS no. 7732-18-5") == ("cas", "7732-18-5")
+        assert classify_identifier("7732-18-4") is None
+        assert is_valid_cas("123477-69-0")
+        assert not is_valid_cas("123477-69-1")
+
+    def test_ec_numbers(self):
+        """EC numbers are validated by check digit."""
+        assert classify_identifier("231-791-2") == ("ec_number", "231-791-2")
+        assert classify_identifier("EC 200-001-8") == ("ec_number", "200-001-8")
+        assert classify_identifier("231-791-3") is None
+        assert is_valid_ec_number("200-001-8")
+
+    def test_registry_numbers(self):
+        """Prefixed FEMA/JECFA/CoE numbers keep their registry; bare numbers have none."""
+        assert classify_identifier("2698") == ("number", "2698")
+        assert classify_identifier("FEMA 2698") == ("fema", "2698")
+        assert classify_identifier("JECFA no. 62") == ("jecfa", "62")
+        assert classify_identifier("coe 0062") == ("coe", "62")
+
+    def test_registry_kind(self):
+        """The registry of a bare number comes from its synonym's SYNONYM_TYPE."""
+        assert registry_kind("FEMA number") == "fema"
+        assert registry_kind("JECFA number") == "jecfa"
+        assert registry_kind("Council of Europe number") == "coe"
+        assert registry_kind("Name") is None
+        assert registry_kind(None) is None
+
+    def test_not_identifiers(self):
+        """Names and free text are left to text search."""
+        assert classify_identifier("aspartame") is None
+        assert classify_identifier("vitamin a") is None
+        assert classify_identifier("E") is None
+        assert classify_identifier("E 422 and E 951") is None
+
+
+class TestRecordsToJson:
+    """Test cases for record-oriented JSON serialization of get_* tool output."""
+
+    def test_compact_records(self):
+        records = [{"OP_ID": 1, "TITLE": "Opinion", "DOI": None}, {"OP_ID": 2, "TITLE": "Stät", "DOI": "10/x"}]
+        assert records_to_json(records) == (
+            '[{"OP_ID":1,"TITLE":"Opinion","DOI":null},{"OP_ID":2,"TITLE":"Stät","DOI":"10/x"}]'
+        )
+
+    def test_empty(self):
+        assert records_to_json([]) == "[]"